@@ -1,5 +1,7 @@
 """This file contains the Streamlist app for the Unified Autoreview Tool."""
 
+import json
+
 import altair as alt  # noqa: E0401
 import pandas as pd  # noqa: E0401
 import streamlit as st  # noqa: E0401
@@ -34,6 +36,23 @@ def main():
                 default=validators,  # Select all validators by default
                 key="validators",
             )
+            incremental = st.checkbox(
+                "Incremental (only validate the colabs changed since the last incremental run)",
+                key="incremental",
+            )
+            use_processes = st.checkbox(
+                "Parallel parsing (parse and validate the colabs on all the CPU cores)",
+                key="use_processes",
+            )
+            record_timings = st.checkbox(
+                "Record timings (wall and CPU time of every stage, rule and colab of the run)",
+                key="record_timings",
+            )
+            validation_mode = st.text_input(
+                "SFT validation mode (full by default, or first_failure, max_errors=N, severity>=high for a gate run)",
+                placeholder="full",
+                key="validation_mode",
+            )
             validate_button = st.button("Validate", use_container_width=True)
 
         with right_col:
@@ -60,12 +79,27 @@ def main():
                 st.error("Please select at least one validator.")
 
             else:
-                results_df, pass_rate = ServicesRunner(folder_id, selected_validators).run_services(
+                try:
+                    services_runner = ServicesRunner(
+                        folder_id,
+                        selected_validators,
+                        incremental=incremental,
+                        use_processes=use_processes,
+                        record_timings=record_timings,
+                        validation_mode=validation_mode or None,
+                    )
+                except ValueError as e:
+                    st.error(str(e))
+                    return
+
+                results_df, pass_rate = services_runner.run_services(
                     services_progress_bar=st.progress(0),
                     services_eta_placeholder=st.empty(),
                 )
                 draw_donut_chart(pass_rate, pass_rate_placeholder)
                 display_results(results_table_placeholder, results_df)
+                if services_runner.timings is not None:
+                    display_timings(services_runner.timings)
 
         else:
             st.error("Please enter a valid Folder ID.")
@@ -130,5 +164,45 @@ def display_results(placeholder: DeltaGenerator, results_df: pd.DataFrame):
         placeholder.info("No results to display.")
 
 
+def display_timings(timings: dict[str, dict], num_slowest: int = 10):
+    """Display the timings of the run: the stages by total wall time and the slowest colabs.
+
+    Parameters
+    ----------
+    timings : dict[str, dict]
+        Timings of the run, see `TimingRecorder.export`.
+
+    num_slowest : int, optional
+        Number of slowest colabs to display, by default 10.
+    """
+    with st.expander("Timings"):
+        stages_df = pd.DataFrame.from_dict(timings["stages"], orient="index")
+        if len(stages_df) > 0:
+            stages_df = stages_df.sort_values("wall_seconds", ascending=False).rename_axis("stage").reset_index()
+        st.dataframe(stages_df, use_container_width=True)
+
+        # The validator stages of a colab cover its download, parsing and rules
+        notebooks_df = pd.DataFrame(
+            [
+                {
+                    "colab": notebook["name"],
+                    "wall_seconds": sum(
+                        stats["wall_seconds"]
+                        for stage, stats in notebook["stages"].items()
+                        if stage.startswith("validator:")
+                    ),
+                }
+                for notebook in timings["notebooks"].values()
+            ],
+            columns=["colab", "wall_seconds"],
+        )
+        st.markdown("**Slowest colabs**")
+        st.dataframe(notebooks_df.nlargest(num_slowest, "wall_seconds"), use_container_width=True)
+
+        st.download_button(
+            "Download timings (JSON)", json.dumps(timings, indent=2), file_name="timings.json", mime="application/json"
+        )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,58 @@
+"""Benchmark of the forbidden pattern scanner against separate substring checks, as the pattern table grows.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_pattern_scanner
+"""
+
+import random
+import string
+import timeit
+from unittest.mock import patch
+
+# The SFT validator module fetches the code error tracker sheet on import, which the scanner does not need
+with patch("utils.initialize_sheets_service"):
+    from review_services.sft_validator.pattern_scanner import PatternScanner, load_forbidden_patterns
+
+
+def build_code(num_lines: int) -> str:
+    """Builds a code cell of random identifiers and calls."""
+    rng = random.Random(0)
+    lines = []
+    for _ in range(num_lines):
+        name = "".join(rng.choices(string.ascii_lowercase, k=8))
+        lines.append(f"{name} = df.groupby('{name}').agg({{'value': 'sum'}}).reset_index()")
+    return "\n".join(lines)
+
+
+def build_patterns(num_extra_patterns: int) -> list[dict]:
+    """Builds the pattern table with extra random forbidden calls."""
+    rng = random.Random(1)
+    extra = ["." + "".join(rng.choices(string.ascii_lowercase, k=10)) + "(" for _ in range(num_extra_patterns)]
+    return load_forbidden_patterns() + [{"name": "EXTRA", "patterns": extra, "ignore_case": False}]
+
+
+def main():
+    """Times a single scan and separate substring checks of a 200 line code cell."""
+    code = build_code(200)
+    for num_extra_patterns in [0, 10, 50, 200]:
+        patterns = build_patterns(num_extra_patterns)
+        literals = [(literal, entry.get("ignore_case", False)) for entry in patterns for literal in entry["patterns"]]
+        scanner = PatternScanner(patterns)
+
+        def substring_checks():
+            """Checks every literal separately, lowercasing the code for the case insensitive ones."""
+            lower_code = code.lower()
+            return [literal for literal, ignore_case in literals if literal in (lower_code if ignore_case else code)]
+
+        number = 200
+        substring_time = timeit.timeit(substring_checks, number=number) / number
+        scanner_time = timeit.timeit(lambda: scanner.scan(code), number=number) / number
+        print(  # noqa: T201
+            f"{len(literals):>4} patterns: substring checks {substring_time * 1e6:8.1f} us, "
+            f"scanner {scanner_time * 1e6:8.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark of the throughput scaling of the process tier with the number of cores.
+
+Runs the parsing and the SFT validations of synthetic multi-turn notebooks in process pools of 1 to N workers.
+The benchmark process fetches the code error tracker for the workers, so it needs the same Google credentials as the
+app.
+Run from the repository root with:
+
+    python -m benchmarks.bench_process_tier [num_notebooks] [num_turns]
+"""
+
+import json
+import os
+import sys
+import time
+from itertools import repeat
+
+from parsing.output_retention import OutputRetention
+from review_services.process_tier import create_process_pool, validate_notebook_content
+
+TURN_CELLS = [
+    ("markdown", "**USER_QUERY:** Plot the monthly sales of {i}"),
+    ("markdown", "**ICE_FILE_METADATA:**\nfile_name: sales_{i}.csv\nFILE_PATH: /content/sales_{i}.csv\nfile_type: csv"),
+    ("markdown", "**THOUGHT:** Load the file to look at the sales\n```python\npd.read_csv('sales_{i}.csv')\n```"),
+    ("code", "import pandas as pd\ndf = pd.read_csv('sales_{i}.csv')\ndf.groupby('month')['sales'].sum().plot()"),
+    ("markdown", "**THOUGHT:** The sales grow every month."),
+    ("markdown", "**RESPONSE_TO_USER:** The monthly sales of {i} are plotted above."),
+]
+
+
+def build_notebook(num_turns: int) -> bytes:
+    """Builds the raw content of a synthetic notebook with the given number of turns."""
+    cells = []
+    for i in range(num_turns):
+        cells.append({"cell_type": "markdown", "metadata": {}, "source": f"**TURN:** {i + 1}"})
+        for cell_type, source in TURN_CELLS:
+            cell = {"cell_type": cell_type, "metadata": {}, "source": source.format(i=i)}
+            if cell_type == "code":
+                outputs = [{"output_type": "stream", "name": "stdout", "text": ""}]
+                cell.update({"execution_count": 1, "outputs": outputs})
+            cells.append(cell)
+    return json.dumps({"nbformat": 4, "nbformat_minor": 0, "metadata": {}, "cells": cells}).encode()
+
+
+def main(num_notebooks: int = 200, num_turns: int = 50):
+    """Reports the throughput of the process tier for 1 to N workers."""
+    file_infos = [
+        {"id": f"file{i}", "name": f"notebook_{i}", "sft_type": "file", "is_stepwise": False}
+        for i in range(num_notebooks)
+    ]
+    notebooks = [build_notebook(num_turns)] * num_notebooks
+
+    base_throughput = None
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        with create_process_pool(workers) as pool:
+            # Start the workers and import the validators before timing
+            warmup_args = (repeat("SFT Validator", workers), file_infos, notebooks, repeat(OutputRetention.SUMMARY))
+            list(pool.map(validate_notebook_content, *warmup_args))
+
+            start_time = time.perf_counter()
+            list(
+                pool.map(
+                    validate_notebook_content,
+                    repeat("SFT Validator"),
+                    file_infos,
+                    notebooks,
+                    repeat(OutputRetention.SUMMARY),
+                    chunksize=4,
+                )
+            )
+            throughput = num_notebooks / (time.perf_counter() - start_time)
+
+        base_throughput = base_throughput or throughput
+        print(  # noqa: T201
+            f"{workers:>3} workers: {throughput:8.1f} notebooks/s, scaling {throughput / base_throughput:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,57 @@
+"""Benchmark of the TOOL_OUTPUT parser against the previous regex rewriting and eval implementation.
+
+Run from the repository root with:
+
+    python -m benchmarks.bench_tool_output
+"""
+
+import re
+import timeit
+
+from parsing.tool_output_parser import parse_tool_output
+
+FILE_ENTRY = """code_generated_text_files {{
+  file_name: 'sales_{i}.csv'
+  file_attachment {{
+    serving_url: 'https://storage.googleapis.com/bucket/sales_{i}.csv'
+    file_source: FILE_SOURCE_TOOL_GENERATED
+    file_type: FILE_TYPE_TEXT
+  }}
+}}"""
+
+
+def legacy_parse_tool_output(content: list[str]) -> dict:
+    """The previous implementation of ToolOutput.__parse_tool_output."""
+    try:
+        str_content = ", ".join([s.strip() for s in content if s.strip()])
+        str_content = str_content.replace("'", '"').replace("{", ": {").replace(": {,", ": {")
+        str_content = re.sub(r"\s+(:)", r"\1", str_content)
+        str_content = re.sub(r"(\w+):", r'"\1":', str_content)
+        str_content = re.sub(r'(?<=\w)"\s+', '", ', str_content)
+        str_content = str_content.replace("FILE_SOURCE_TOOL_GENERATED", '"FILE_SOURCE_TOOL_GENERATED"').replace(
+            "FILE_TYPE_TEXT", '"FILE_TYPE_TEXT"'
+        )
+        str_content = str_content.replace('https":', "https:").replace('""', '"')
+        metadata = eval(f"{{{str_content}}}")
+        return {} if isinstance(metadata, set) else metadata
+    except Exception:
+        return {}
+
+
+def main():
+    """Times both implementations on TOOL_OUTPUT blocks of increasing size."""
+    for num_entries in [1, 10, 100, 1000]:
+        content = "\n".join(FILE_ENTRY.format(i=i) for i in range(num_entries)).split("\n")
+        number = max(1, 1000 // num_entries)
+        assert legacy_parse_tool_output(content) == parse_tool_output("\n".join(content))
+
+        legacy_time = timeit.timeit(lambda: legacy_parse_tool_output(content), number=number) / number
+        parser_time = timeit.timeit(lambda: parse_tool_output("\n".join(content)), number=number) / number
+        print(  # noqa: T201
+            f"{num_entries:>5} entries: legacy {legacy_time * 1e3:8.3f} ms, "
+            f"parser {parser_time * 1e3:8.3f} ms, speedup {legacy_time / parser_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Script that handle plan creation and parsing."""
-from .colab_parser import ColabPlanParser  # noqa
+from .colab_parser import ColabPlanParser, PlanParsingError  # noqa
 from .colab_to_plan import create_a_plan_from_drive_notebook  # noqa
-from .plan_parser_utils import get_closest_match  # noqa
+from .plan_parser_utils import TagMatcher, get_closest_match  # noqa
+from .tool_output_parser import ToolOutputParseError, parse_tool_output  # noqa
 from .turn import Turn  # noqa
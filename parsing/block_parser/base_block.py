@@ -18,6 +18,8 @@ class BaseBlock:
     content (str): The raw content associated with the block (excluding the tag name).
     """
 
+    __slots__ = ("sft_type", "serial_number", "original_tag", "matched_tag", "content")
+
     def __init__(self, sft_type: str, serial_number: int, original_tag: str, matched_tag: str, content: str):
         """
         Initializes a block instance.
@@ -1,8 +1,10 @@
 """This script contains CODE and CODE_OUTPUT parsing classes."""
 
 import json
+from typing import Optional
 
 from parsing.block_parser import BaseBlock
+from parsing.block_parser.code_calls import CallIndex, get_call_index
 
 
 class Code(BaseBlock):
@@ -19,8 +21,40 @@ class Code(BaseBlock):
 
     content (str): The raw content associated with the block (excluding the tag name).
 
+    call_index (CallIndex): The call sites of the code, indexed on first access.
+
     """
 
+    __slots__ = ("_call_index",)
+
+    def __init__(self, sft_type, serial_number, original_tag, matched_tag, content):
+        """
+        Initializes the Code instance.
+
+        Parameters
+        ----------
+        sft_type (str): The type of SFT.
+
+        serial_number (int): The serial number of the block.
+
+        original_tag (str): The original tag as found in the input (with typos).
+
+        matched_tag (str): The closest valid tag from the provided event tags.
+
+        content (str): The content associated with the block (excluding the tag name).
+        """
+        super().__init__(sft_type, serial_number, original_tag, matched_tag, content)
+
+        # Indexed on first access
+        self._call_index: Optional[CallIndex] = None
+
+    @property
+    def call_index(self) -> CallIndex:
+        """The call sites of the code, shared by the blocks with the same code."""
+        if self._call_index is None:
+            self._call_index = get_call_index("\n".join(self.content))
+        return self._call_index
+
 
 class CodeOutput(BaseBlock):
     """
@@ -34,18 +68,44 @@ class CodeOutput(BaseBlock):
 
     matched_tag (str): The closest valid tag matched with the list of event tags.
 
-    content (str): The raw content associated with the block (excluding the tag name).
+    content (list): The outputs of the code cell, structured or serialized as a JSON string.
+
+    has_code_error (bool): Whether the outputs contain a code error, checked on first access.
 
     """
 
-    def __has_code_error(self):
-        """This method checks if the CODE_OUTPUT contains code error."""
-        self.has_code_error = False
+    __slots__ = ("_has_code_error",)
+
+    def __init__(self, sft_type, serial_number, original_tag, matched_tag, content):
+        """
+        Initializes the CodeOutput instance.
+
+        Parameters
+        ----------
+        sft_type (str): The type of SFT.
 
-        for output in json.loads(self.content[0]):
-            if output["output_type"] == "error":
-                self.has_code_error = True
-                break
+        serial_number (int): The serial number of the block.
 
-    def parse_block(self):
-        self.__has_code_error()
+        original_tag (str): The original tag as found in the input (with typos).
+
+        matched_tag (str): The closest valid tag from the provided event tags.
+
+        content (list): The outputs of the code cell, structured or serialized as a JSON string.
+        """
+        super().__init__(sft_type, serial_number, original_tag, matched_tag, content)
+
+        # Checked on first access
+        self._has_code_error: Optional[bool] = None
+
+    def __has_code_error(self) -> bool:
+        """This method checks if the CODE_OUTPUT contains code error."""
+        # The outputs are structured when loaded from the notebook, and serialized in older plans
+        outputs = json.loads(self.content[0]) if isinstance(self.content[0], str) else self.content[0]
+        return any(output["output_type"] == "error" for output in outputs)
+
+    @property
+    def has_code_error(self) -> bool:
+        """Whether the CODE_OUTPUT contains code error."""
+        if self._has_code_error is None:
+            self._has_code_error = self.__has_code_error()
+        return self._has_code_error
@@ -0,0 +1,256 @@
+"""This script contains the call index of the code of a CODE block.
+
+The code is parsed once with `ast` and every call site is indexed by the name of the called function, with the
+literal values of its positional and keyword arguments. The names assigned a literal value earlier in the code
+are resolved, so that `pd.read_csv(path)` is indexed with the value of `path`. The code that does not parse,
+even without its IPython magics, falls back to a regex extraction of the calls with flat argument lists.
+"""
+
+import ast
+import re
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+# Number of indexed codes kept in memory, the same code is often found in several turns and notebooks
+CALL_INDEX_CACHE_SIZE = 1024
+
+# IPython magics and shell commands, which are not python code
+MAGIC_LINE_REGEX = re.compile(r"^([ \t]*)[%!].*$", re.MULTILINE)
+# Calls with a flat argument list, for the code that does not parse
+FALLBACK_CALL_REGEX = re.compile(r"([A-Za-z_][\w.]*)\s*\(([^()]*)\)")
+FALLBACK_KEYWORD_REGEX = re.compile(r"^\s*([A-Za-z_]\w*)\s*=(?!=)(.*)$", re.DOTALL)
+
+
+class Unresolved:
+    """Value of an argument that is not a literal, nor a name assigned a literal."""
+
+    def __repr__(self) -> str:
+        return "UNRESOLVED"
+
+
+UNRESOLVED = Unresolved()
+
+
+class CallSite(NamedTuple):
+    """
+    A call of the code.
+
+    Attributes
+    ----------
+    func (str): The dotted name of the called function, e.g. `pd.read_csv`.
+
+    args (tuple): The values of the positional arguments, `UNRESOLVED` if they are not literal.
+
+    kwargs (dict): The values of the keyword arguments by name, `UNRESOLVED` if they are not literal.
+
+    lineno (int): The line of the call in the code.
+    """
+
+    func: str
+    args: tuple
+    kwargs: dict[str, Any]
+    lineno: int
+
+    def get_arg(self, position: Optional[int] = None, keyword: Optional[str] = None) -> Any:
+        """
+        Returns the value of an argument, given either by position or by keyword.
+
+        Parameters
+        ----------
+        position (int): The position of the argument.
+
+        keyword (str): The keyword of the argument.
+
+        Returns
+        -------
+        Any: The value of the argument, None if it is not given.
+        """
+        if keyword is not None and keyword in self.kwargs:
+            return self.kwargs[keyword]
+        if position is not None and position < len(self.args):
+            return self.args[position]
+        return None
+
+
+class CallIndex:
+    """
+    The call sites of a code, indexed by the name of the called function.
+
+    Attributes
+    ----------
+    calls (list): The call sites, in the order of the code.
+
+    is_parsed (bool): Whether the code was parsed with `ast`, False if the regex fallback was used.
+    """
+
+    def __init__(self, calls: list[CallSite], is_parsed: bool):
+        """
+        Initializes the CallIndex instance.
+
+        Parameters
+        ----------
+        calls (list): The call sites, in the order of the code.
+
+        is_parsed (bool): Whether the code was parsed with `ast`.
+        """
+        self.calls: list[CallSite] = calls
+        self.is_parsed: bool = is_parsed
+        self.__calls_by_name: dict[str, list[CallSite]] = {}
+        for call in calls:
+            self.__calls_by_name.setdefault(call.func.rsplit(".", 1)[-1], []).append(call)
+
+    def find_calls(self, name: str) -> list[CallSite]:
+        """
+        Returns the calls of a function, whatever the module or object it is called on.
+
+        Parameters
+        ----------
+        name (str): The name of the function, e.g. `read_csv`.
+
+        Returns
+        -------
+        list: The call sites of the function, in the order of the code.
+        """
+        return self.__calls_by_name.get(name, [])
+
+
+class CallCollector(ast.NodeVisitor):
+    """Collects the call sites of a parsed code in the order of the code, resolving the names assigned a literal."""
+
+    def __init__(self):
+        self.calls: list[CallSite] = []
+        self.__literals: dict[str, Any] = {}
+
+    def visit_Assign(self, node: ast.Assign):
+        """Visits the assigned value before the targets, as they are executed, and binds the assigned names."""
+        self.visit(node.value)
+        value = self.__get_value(node.value)
+        for target in node.targets:
+            self.visit(target)
+            self.__bind(target, value)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign):
+        """Visits the assigned value before the target, as they are executed, and binds the assigned name."""
+        if node.value is not None:
+            self.visit(node.value)
+            self.visit(node.target)
+            self.__bind(node.target, self.__get_value(node.value))
+
+    def visit_Name(self, node: ast.Name):
+        """Forgets the literal value of a name assigned in any other way, e.g. by a for loop."""
+        if not isinstance(node.ctx, ast.Load):
+            self.__literals.pop(node.id, None)
+
+    def visit_Call(self, node: ast.Call):
+        """Records the call site, then the calls in its arguments."""
+        self.calls.append(
+            CallSite(
+                func=get_dotted_name(node.func),
+                args=tuple(self.__get_value(arg) for arg in node.args),
+                kwargs={keyword.arg: self.__get_value(keyword.value) for keyword in node.keywords if keyword.arg},
+                lineno=node.lineno,
+            )
+        )
+        self.generic_visit(node)
+
+    def __bind(self, target: ast.expr, value: Any):
+        """Binds a name assigned a literal value, the visited targets are not resolved anymore."""
+        if isinstance(target, ast.Name) and value is not UNRESOLVED:
+            self.__literals[target.id] = value
+
+    def __get_value(self, node: ast.expr) -> Any:
+        """Returns the literal value of an expression, or of the name it refers to."""
+        if isinstance(node, ast.Name):
+            return self.__literals.get(node.id, UNRESOLVED)
+        try:
+            return ast.literal_eval(node)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            return UNRESOLVED
+
+
+def get_dotted_name(node: ast.expr) -> str:
+    """
+    Returns the dotted name of a called expression.
+
+    Parameters
+    ----------
+    node (ast.expr): The called expression.
+
+    Returns
+    -------
+    str: The dotted name, e.g. `pd.read_csv`, with `?` for the parts that are not names.
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return f"{get_dotted_name(node.value)}.{node.attr}"
+    return "?"
+
+
+def get_fallback_calls(code: str) -> list[CallSite]:
+    """
+    Extracts the calls with a flat argument list from a code that does not parse.
+
+    Parameters
+    ----------
+    code (str): The code.
+
+    Returns
+    -------
+    list: The call sites, in the order of the code.
+    """
+    calls = []
+    for match in FALLBACK_CALL_REGEX.finditer(code):
+        args, kwargs = [], {}
+        for arg in match.group(2).split(",") if match.group(2).strip() else []:
+            keyword = FALLBACK_KEYWORD_REGEX.match(arg)
+            if keyword:
+                kwargs[keyword.group(1)] = get_fallback_value(keyword.group(2))
+            else:
+                args.append(get_fallback_value(arg))
+        lineno = code.count("\n", 0, match.start()) + 1
+        calls.append(CallSite(match.group(1), tuple(args), kwargs, lineno))
+    return calls
+
+
+def get_fallback_value(arg: str) -> Any:
+    """Returns the literal value of an argument text, if any."""
+    try:
+        return ast.literal_eval(arg.strip())
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return UNRESOLVED
+
+
+def parse_code(code: str) -> Optional[ast.Module]:
+    """Parses a code, None if it does not parse."""
+    try:
+        return ast.parse(code)
+    except (SyntaxError, ValueError, MemoryError, RecursionError):
+        return None
+
+
+@lru_cache(maxsize=CALL_INDEX_CACHE_SIZE)
+def get_call_index(code: str) -> CallIndex:
+    """
+    Indexes the call sites of a code, memoized by the code.
+
+    The code that does not parse is parsed again with its IPython magics blanked out, so that the line numbers
+    are kept.
+
+    Parameters
+    ----------
+    code (str): The code of the CODE block.
+
+    Returns
+    -------
+    CallIndex: The call sites of the code, shared by the blocks with the same code.
+    """
+    tree = parse_code(code)
+    if tree is None:
+        tree = parse_code(MAGIC_LINE_REGEX.sub(r"\1pass", code))
+    if tree is None:
+        return CallIndex(get_fallback_calls(code), is_parsed=False)
+
+    collector = CallCollector()
+    collector.visit(tree)
+    return CallIndex(collector.calls, is_parsed=True)
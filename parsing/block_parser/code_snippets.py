@@ -0,0 +1,48 @@
+"""This script contains the span based splitting of a block text into plain text and code snippets."""
+
+CODE_FENCE = "```"
+
+
+def split_code_snippets(text: str) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+    """
+    Splits a text on its code fences into plain text and code snippet spans.
+
+    Parameters
+    ----------
+    text (str): The text of the block.
+
+    Returns
+    -------
+    tuple: The (start, end) spans of the plain text and of the code snippets in the text.
+    """
+    plain_text_spans: list[tuple[int, int]] = []
+    code_snippet_spans: list[tuple[int, int]] = []
+    spans = (plain_text_spans, code_snippet_spans)
+    start = index = 0
+    while True:
+        end = text.find(CODE_FENCE, start)
+        if end == -1:
+            spans[index % 2].append((start, len(text)))
+            return spans
+        spans[index % 2].append((start, end))
+        start = end + len(CODE_FENCE)
+        index += 1
+
+
+def join_spans(text: str, spans: list[tuple[int, int]]) -> str:
+    """
+    Joins the spans of a text.
+
+    Parameters
+    ----------
+    text (str): The text of the block.
+    spans (list): The (start, end) spans to join.
+
+    Returns
+    -------
+    str: The concatenated spans.
+    """
+    if len(spans) == 1:
+        start, end = spans[0]
+        return text if start == 0 and end == len(text) else text[start:end]
+    return "".join([text[start:end] for start, end in spans])
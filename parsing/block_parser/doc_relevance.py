@@ -19,6 +19,8 @@ class DocRelevanceRetrieval(BaseBlock):
 
     """
 
+    __slots__ = ()
+
 
 class DocRelevanceRetrievalOut(BaseBlock):
     """
@@ -36,6 +38,8 @@ class DocRelevanceRetrievalOut(BaseBlock):
 
     """
 
+    __slots__ = ()
+
 
 class ReWrittenQuery(BaseBlock):
     """
@@ -52,3 +56,5 @@ class ReWrittenQuery(BaseBlock):
     content (str): The raw content associated with the block (excluding the tag name).
 
     """
+
+    __slots__ = ()
@@ -4,9 +4,12 @@ EVENTS_TAG_UNIQUE_COLAB."""
 from typing import Optional
 
 from parsing.block_parser import BaseBlock
-from parsing.plan_parser_utils import get_closest_match
+from parsing.plan_parser_utils import TagMatcher
 from utils import FILE_METADATA_SUB_TAGS, OPTIONAL_FILE_METADATA_SUB_TAGS
 
+# Matcher of the ICE_FILE_METADATA sub-tags
+FILE_METADATA_SUB_TAG_MATCHER = TagMatcher(FILE_METADATA_SUB_TAGS + OPTIONAL_FILE_METADATA_SUB_TAGS)
+
 
 class ICEFileMetadata(BaseBlock):
     """
@@ -24,9 +27,11 @@ class ICEFileMetadata(BaseBlock):
 
     content (str): The raw content associated with the block (excluding the tag name).
 
-    metadata (dict): A dictionary storing parsed metadata.
+    metadata (dict): A dictionary storing parsed metadata, parsed on first access.
     """
 
+    __slots__ = ("_metadata",)
+
     def __init__(self, sft_type, serial_number, original_tag, matched_tag, content):
         """
         Initializes the ICEFileMetadata instance.
@@ -45,29 +50,33 @@ class ICEFileMetadata(BaseBlock):
         """
         super().__init__(sft_type, serial_number, original_tag, matched_tag, content)
 
-        # Instance attribute to hold parsed metadata
-        self.metadata: Optional[dict] = {}
+        # Instance attribute to hold parsed metadata, parsed on first access
+        self._metadata: Optional[dict] = None
 
-    def __parse_file_metadata(self):
+    def __parse_file_metadata(self) -> dict:
         """
         Parses the metadata in the ICE_FILE_METADATA.
         """
+        metadata = {}
         for line in self.content:
             if ":" in line:
                 key, value = line.split(":", 1)
-                corrected_key = get_closest_match(
-                    key.lower().strip(), FILE_METADATA_SUB_TAGS + OPTIONAL_FILE_METADATA_SUB_TAGS
-                )
+                corrected_key = FILE_METADATA_SUB_TAG_MATCHER.match(key.lower().strip())
 
                 if corrected_key in ["file_path:", "FILE_PATH:"]:
                     corrected_key = "FILE_PATH:"
-                self.metadata[corrected_key] = {
+                metadata[corrected_key] = {
                     "original_tag": key + ":",
                     "value": value.strip().strip('"').strip("'"),
                 }
-
-    def parse_block(self):
-        self.__parse_file_metadata()
+        return metadata
+
+    @property
+    def metadata(self) -> dict:
+        """The metadata of the ICE_FILE_METADATA."""
+        if self._metadata is None:
+            self._metadata = self.__parse_file_metadata()
+        return self._metadata
 
     def __str__(self):
         """
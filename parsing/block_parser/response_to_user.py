@@ -1,6 +1,7 @@
 """This script contains RESPONSE_TO_USER parsing class."""
 
 from parsing.block_parser import BaseBlock
+from parsing.block_parser.code_snippets import join_spans, split_code_snippets
 
 
 class RTU(BaseBlock):
@@ -19,17 +20,15 @@ class RTU(BaseBlock):
 
     """
 
+    __slots__ = ()
+
     def __parse_content_for_code_snippent(self):
         """This method parses the RESPONSE_TO_USER block.
         It splits the content into plain text and code snippet.
         """
-        plain_text = code_snippet = ""
-        for text in enumerate("\n".join(self.content).split("```")):
-            if text[0] % 2 == 0:
-                plain_text += text[1]
-            else:
-                code_snippet += text[1]
-        self.content = [plain_text, code_snippet]
+        text = "\n".join(self.content)
+        plain_text_spans, code_snippet_spans = split_code_snippets(text)
+        self.content = [join_spans(text, plain_text_spans), join_spans(text, code_snippet_spans)]
 
     def parse_block(self):
         self.__parse_content_for_code_snippent()
@@ -1,6 +1,9 @@
 """This script contains THOUGHT parsing class."""
 
+from typing import Optional
+
 from parsing.block_parser import BaseBlock
+from parsing.block_parser.code_snippets import join_spans, split_code_snippets
 
 
 class Thought(BaseBlock):
@@ -19,23 +22,47 @@ class Thought(BaseBlock):
 
     content (str): The raw content associated with the block (excluding the tag name).
 
+    is_file_loading_thought (bool): Whether the thought is about loading a file, checked on first access.
+
     """
 
+    __slots__ = ("_is_file_loading_thought",)
+
+    def __init__(self, sft_type, serial_number, original_tag, matched_tag, content):
+        """
+        Initializes the Thought instance.
+
+        Parameters
+        ----------
+        sft_type (str): The type of SFT.
+
+        serial_number (int): The serial number of the block.
+
+        original_tag (str): The original tag as found in the input (with typos).
+
+        matched_tag (str): The closest valid tag from the provided event tags.
+
+        content (str): The content associated with the block (excluding the tag name).
+        """
+        super().__init__(sft_type, serial_number, original_tag, matched_tag, content)
+
+        # Checked on first access
+        self._is_file_loading_thought: Optional[bool] = None
+
     def __parse_content_for_code_snippent(self):
         """This method parses the THOUGHT block.
         It splits the content into plain text and code snippet.
         """
-        plain_text = code_snippet = ""
-        for text in enumerate("\n".join(self.content).split("```")):
-            if text[0] % 2 == 0:
-                plain_text += text[1]
-            else:
-                code_snippet += text[1]
-        self.content = [plain_text, code_snippet]
+        text = "\n".join(self.content)
+        plain_text_spans, code_snippet_spans = split_code_snippets(text)
+        self.content = [join_spans(text, plain_text_spans), join_spans(text, code_snippet_spans)]
 
-    def __is_file_loading_thought(self):
-        self.is_file_loading_thought = "load" in self.content[0].lower()
+    @property
+    def is_file_loading_thought(self) -> bool:
+        """Whether the plain text of the THOUGHT is about loading a file."""
+        if self._is_file_loading_thought is None:
+            self._is_file_loading_thought = "load" in self.content[0].lower()
+        return self._is_file_loading_thought
 
     def parse_block(self):
         self.__parse_content_for_code_snippent()
-        self.__is_file_loading_thought()
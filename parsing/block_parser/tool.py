@@ -1,9 +1,9 @@
 """This script contains TOOL_CODE and TOOL_OUTPUT parsing classes."""
 
-import re
 from typing import Optional
 
 from parsing.block_parser import BaseBlock
+from parsing.tool_output_parser import ToolOutputParseError, parse_tool_output
 
 
 class ToolCode(BaseBlock):
@@ -22,6 +22,8 @@ class ToolCode(BaseBlock):
 
     """
 
+    __slots__ = ()
+
 
 class ToolOutput(BaseBlock):
     """
@@ -39,9 +41,13 @@ class ToolOutput(BaseBlock):
 
     content (str): The raw content associated with the block (excluding the tag name).
 
-    metadata (dict): A dictionary storing parsed metadata.
+    metadata (dict): A dictionary storing parsed metadata, parsed on first access.
+
+    parse_error (ToolOutputParseError): The error found while parsing the metadata, if any.
     """
 
+    __slots__ = ("_metadata", "_parse_error")
+
     def __init__(self, sft_type, serial_number, original_tag, matched_tag, content):
         """
         Initializes the ToolOutput instance.
@@ -60,44 +66,38 @@ class ToolOutput(BaseBlock):
         """
         super().__init__(sft_type, serial_number, original_tag, matched_tag, content)
 
-        # Instance attribute to hold parsed metadata
-        self.metadata: Optional[dict] = {}
+        # Instance attributes to hold parsed metadata, parsed on first access
+        self._metadata: Optional[dict] = None
+        self._parse_error: Optional[ToolOutputParseError] = None
 
     def __parse_tool_output(self):
         """Parses the content for TOOL_OUTPUT section into a dictionary."""
+        # Drop the empty lines and the markdown code fences around the content
+        lines = [line for line in self.content if line.strip() and not line.strip().startswith("```")]
+        parse_error = None
         try:
-            # Join non-empty strings with commas and strip whitespaces
-            str_content = ", ".join([s.strip() for s in self.content if s.strip()])
-
-            # Replace single quotes with double quotes and format dictionary structure
-            str_content = (
-                str_content.replace("'", '"').replace("{", ": {").replace(": {,", ": {")  # Format nested dictionaries
-            )  # Fix misplaced delimiters
-
-            # Remove space between colons and words
-            str_content = re.sub(r"\s+(:)", r"\1", str_content)
-
-            # Fix key-value pairs: add quotes around keys and ensure proper comma placement
-            str_content = re.sub(r"(\w+):", r'"\1":', str_content)
-            str_content = re.sub(r'(?<=\w)"\s+', '", ', str_content)
-
-            # Replace specific keywords with quoted versions
-            str_content = str_content.replace("FILE_SOURCE_TOOL_GENERATED", '"FILE_SOURCE_TOOL_GENERATED"').replace(
-                "FILE_TYPE_TEXT", '"FILE_TYPE_TEXT"'
-            )
-
-            # Fix 'https' issue by removing any misplaced quotes
-            str_content = str_content.replace('https":', "https:").replace('""', '"')
-
-            # Evaluate the string as a Python dictionary
-            self.metadata = eval(f"{{{str_content}}}")
-            if isinstance(self.metadata, set):
-                self.metadata = {}
-        except Exception:
-            self.metadata = {}
-
-    def parse_block(self):
-        self.__parse_tool_output()
+            metadata = parse_tool_output("\n".join(lines))
+        except ToolOutputParseError as error:
+            # Keep the fields parsed before the error
+            metadata, parse_error = error.partial_result, error
+
+        # The block is shared by the validator threads, the metadata marks the block as parsed so it is set last
+        self._parse_error = parse_error
+        self._metadata = metadata
+
+    @property
+    def metadata(self) -> dict:
+        """The metadata of the TOOL_OUTPUT."""
+        if self._metadata is None:
+            self.__parse_tool_output()
+        return self._metadata
+
+    @property
+    def parse_error(self) -> Optional[ToolOutputParseError]:
+        """The error found while parsing the metadata of the TOOL_OUTPUT, if any."""
+        if self._metadata is None:
+            self.__parse_tool_output()
+        return self._parse_error
 
     def __str__(self):
         """
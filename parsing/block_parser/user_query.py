@@ -18,3 +18,5 @@ class UserQuery(BaseBlock):
     content (str): The raw content associated with the block (excluding the tag name).
 
     """
+
+    __slots__ = ()
@@ -1,5 +1,7 @@
 """This script contains class that handles the complete Colab Info."""
 
+from typing import Iterable, Iterator, Optional
+
 from parsing.block_parser import (
     RTU,
     BaseBlock,
@@ -14,10 +16,16 @@ from parsing.block_parser import (
     ToolOutput,
     UserQuery,
 )
-from parsing.plan_parser_utils import get_closest_match
+from parsing.plan_parser_utils import TagMatcher, tokenize_markdown_line
 from parsing.turn import Turn
 from utils import EVENTS_TAG_UNIQUE_COLAB
 
+# Version of the parsed turns and blocks, bump it when the parsing changes to invalidate the parsed plan cache
+PARSER_VERSION = "3"
+
+# Matcher of the block tags, built once for every parsed colab
+EVENTS_TAG_MATCHER = TagMatcher(EVENTS_TAG_UNIQUE_COLAB)
+
 MAPPER: dict[str, BaseBlock] = {
     "USER_QUERY:": UserQuery,
     "ICE_FILE_METADATA:": ICEFileMetadata,
@@ -33,6 +41,12 @@ MAPPER: dict[str, BaseBlock] = {
 }
 
 
+class PlanParsingError(Exception):
+    """
+    Exception raised by `ColabPlanParser.iter_turns` when a streamed turn cannot be parsed.
+    """
+
+
 class ColabPlanParser:
     """
     A class representing the entire Colab plan and its sections, supporting multi-turn parsing.
@@ -40,27 +54,117 @@ class ColabPlanParser:
     Attributes
     ----------
     plan (str): The input plan string.
-    turns (list): A list of turns, each containing its own sections.
+    turns (list): A list of turns, each containing its own sections. Empty in streaming mode, where the turns
+        are only yielded by `iter_turns`.
     """
 
-    def __init__(self, plan: str, sft_type: str, is_stepwise: bool):
+    def __init__(self, plan: str, sft_type: str, is_stepwise: bool, stream: bool = False):
         """
         Initializes a ColabPlanParser instance.
 
         Parameters
         ----------
         plan (str): The input plan string.
+        sft_type (str): The type of SFT.
+        is_stepwise (bool): Whether the colab is stepwise.
+        stream (bool): Whether to parse the turns one by one while they are iterated with `iter_turns`,
+            instead of parsing the whole plan during initialization.
         """
         self.plan: str = plan
         self.sft_type: str = sft_type
         self.is_stepwise: bool = is_stepwise
         self.turns: list[Turn] = []
-        self.parse_plan()  # Automatically parse the plan during initialization
+        self.__num_code_errors: Optional[int] = None
+        self.__turn_stream: Optional[Iterator[Turn]] = None
+        if stream:
+            self.__set_turn_stream(self.__iter_plan_turns())
+        else:
+            self.parse_plan()  # Automatically parse the plan during initialization
+
+    @classmethod
+    def from_turns(
+        cls, turns: Iterable[Turn], sft_type: str, is_stepwise: bool, stream: bool = False
+    ) -> "ColabPlanParser":
+        """
+        Builds a ColabPlanParser from turns that are already parsed, without the plan.
+
+        Parameters
+        ----------
+        turns (Iterable): The parsed turns.
+        sft_type (str): The type of SFT.
+        is_stepwise (bool): Whether the colab is stepwise.
+        stream (bool): Whether to yield the turns one by one with `iter_turns` instead of keeping them all.
+
+        Returns
+        -------
+        ColabPlanParser: The parsed colab.
+        """
+        parsed_colab = cls.__new__(cls)
+        parsed_colab.plan = None
+        parsed_colab.sft_type = sft_type
+        parsed_colab.is_stepwise = is_stepwise
+        parsed_colab.turns = []
+        parsed_colab.__num_code_errors = None
+        parsed_colab.__turn_stream = None
+        if stream:
+            parsed_colab.__set_turn_stream(iter(turns))
+        else:
+            parsed_colab.turns.extend(turns)
+        return parsed_colab
+
+    def __set_turn_stream(self, turns: Iterator[Turn]) -> None:
+        """Sets the turns yielded by `iter_turns` in streaming mode, the code errors are counted as they go."""
+        self.__turn_stream = turns
+        self.__num_code_errors = 0
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether the turns are still to be yielded by `iter_turns`."""
+        return self.__turn_stream is not None
 
     def parse_plan(self):
         """
         Parses the plan into multiple turns and sections, handling typos in both block tags and sub-tags.
         """
+        self.turns.extend(self.__iter_plan_turns())
+
+    def iter_turns(self) -> Iterator[Turn]:
+        """
+        Yields the parsed turns one by one.
+
+        In streaming mode each turn is parsed when it is reached and is not kept by the parser, so that only
+        the turn being validated stays in memory. The turns can then be iterated only once, and
+        `num_code_errors` counts the code errors of the turns yielded so far.
+
+        Yields
+        ------
+        Turn: The parsed turns, in order.
+
+        Raises
+        ------
+        PlanParsingError: If a streamed turn cannot be parsed, the errors of the eager parsing are raised by
+            the initialization instead.
+        """
+        if self.__turn_stream is None:
+            yield from self.turns
+            return
+
+        turn_stream, self.__turn_stream = self.__turn_stream, None
+        while True:
+            # Only the errors of the parsing are wrapped, not the ones of the caller iterating the turns
+            try:
+                turn = next(turn_stream, None)
+            except Exception as e:
+                raise PlanParsingError(f"Error while parsing the plan: {e}") from e
+            if turn is None:
+                return
+            self.__num_code_errors += turn.num_code_errors()
+            yield turn
+
+    def __iter_plan_turns(self) -> Iterator[Turn]:
+        """
+        Parses the plan turn by turn, yielding each turn once its blocks are parsed.
+        """
         # Initialize the current turn as an empty list
         turn_num = 1
         current_turn = Turn(idx=turn_num, sft_type=self.sft_type, is_stepwise=self.is_stepwise)
@@ -68,11 +172,18 @@ class ColabPlanParser:
         serial_number = 1
         # Track the current block
         current_block = None
+        # Turns ended by a TURN tag, the untagged lines following the tag in its cell still go to their last block
+        finished_turns = []
 
         # Iterate over each cell (tuple of (cell_type, cell_content)) in the plan
         for cell_num, (cell_type, cell_content) in enumerate(self.plan, start=1):
-            # Clean up the cell content
-            cell_content = cell_content.strip()
+            for finished_turn in finished_turns:
+                yield self.__finish_turn(finished_turn)
+            finished_turns.clear()
+
+            # Clean up the cell content, the code outputs are kept structured
+            if isinstance(cell_content, str):
+                cell_content = cell_content.strip()
             # if not cell_content:
             #     continue
 
@@ -87,38 +198,14 @@ class ColabPlanParser:
                     if not markdown_line:
                         continue
 
-                    # Split the line into words to find potential tags
-                    if ":" in markdown_line:
-                        words = []
-                        for i, word in enumerate(markdown_line.split(":")):
-                            if i % 2 == 0:
-                                words.append(word + ":")
-                            else:
-                                words.append(word)
-
-                    else:
-                        words = markdown_line.split()
-                    max_words = min(len(words), 5)  # Limit the number of words for matching
-                    potential_tag = candidate_tag = ""
-                    content = []
-
-                    # Iterate over the first 5 words to find the longest valid tag
-                    for i in range(max_words):
-                        # Create a candidate tag by joining the first i+1 words
-                        candidate_tag = " ".join(words[: i + 1])
-                        closest_tag = get_closest_match(candidate_tag, EVENTS_TAG_UNIQUE_COLAB)
-
-                        if closest_tag:
-                            potential_tag = candidate_tag
-                            # The rest of the line is treated as content
-                            content.append(" ".join(words[i + 1 :]))  # noqa: E203
-                            break  # Stop after finding the first matching tag
+                    # Find the tag with typos, if any, and the content following it
+                    candidate_tag, closest_tag, line_content = tokenize_markdown_line(markdown_line, EVENTS_TAG_MATCHER)
 
                     if closest_tag == "TURN:" and cell_num == 1:
                         continue
 
                     if closest_tag == "TURN:":
-                        self.turns.append(current_turn)
+                        finished_turns.append(current_turn)
                         turn_num += 1
                         current_turn = Turn(
                             idx=turn_num,
@@ -132,7 +219,7 @@ class ColabPlanParser:
                     if closest_tag:
                         # If a valid tag is found, start a new block
                         current_block = MAPPER[closest_tag](
-                            self.sft_type, serial_number, potential_tag, closest_tag, content
+                            self.sft_type, serial_number, candidate_tag, closest_tag, [line_content]
                         )
                         current_turn.add_block(current_block)
                         serial_number += 1
@@ -167,15 +254,27 @@ class ColabPlanParser:
                 current_turn.add_block(current_block)
                 serial_number += 1
 
-        # Append the last turn if present
+        for finished_turn in finished_turns:
+            yield self.__finish_turn(finished_turn)
+
+        # Yield the last turn if present
         if current_turn.blocks:
-            self.turns.append(current_turn)
+            yield self.__finish_turn(current_turn)
+
+    @staticmethod
+    def __finish_turn(turn: Turn) -> Turn:
+        """Parses the blocks of a turn that is complete, before it is yielded."""
+        # The derived attributes of the blocks (metadata, code errors) are parsed on first access
+        turn.parse_blocks()
+        return turn
 
-        self.num_code_errors = 0
-        for turn in self.turns:
-            turn.parse_blocks()
-            turn.parse_datasets()
-            self.num_code_errors += turn.num_code_errors()
+    @property
+    def num_code_errors(self) -> int:
+        """The number of CODE_OUTPUT blocks with a code error, counted on first access, or while the turns are
+        streamed in streaming mode."""
+        if self.__num_code_errors is None:
+            self.__num_code_errors = sum(turn.num_code_errors() for turn in self.turns)
+        return self.__num_code_errors
 
     def get_turns(self):
         """
@@ -183,6 +282,9 @@ class ColabPlanParser:
 
         Returns
         -------
-        list: A list of turns, where each turn is a list of Section objects.
+        list: A list of turns, where each turn is a list of Section objects. In streaming mode, the turns that
+        are not yielded yet are parsed and kept.
         """
+        if self.__turn_stream is not None:
+            self.turns.extend(self.iter_turns())
         return self.turns
@@ -1,97 +1,170 @@
 """This file contains function to create plan from drive colab notebooks."""
 
+from typing import Optional, Union
 
-import json
+from parsing.notebook_loader import load_notebook_cells
+from parsing.output_retention import OutputRetention, apply_output_retention
+from utils import initialize_drive_service, logger, notebook_cache
+from utils.notebook_cache import NOTEBOOK_CACHE_ENABLED
 
-import nbformat
 
-from utils import initialize_drive_service, logger
-
-
-def create_a_plan_from_colab_notebook(nb: nbformat.NotebookNode) -> list[tuple[str, str]]:
+def create_a_plan_from_colab_notebook(
+    cells: list[dict], output_retention: str = OutputRetention.FULL
+) -> list[tuple[str, Union[str, list[dict]]]]:
     """
     Creates a plan string from a Colab notebook by extracting markdown and code cells.
 
     Parameters
     ----------
-    nb : nbformat.NotebookNode
-        The notebook object in nbformat that contains the cells to be processed.
+    cells : list[dict]
+        The cells of the notebook, as returned by `load_notebook_cells`.
+
+    output_retention : str, optional
+        Retention policy applied to the outputs of the code cells, by default OutputRetention.FULL.
 
     Returns
     -------
-    list[tuple[str, str]]]
+    list[tuple[str, Union[str, list[dict]]]]
         A formatted string with content from markdown cells and labeled code cells.
         Code cells are prefixed with "CODE:\n".
+        The outputs of the code cells are passed as they are, without being serialized.
     """
     plan_lines = []
 
     # Iterate through each cell in the notebook
-    for cell in nb.cells:
+    for cell in cells:
         # Check if the cell is of type markdown and contains content
-        if cell.cell_type == "markdown":
+        if cell["cell_type"] == "markdown":
             # Append the tuple ('markdown', content)
-            plan_lines.append(("markdown", cell.source))
+            plan_lines.append(("markdown", cell["source"]))
 
         # Check if the cell is of type code and contains content
-        elif cell.cell_type == "code":
+        elif cell["cell_type"] == "code":
             # Append the tuple ('code', content)
-            plan_lines.append(("code", cell.source))
+            plan_lines.append(("code", cell["source"]))
 
             # Check if there are outputs associated with the code cell
-            if cell.outputs and len(cell.outputs) > 0:
-                cell_out = json.dumps(cell.outputs)
-
+            if cell.get("outputs"):
                 # Append the tuple ('code_output', output content)
-                plan_lines.append(("code_output", cell_out))
+                plan_lines.append(("code_output", apply_output_retention(cell["outputs"], output_retention)))
 
     # Return the list of tuples (cell_type, content)
     return plan_lines
 
 
-def create_a_plan_from_drive_notebook(file_id: str):
+def download_drive_notebook(file_id: str, revision: Optional[str] = None) -> Optional[bytes]:
     """
-    Fetches a Jupyter notebook from Google Drive, processes it, and returns a formatted plan.
+    Downloads the raw content of a Jupyter notebook from Google Drive.
 
     Parameters
     ----------
     file_id : str
         The unique identifier of the file in Google Drive.
 
+    revision : Optional[str], optional
+        Revision key of the file from the Drive listing, by default None.
+        When provided, unchanged notebooks are served from the on-disk notebook cache.
+
     Returns
     -------
-    str or None
-        A formatted string containing the notebook content if it's successfully processed.
-        Returns None if the file is a folder or if any error occurs during processing.
-
-    Notes
-    -----
-    - This function assumes access to the Google Drive API through `drive_service`.
-    - Only files with a MIME type other than 'application/vnd.google-apps.folder' are processed.
-    - The notebook is assumed to be in `nbformat` version 4.
+    bytes or None
+        The raw notebook content.
+        Returns None if the file is a folder or if any error occurs during the download.
     """
+    use_cache = NOTEBOOK_CACHE_ENABLED and revision is not None
+    if use_cache:
+        try:
+            file_content = notebook_cache.get(file_id, revision)
+            if file_content is not None:
+                return file_content
+        except Exception as error:
+            logger.warning(f"Failed to read notebook {file_id} from the notebook cache: {str(error)}")
+
     try:
         # Fetch the file metadata to determine the MIME type and name
         drive_service = initialize_drive_service()
         file_metadata = drive_service.files().get(fileId=file_id, fields="name, mimeType").execute()  # noqa
         file_name, mime_type = file_metadata["name"], file_metadata["mimeType"]
 
-        # Only process if it's not a folder
-        if mime_type != "application/vnd.google-apps.folder":
-            # Download the file content
-            file_content = drive_service.files().get_media(fileId=file_id).execute()  # noqa
-
-            # Try to load notebook into nbformat
-            try:
-                nb = nbformat.reads(file_content.decode("utf-8"), as_version=4)
-                # Generate the plan string from the notebook content
-                return create_a_plan_from_colab_notebook(nb)
-            except Exception as error:
-                logger.exception(f"Failed to load notebook: {file_name} ({file_id}) - {str(error)}")
-                return None
-        else:
+        # Only download if it's not a folder
+        if mime_type == "application/vnd.google-apps.folder":
             logger.exception(f"File {file_name} is a folder.")
             return None
 
+        file_content = drive_service.files().get_media(fileId=file_id).execute()  # noqa
+
     except Exception as error:
         logger.exception(f"An error occurred while retrieving the file: {str(error)}")
         return None
+
+    if use_cache:
+        try:
+            notebook_cache.put(file_id, revision, file_content)
+        except Exception as error:
+            logger.warning(f"Failed to write notebook {file_id} to the notebook cache: {str(error)}")
+
+    return file_content
+
+
+def create_a_plan_from_notebook_content(
+    file_content: bytes, file_id: str, output_retention: str = OutputRetention.FULL
+) -> Optional[list[tuple[str, Union[str, list[dict]]]]]:
+    """
+    Loads the raw notebook content and returns a formatted plan.
+
+    Parameters
+    ----------
+    file_content : bytes
+        The raw notebook content as downloaded from Google Drive.
+
+    file_id : str
+        The unique identifier of the file in Google Drive, used for logging.
+
+    output_retention : str, optional
+        Retention policy applied to the outputs of the code cells, by default OutputRetention.FULL.
+
+    Returns
+    -------
+    list[tuple[str, Union[str, list[dict]]]] or None
+        The plan created from the notebook cells. Returns None if the notebook cannot be loaded.
+
+    Notes
+    -----
+    - Notebooks that are not in `nbformat` version 4 are converted by `nbformat`.
+    """
+    # Try to load the notebook cells
+    try:
+        cells = load_notebook_cells(file_content)
+        # Generate the plan string from the notebook content
+        return create_a_plan_from_colab_notebook(cells, output_retention)
+    except Exception as error:
+        logger.exception(f"Failed to load notebook: ({file_id}) - {str(error)}")
+        return None
+
+
+def create_a_plan_from_drive_notebook(file_id: str):
+    """
+    Fetches a Jupyter notebook from Google Drive, processes it, and returns a formatted plan.
+
+    Parameters
+    ----------
+    file_id : str
+        The unique identifier of the file in Google Drive.
+
+    Returns
+    -------
+    str or None
+        A formatted string containing the notebook content if it's successfully processed.
+        Returns None if the file is a folder or if any error occurs during processing.
+
+    Notes
+    -----
+    - This function assumes access to the Google Drive API through `drive_service`.
+    - Only files with a MIME type other than 'application/vnd.google-apps.folder' are processed.
+    - Notebooks that are not in `nbformat` version 4 are converted by `nbformat`.
+    """
+    file_content = download_drive_notebook(file_id)
+    if file_content is None:
+        return None
+
+    return create_a_plan_from_notebook_content(file_content, file_id)
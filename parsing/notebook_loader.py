@@ -0,0 +1,131 @@
+"""This file contains the loader turning the raw notebook content into its cells.
+
+The fast path decodes the raw bytes once, with orjson when it is installed, and skips the nbformat schema
+validation. Notebooks that are not in `nbformat` version 4, and every notebook when `NOTEBOOK_STRICT_LOADING`
+is set, go through the strict `nbformat` loader instead.
+"""
+
+import json
+import os
+
+import nbformat
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+NOTEBOOK_STRICT_LOADING: bool = os.getenv("NOTEBOOK_STRICT_LOADING", "false").lower() == "true"
+
+
+def decode_json(content: bytes):
+    """
+    Decodes the JSON content with the fastest available decoder.
+
+    Parameters
+    ----------
+    content : bytes
+        JSON document encoded in UTF-8.
+
+    Returns
+    -------
+    Any
+        Decoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def is_json_mime_type(mime_type: str) -> bool:
+    """
+    Checks whether the payloads of a mime type are JSON documents, which nbformat leaves as decoded.
+
+    Parameters
+    ----------
+    mime_type : str
+        Mime type of a mimebundle entry.
+
+    Returns
+    -------
+    bool
+        True for `application/json` and the `application/*+json` mime types.
+    """
+    return mime_type == "application/json" or (mime_type.startswith("application/") and mime_type.endswith("+json"))
+
+
+def rejoin_mimebundle(data: dict) -> None:
+    """
+    Joins the multiline strings of a mimebundle in place, as `nbformat.v4.rwbase.rejoin_lines` does.
+
+    Parameters
+    ----------
+    data : dict
+        Payloads by mime type.
+    """
+    for mime_type, payload in data.items():
+        if (
+            not is_json_mime_type(mime_type)
+            and isinstance(payload, list)
+            and all(isinstance(line, str) for line in payload)
+        ):
+            data[mime_type] = "".join(payload)
+
+
+def rejoin_cell_lines(cell: dict) -> None:
+    """
+    Joins the multiline strings of a cell in place, as `nbformat.v4.rwbase.rejoin_lines` does.
+
+    Parameters
+    ----------
+    cell : dict
+        Cell in the nbformat version 4 format.
+    """
+    # nbformat stores multiline strings as lists of lines
+    if isinstance(cell.get("source"), list):
+        cell["source"] = "".join(cell["source"])
+
+    for attachment in (cell.get("attachments") or {}).values():
+        rejoin_mimebundle(attachment)
+
+    if cell.get("cell_type") == "code":
+        for output in cell.get("outputs") or []:
+            output_type = output.get("output_type", "")
+            if output_type in ("execute_result", "display_data"):
+                rejoin_mimebundle(output.get("data") or {})
+            elif output_type and isinstance(output.get("text"), list):
+                output["text"] = "".join(output["text"])
+
+
+def load_notebook_cells(file_content: bytes, strict: bool = NOTEBOOK_STRICT_LOADING) -> list[dict]:
+    """
+    Loads the cells of the raw notebook content.
+
+    Parameters
+    ----------
+    file_content : bytes
+        The raw notebook content as downloaded from Google Drive.
+
+    strict : bool, optional
+        Load the notebook with `nbformat`, validating it against its schema, by default NOTEBOOK_STRICT_LOADING.
+
+    Returns
+    -------
+    list[dict]
+        Cells of the notebook, with their source and the multiline strings of their outputs joined into single
+        strings, as loaded by `nbformat`.
+
+    Raises
+    ------
+    ValueError
+        If the content is not a valid JSON document.
+    """
+    if not strict:
+        nb = decode_json(file_content)
+        if isinstance(nb, dict) and nb.get("nbformat") == 4 and isinstance(nb.get("cells"), list):
+            for cell in nb["cells"]:
+                rejoin_cell_lines(cell)
+            return nb["cells"]
+
+    # Fall back to nbformat, which also converts the older notebook formats to version 4
+    return nbformat.reads(file_content.decode("utf-8"), as_version=4).cells
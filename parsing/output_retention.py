@@ -0,0 +1,93 @@
+"""This file contains the retention policies applied to the code cell outputs when a notebook is loaded.
+
+The outputs of the code cells hold base64 images, HTML bundles and large dataframes that none of the current
+validations read. The summary policy keeps only what the validations need: the output types, the error names
+and tracebacks, and the size of the dropped payloads.
+"""
+
+
+class OutputRetention:
+    """Class to define the output retention policies, from the least to the most permissive."""
+
+    SUMMARY = "summary"
+    FULL = "full"
+
+    POLICIES = [SUMMARY, FULL]
+
+
+def get_most_permissive_policy(policies: list[str]) -> str:
+    """Function to get the policy keeping every output needed by all the given policies.
+
+    Parameters
+    ----------
+    policies : list[str]
+        Output retention policies.
+
+    Returns
+    -------
+    str
+        The most permissive policy, the least permissive one if no policy is given.
+    """
+    return max(policies, key=OutputRetention.POLICIES.index, default=OutputRetention.POLICIES[0])
+
+
+def get_payload_size(payload) -> int:
+    """Function to get the size of an output payload, stored as a string or as a list of lines.
+
+    Parameters
+    ----------
+    payload : Union[str, list[str]]
+        Output payload.
+
+    Returns
+    -------
+    int
+        Number of characters of the payload.
+    """
+    if isinstance(payload, list):
+        return sum(len(line) for line in payload)
+    return len(payload) if isinstance(payload, str) else len(str(payload))
+
+
+def summarize_output(output: dict) -> dict:
+    """Function to summarize a code cell output.
+
+    Parameters
+    ----------
+    output : dict
+        Code cell output in the nbformat version 4 format.
+
+    Returns
+    -------
+    dict
+        Output type, error name, value and traceback, stream name, and the size of the dropped payloads.
+    """
+    summary = {"output_type": output.get("output_type")}
+    if summary["output_type"] == "error":
+        summary.update({key: output.get(key) for key in ["ename", "evalue", "traceback"]})
+    elif summary["output_type"] == "stream":
+        summary.update({"name": output.get("name"), "size": get_payload_size(output.get("text", ""))})
+    elif "data" in output:
+        summary["sizes"] = {mime_type: get_payload_size(payload) for mime_type, payload in output["data"].items()}
+    return summary
+
+
+def apply_output_retention(outputs: list[dict], policy: str = OutputRetention.FULL) -> list[dict]:
+    """Function to apply the retention policy to the outputs of a code cell.
+
+    Parameters
+    ----------
+    outputs : list[dict]
+        Code cell outputs in the nbformat version 4 format.
+
+    policy : str, optional
+        Output retention policy, by default OutputRetention.FULL
+
+    Returns
+    -------
+    list[dict]
+        Retained outputs.
+    """
+    if policy == OutputRetention.SUMMARY:
+        return [summarize_output(output) for output in outputs]
+    return outputs
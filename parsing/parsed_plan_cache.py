@@ -0,0 +1,341 @@
+"""This file contains the persistent cache of the parsed notebook plans.
+
+The turns and blocks built by `ColabPlanParser` are stored as msgpack blobs in a SQLite database, keyed by the
+SHA-256 of the raw notebook content, the parser version, the output retention policy and the SFT info the plan
+was parsed with. Each turn is packed as its own msgpack object, so that the turns can be written and read back one
+by one while they are streamed. Warm runs load the parsed turns and go straight to the validators. Bumping
+`PARSER_VERSION` drops the plans parsed by the previous versions.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional
+
+import msgpack
+
+from parsing.block_parser import BaseBlock
+from parsing.colab_parser import MAPPER, PARSER_VERSION, ColabPlanParser
+from parsing.turn import Turn
+from utils import logger
+
+PARSED_PLAN_CACHE_PATH: str = os.getenv("PARSED_PLAN_CACHE_PATH", os.path.join(".cache", "parsed_plans.sqlite3"))
+PARSED_PLAN_CACHE_MAX_BYTES: int = int(os.getenv("PARSED_PLAN_CACHE_MAX_BYTES", str(1024**3)))
+PARSED_PLAN_CACHE_ENABLED: bool = os.getenv("PARSED_PLAN_CACHE_ENABLED", "true").lower() == "true"
+
+# Block classes by name, to rebuild the cached blocks
+BLOCK_TYPES: dict[str, type] = {block_type.__name__: block_type for block_type in [BaseBlock, *MAPPER.values()]}
+
+
+def get_plan_key(raw_content: bytes, output_retention: str, sft_type: str, is_stepwise: bool) -> str:
+    """
+    Builds the cache key of a parsed plan.
+
+    Parameters
+    ----------
+    raw_content : bytes
+        Raw notebook content.
+
+    output_retention : str
+        Retention policy applied to the code cell outputs of the plan.
+
+    sft_type : str
+        SFT type the plan is parsed with.
+
+    is_stepwise : bool
+        Stepwise info the plan is parsed with.
+
+    Returns
+    -------
+    str
+        Cache key of the parsed plan.
+    """
+    sha = hashlib.sha256(raw_content).hexdigest()
+    return f"{sha}:{PARSER_VERSION}:{output_retention}:{sft_type}:{int(bool(is_stepwise))}"
+
+
+def serialize_turn(turn: Turn) -> bytes:
+    """
+    Serializes the blocks of a parsed turn with msgpack.
+
+    Parameters
+    ----------
+    turn : Turn
+        Parsed turn.
+
+    Returns
+    -------
+    bytes
+        Serialized turn.
+    """
+    return msgpack.packb(
+        [
+            turn.idx,
+            [
+                [type(block).__name__, block.serial_number, block.original_tag, block.matched_tag, block.content]
+                for block in turn.blocks
+            ],
+        ],
+        use_bin_type=True,
+    )
+
+
+def serialize_parsed_colab(parsed_colab: ColabPlanParser) -> bytes:
+    """
+    Serializes the turns and blocks of a parsed plan with msgpack.
+
+    Parameters
+    ----------
+    parsed_colab : ColabPlanParser
+        Parsed plan.
+
+    Returns
+    -------
+    bytes
+        Serialized turns.
+    """
+    return b"".join(serialize_turn(turn) for turn in parsed_colab.get_turns())
+
+
+def iter_deserialized_turns(data: bytes, sft_type: str, is_stepwise: bool) -> Iterator[Turn]:
+    """
+    Rebuilds the parsed turns from their serialized blocks one by one, without parsing them again.
+
+    Parameters
+    ----------
+    data : bytes
+        Serialized turns.
+
+    sft_type : str
+        SFT type the plan was parsed with.
+
+    is_stepwise : bool
+        Stepwise info the plan was parsed with.
+
+    Yields
+    ------
+    Turn
+        Parsed turns, in order.
+    """
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+    unpacker.feed(data)
+    for idx, blocks in unpacker:
+        turn = Turn(idx=idx, sft_type=sft_type, is_stepwise=is_stepwise)
+        for block_type, serial_number, original_tag, matched_tag, content in blocks:
+            turn.add_block(BLOCK_TYPES[block_type](sft_type, serial_number, original_tag, matched_tag, content))
+        yield turn
+
+
+def deserialize_parsed_colab(data: bytes, sft_type: str, is_stepwise: bool, stream: bool = False) -> ColabPlanParser:
+    """
+    Rebuilds a parsed plan from its serialized turns, without parsing it again.
+
+    Parameters
+    ----------
+    data : bytes
+        Serialized turns.
+
+    sft_type : str
+        SFT type the plan was parsed with.
+
+    is_stepwise : bool
+        Stepwise info the plan was parsed with.
+
+    stream : bool, optional
+        Whether to rebuild the turns one by one while they are iterated, by default False.
+
+    Returns
+    -------
+    ColabPlanParser
+        Parsed plan.
+    """
+    turns = iter_deserialized_turns(data, sft_type, is_stepwise)
+    return ColabPlanParser.from_turns(turns, sft_type, is_stepwise, stream=stream)
+
+
+class ParsedPlanCache:
+    """
+    Size-bounded LRU cache of parsed plans, with hit and miss counters.
+
+    Attributes
+    ----------
+    db_path (str): Path of the SQLite database.
+
+    max_bytes (int): Maximum total size of the serialized plans.
+
+    hits (int): Number of plans loaded from the cache by this process.
+
+    misses (int): Number of plans missing from the cache in this process.
+    """
+
+    def __init__(self, db_path: str = PARSED_PLAN_CACHE_PATH, max_bytes: int = PARSED_PLAN_CACHE_MAX_BYTES):
+        """
+        Initializes the ParsedPlanCache instance.
+
+        Parameters
+        ----------
+        db_path (str): Path of the SQLite database.
+
+        max_bytes (int): Maximum total size of the serialized plans.
+        """
+        self.db_path: str = db_path
+        self.max_bytes: int = max_bytes
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__lock = threading.Lock()
+        self.__initialized = False
+
+    def get(self, key: str, sft_type: str, is_stepwise: bool, stream: bool = False) -> Optional[ColabPlanParser]:
+        """
+        Returns the cached parsed plan.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the parsed plan, see `get_plan_key`.
+
+        sft_type : str
+            SFT type the plan was parsed with.
+
+        is_stepwise : bool
+            Stepwise info the plan was parsed with.
+
+        stream : bool, optional
+            Whether to rebuild the turns one by one while they are iterated, by default False.
+
+        Returns
+        -------
+        Optional[ColabPlanParser]
+            Parsed plan, None on cache miss.
+        """
+        with self.__lock, self.__connect() as conn:
+            row = conn.execute("SELECT data FROM plans WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE plans SET last_access = ? WHERE key = ?", (time.time(), key))
+
+        try:
+            parsed_colab = deserialize_parsed_colab(row[0], sft_type, is_stepwise, stream=stream)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cached plan {key}: {e}")
+            with self.__lock, self.__connect() as conn:
+                conn.execute("DELETE FROM plans WHERE key = ?", (key,))
+                self.misses += 1
+            return None
+
+        with self.__lock:
+            self.hits += 1
+        return parsed_colab
+
+    def put(self, key: str, parsed_colab: ColabPlanParser) -> None:
+        """
+        Stores the parsed plan.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the parsed plan, see `get_plan_key`.
+
+        parsed_colab : ColabPlanParser
+            Parsed plan.
+        """
+        self.__put_data(key, serialize_parsed_colab(parsed_colab))
+
+    def iter_put(self, key: str, turns: Iterable[Turn]) -> Iterator[Turn]:
+        """
+        Yields the streamed turns of a parsed plan and stores the plan once all of them have been yielded.
+
+        Only the serialized turns are kept until then, the plan is not stored if the iteration stops early. A failed
+        write is only logged, as the turns were already yielded to the validators.
+
+        Parameters
+        ----------
+        key : str
+            Cache key of the parsed plan, see `get_plan_key`.
+
+        turns : Iterable[Turn]
+            Parsed turns, in order.
+
+        Yields
+        ------
+        Turn
+            Parsed turns, in order.
+        """
+        serialized_turns = []
+        for turn in turns:
+            serialized_turns.append(serialize_turn(turn))
+            yield turn
+        try:
+            self.__put_data(key, b"".join(serialized_turns))
+        except Exception as e:
+            logger.warning(f"Failed to write plan {key} to the parsed plan cache: {e}")
+
+    def __put_data(self, key: str, data: bytes) -> None:
+        """Stores the serialized turns of a parsed plan and evicts the least recently used plans if needed."""
+        with self.__lock, self.__connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO plans (key, parser_version, data, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, PARSER_VERSION, data, len(data), time.time()),
+            )
+            if self.__total_size(conn) > self.max_bytes:
+                self.__prune(conn, self.max_bytes)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the hit and miss counters and statistics about the cache content.
+
+        Returns
+        -------
+        dict[str, int]
+            Number of hits and misses, number of cached plans and their total size.
+        """
+        with self.__lock, self.__connect() as conn:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "plans": conn.execute("SELECT COUNT(*) FROM plans").fetchone()[0],
+                "total_bytes": self.__total_size(conn),
+                "max_bytes": self.max_bytes,
+            }
+
+    def __prune(self, conn: sqlite3.Connection, max_bytes: int) -> None:
+        """Evicts the least recently used plans until the cache fits in `max_bytes`."""
+        total_size = self.__total_size(conn)
+        for key, size in conn.execute("SELECT key, size FROM plans ORDER BY last_access").fetchall():
+            if total_size <= max_bytes:
+                break
+            conn.execute("DELETE FROM plans WHERE key = ?", (key,))
+            total_size -= size
+
+    @staticmethod
+    def __total_size(conn: sqlite3.Connection) -> int:
+        """Returns the total size of the serialized plans."""
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM plans").fetchone()[0]
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection to the database, creating it and dropping the outdated plans on first use."""
+        if not self.__initialized and os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self.__initialized:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS plans (key TEXT PRIMARY KEY, parser_version TEXT NOT NULL, "
+                    "data BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+                )
+                conn.execute("DELETE FROM plans WHERE parser_version != ?", (PARSER_VERSION,))
+                self.__initialized = True
+
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+parsed_plan_cache = ParsedPlanCache()
@@ -1,6 +1,114 @@
 """This file contains functions to parse plan into sections."""
 
 import difflib
+import re
+from functools import lru_cache
+from typing import Optional
+
+# Minimum similarity ratio for a tag with typos to be matched
+TAG_MATCH_CUTOFF = 0.8
+
+# Words of a markdown line without ':', as split by str.split()
+WORD_PATTERN = re.compile(r"\S+")
+
+
+class TagMatcher:
+    """
+    Matches items (block tags or sub-tags) with typos to a fixed vocabulary of valid items.
+
+    Returns the same matches as `difflib.get_close_matches(item, valid_items, n=1, cutoff=0.8)` on the
+    lowercase items, but is built once per vocabulary. Exact matches are found with a dictionary lookup,
+    and only the valid items whose length can reach the cutoff ratio are compared with `SequenceMatcher`.
+    Previously seen items are memoized.
+    """
+
+    def __init__(self, valid_items: list[str], cutoff: float = TAG_MATCH_CUTOFF, memo_size: int = 4096):
+        """
+        Initializes the TagMatcher instance.
+
+        Parameters
+        ----------
+        valid_items : list[str]
+            The list of valid items to match against.
+
+        cutoff : float, optional
+            Minimum similarity ratio of a match, by default TAG_MATCH_CUTOFF.
+
+        memo_size : int, optional
+            Number of matched items memoized, by default 4096.
+        """
+        self.cutoff: float = cutoff
+        # Map lowercase items to their original form
+        self.__valid_item_map: dict[str, str] = {v.lower(): v for v in valid_items}
+        # Bucket the lowercase items by length to only compare the ones that can reach the cutoff
+        self.__length_buckets: dict[int, list[str]] = {}
+        for valid_item in self.__valid_item_map:
+            self.__length_buckets.setdefault(len(valid_item), []).append(valid_item)
+        self.__memo = lru_cache(maxsize=memo_size)(self.__match)
+
+    def match(self, item: str) -> Optional[str]:
+        """
+        Finds the closest matching valid item.
+
+        Parameters
+        ----------
+        item : str
+            The item (block tag or sub-tag) that needs to be matched.
+
+        Returns
+        -------
+        Optional[str]
+            The closest valid item if a match is found, otherwise None.
+        """
+        return self.__memo(item)
+
+    def __match(self, item: str) -> Optional[str]:
+        """Finds the closest matching valid item, without memoization."""
+        # Check if there's a case-insensitive match
+        item_lower = item.lower()
+        if item_lower in self.__valid_item_map:
+            return self.__valid_item_map[item_lower]
+
+        # Apply typo correction if no direct match is found, as difflib.get_close_matches does
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(item_lower)
+        best_match = (0.0, None)
+        for valid_item in self.__get_candidates(len(item_lower)):
+            matcher.set_seq1(valid_item)
+            if (
+                matcher.real_quick_ratio() >= self.cutoff
+                and matcher.quick_ratio() >= self.cutoff
+                and matcher.ratio() >= self.cutoff
+            ):
+                # Ties are broken by the greatest item, as heapq.nlargest does in difflib
+                best_match = max(best_match, (matcher.ratio(), valid_item))
+
+        return self.__valid_item_map[best_match[1]] if best_match[1] else None
+
+    def __get_candidates(self, length: int) -> list[str]:
+        """Returns the valid items whose length can reach the cutoff ratio against an item of the given length."""
+        # The ratio of two strings of lengths a and b is at most 2 * min(a, b) / (a + b)
+        candidates = []
+        for valid_length, valid_items in self.__length_buckets.items():
+            if 2 * min(length, valid_length) >= self.cutoff * (length + valid_length) - 1e-9:
+                candidates.extend(valid_items)
+        return candidates
+
+
+@lru_cache(maxsize=None)
+def get_tag_matcher(valid_items: tuple[str, ...]) -> TagMatcher:
+    """
+    Returns the TagMatcher of the vocabulary, building it on first use.
+
+    Parameters
+    ----------
+    valid_items (tuple): The valid items to match against.
+
+    Returns
+    -------
+    TagMatcher: The matcher of the vocabulary.
+    """
+    return TagMatcher(list(valid_items))
 
 
 def get_closest_match(item: str, valid_items: list[str]) -> str:
@@ -14,16 +122,89 @@ def get_closest_match(item: str, valid_items: list[str]) -> str:
 
     Returns
     -------
-    str: The closest valid item if a match is found, otherwise returns the original item.
+    str: The closest valid item if a match is found, otherwise returns None.
     """
-    # Convert both the input item and valid items to lowercase for comparison
-    item_lower = item.lower()
-    valid_item_map = {v.lower(): v for v in valid_items}  # Map lowercase items to their original form
+    return get_tag_matcher(tuple(valid_items)).match(item)
 
-    # Check if there's a case-insensitive match
-    if item_lower in valid_item_map:
-        return valid_item_map[item_lower]
 
-    # Apply typo correction if no direct match is found
-    closest_match = difflib.get_close_matches(item_lower, list(valid_item_map.keys()), n=1, cutoff=0.8)
-    return valid_item_map[closest_match[0]] if closest_match else None
+def iter_line_words(line: str):
+    """
+    Iterates over the words of a markdown line, as split to find its tag.
+
+    A line containing ':' is split on ':', with the colon kept at the end of every other word, otherwise it is
+    split on whitespace. The words are found lazily with offsets into the line.
+
+    Parameters
+    ----------
+    line (str): The stripped markdown line.
+
+    Yields
+    ------
+    tuple: The word and the offset in the line where the rest of the line starts, None after the last word.
+    """
+    if ":" in line:
+        start = index = 0
+        while True:
+            end = line.find(":", start)
+            word = line[start:] if end == -1 else line[start:end]
+            yield (word + ":" if index % 2 == 0 else word), (None if end == -1 else end + 1)
+            if end == -1:
+                return
+            start = end + 1
+            index += 1
+    else:
+        for match in WORD_PATTERN.finditer(line):
+            yield match.group(), match.end()
+
+
+def tokenize_markdown_line(line: str, tag_matcher: TagMatcher, max_words: int = 5) -> tuple[str, Optional[str], str]:
+    """
+    Finds the tag of a markdown line and the content following it, in a single scan of the line.
+
+    The candidate tags are the first 1 to `max_words` words of the line joined with spaces. The first candidate
+    matching a valid tag is the tag of the line, and the remaining words joined with spaces are its content.
+
+    Parameters
+    ----------
+    line (str): The stripped, non-empty markdown line.
+    tag_matcher (TagMatcher): The matcher of the valid tags.
+    max_words (int): The maximum number of words of a tag.
+
+    Returns
+    -------
+    tuple: The last candidate tag, the matched tag (None if no tag is found) and the content of the line.
+    """
+    candidate_tag = ""
+    for i, (word, rest_start) in enumerate(iter_line_words(line)):
+        if i == max_words:
+            break
+        candidate_tag = f"{candidate_tag} {word}" if i else word
+        closest_tag = tag_matcher.match(candidate_tag)
+        if closest_tag:
+            return candidate_tag, closest_tag, get_line_content(line, rest_start, i + 1)
+    return candidate_tag, None, ""
+
+
+def get_line_content(line: str, rest_start: Optional[int], num_words: int) -> str:
+    """
+    Returns the content of a markdown line following its tag, with its words joined with spaces.
+
+    Parameters
+    ----------
+    line (str): The stripped markdown line.
+    rest_start (int): The offset in the line where the content starts, None if the tag ends the line.
+    num_words (int): The number of words of the tag.
+
+    Returns
+    -------
+    str: The content of the line.
+    """
+    if rest_start is None:
+        return ""
+    rest = line[rest_start:]
+    if ":" not in line:
+        return " ".join(rest.split())
+    if ":" not in rest:
+        # Only the words at an even position keep a colon
+        return rest + ":" if num_words % 2 == 0 else rest
+    return " ".join(part + ":" if (num_words + i) % 2 == 0 else part for i, part in enumerate(rest.split(":")))
@@ -0,0 +1,230 @@
+"""This file contains the parser of the TOOL_OUTPUT blocks.
+
+The content of a TOOL_OUTPUT block is written in a protobuf-text-like format:
+
+    code_generated_text_files {
+      file_name: 'sales.csv'
+      file_attachment {
+        serving_url: 'https://storage.googleapis.com/sales.csv'
+        file_source: FILE_SOURCE_TOOL_GENERATED
+      }
+    }
+
+The parser is a tolerant recursive-descent parser running in linear time. Separators (',' and ';'), comments,
+markdown emphasis and the optional ':' before a nested message are accepted, enum values are kept as strings,
+and a repeated field keeps its last value. Errors are reported with their position in the content.
+"""
+
+import re
+from typing import Optional, Union
+
+# Maximum nesting of the messages and lists
+MAX_DEPTH = 100
+
+# Whitespace, separators, comments and markdown emphasis between the tokens
+TRIVIA_PATTERN = re.compile(r"(?:[\s,;*`]+|#[^\n]*)*")
+IDENTIFIER_PATTERN = re.compile(r"[A-Za-z_][\w.\-/]*")
+STRING_PATTERN = re.compile(r"'((?:[^'\\\n]|\\.)*)'|\"((?:[^\"\\\n]|\\.)*)\"")
+SCALAR_PATTERN = re.compile(r"[^\s,;{}\[\]<>'\"#]+")
+ESCAPE_PATTERN = re.compile(r"\\(x[0-9a-fA-F]{2}|[0-7]{1,3}|.)")
+ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "a": "\a", "b": "\b", "f": "\f", "v": "\v"}
+
+Value = Union[str, int, float, bool, list, dict]
+
+
+class ToolOutputParseError(ValueError):
+    """
+    Exception raised when the content of a TOOL_OUTPUT block cannot be parsed.
+
+    Attributes
+    ----------
+    position (int): The offset in the content where the error was found.
+
+    line (int): The line of the error, starting at 1.
+
+    column (int): The column of the error, starting at 1.
+
+    partial_result (dict): The fields parsed before the error.
+    """
+
+    def __init__(self, message: str, text: str, position: int, partial_result: Optional[dict] = None):
+        self.position: int = position
+        self.line: int = text.count("\n", 0, position) + 1
+        self.column: int = position - text.rfind("\n", 0, position)
+        self.partial_result: dict = partial_result if partial_result is not None else {}
+        super().__init__(f"{message} at line {self.line}, column {self.column}")
+
+
+class _ToolOutputParser:
+    """Recursive-descent parser of the TOOL_OUTPUT content."""
+
+    def __init__(self, text: str):
+        self.text: str = text
+        self.pos: int = 0
+        self.result: dict = {}
+
+    def parse(self) -> dict:
+        """Parses the whole content into a dictionary."""
+        self.__skip_trivia()
+        if self.__peek() == "{":
+            # The fields may be wrapped in braces
+            self.pos += 1
+            self.__parse_fields(self.result, "}", 1)
+            self.pos += 1
+            self.__skip_trivia()
+        else:
+            self.__parse_fields(self.result, None, 0)
+        if self.pos < len(self.text):
+            self.__error(f"Unexpected {self.text[self.pos]!r}")
+        return self.result
+
+    def __error(self, message: str):
+        raise ToolOutputParseError(message, self.text, self.pos, self.result)
+
+    def __peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def __skip_trivia(self):
+        self.pos = TRIVIA_PATTERN.match(self.text, self.pos).end()
+
+    def __parse_fields(self, fields: dict, closing: Optional[str], depth: int):
+        """Parses the fields until the closing character, or the end of the content at the top level."""
+        if depth > MAX_DEPTH:
+            self.__error("Maximum nesting depth exceeded")
+        while True:
+            self.__skip_trivia()
+            char = self.__peek()
+            if closing and char == closing:
+                return
+            if not char:
+                if closing:
+                    self.__error(f"Expected {closing!r}")
+                return
+
+            key = self.__parse_key()
+            self.__skip_trivia()
+            has_colon = self.__peek() == ":"
+            if has_colon:
+                self.pos += 1
+                self.__skip_trivia()
+
+            if self.__peek() in ("{", "<"):
+                nested: dict = {}
+                fields[key] = nested
+                message_closing = "}" if self.__peek() == "{" else ">"
+                self.pos += 1
+                self.__parse_fields(nested, message_closing, depth + 1)
+                self.pos += 1
+            elif has_colon:
+                fields[key] = self.__parse_value(depth + 1)
+            else:
+                self.__error(f"Expected ':' or '{{' after {key!r}")
+
+    def __parse_key(self) -> str:
+        """Parses a field name, written as an identifier or a string."""
+        if self.__peek() in ("'", '"'):
+            return self.__parse_string()
+        match = IDENTIFIER_PATTERN.match(self.text, self.pos)
+        if not match:
+            self.__error("Expected a field name")
+        self.pos = match.end()
+        return match.group()
+
+    def __parse_value(self, depth: int) -> Value:
+        """Parses a scalar value, a list or a nested message following a ':'."""
+        char = self.__peek()
+        if char in ("'", '"'):
+            return self.__parse_string()
+        if char == "[":
+            return self.__parse_list(depth)
+        if char in ("{", "<"):
+            nested: dict = {}
+            self.pos += 1
+            self.__parse_fields(nested, "}" if char == "{" else ">", depth)
+            self.pos += 1
+            return nested
+        return self.__parse_scalar()
+
+    def __parse_list(self, depth: int) -> list:
+        """Parses a list of values."""
+        if depth > MAX_DEPTH:
+            self.__error("Maximum nesting depth exceeded")
+        self.pos += 1
+        values = []
+        while True:
+            self.__skip_trivia()
+            char = self.__peek()
+            if char == "]":
+                self.pos += 1
+                return values
+            if not char:
+                self.__error("Expected ']'")
+            values.append(self.__parse_value(depth + 1))
+
+    def __parse_string(self) -> str:
+        """Parses one or more adjacent quoted strings."""
+        parts = []
+        while True:
+            match = STRING_PATTERN.match(self.text, self.pos)
+            if not match:
+                self.__error("Unterminated string")
+            self.pos = match.end()
+            raw = match.group(1) if match.group(1) is not None else match.group(2)
+            parts.append(ESCAPE_PATTERN.sub(_unescape, raw) if "\\" in raw else raw)
+
+            # Adjacent strings on the same line are concatenated
+            end = self.pos
+            while end < len(self.text) and self.text[end] in " \t":
+                end += 1
+            if end >= len(self.text) or self.text[end] not in ("'", '"'):
+                return "".join(parts)
+            self.pos = end
+
+    def __parse_scalar(self) -> Union[str, int, float, bool]:
+        """Parses a number, a boolean, or an enum value or any other unquoted token kept as a string."""
+        match = SCALAR_PATTERN.match(self.text, self.pos)
+        if not match:
+            self.__error("Expected a value")
+        self.pos = match.end()
+        token = match.group()
+        if token in ("true", "True"):
+            return True
+        if token in ("false", "False"):
+            return False
+        if token[0] in "+-.0123456789":
+            for number_type in (int, float):
+                try:
+                    return number_type(token)
+                except ValueError:
+                    pass
+        return token
+
+
+def _unescape(match: re.Match) -> str:
+    """Returns the character of an escape sequence in a string."""
+    escape = match.group(1)
+    if escape[0] == "x" and len(escape) == 3:
+        return chr(int(escape[1:], 16))
+    if escape[0] in "01234567":
+        return chr(int(escape, 8))
+    return ESCAPES.get(escape, escape)
+
+
+def parse_tool_output(text: str) -> dict:
+    """
+    Parses the content of a TOOL_OUTPUT block into a dictionary.
+
+    Parameters
+    ----------
+    text (str): The content of the block.
+
+    Returns
+    -------
+    dict: The parsed fields, with the nested messages as dictionaries.
+
+    Raises
+    ------
+    ToolOutputParseError: If the content is malformed, with the position of the error and the fields parsed
+        before it.
+    """
+    return _ToolOutputParser(text).parse()
@@ -1,5 +1,6 @@
 """This script contains class that handles the Turn info."""
 
+from typing import Optional
 
 from parsing.block_parser import BaseBlock
 
@@ -7,13 +8,16 @@ from parsing.block_parser import BaseBlock
 class Turn:
     """This class handles the Turn info."""
 
+    __slots__ = ("idx", "sft_type", "is_stepwise", "blocks", "_datasets", "_skip_rows_count")
+
     def __init__(self, idx: int, sft_type: str, is_stepwise: bool):
         self.idx = idx
         self.sft_type = sft_type
         self.is_stepwise = is_stepwise
         self.blocks: list[BaseBlock] = []
-        self.datasets: dict[str, str] = {}
-        self.skip_rows_count: dict[str, int] = {}
+        # Extracted from the blocks on first access
+        self._datasets: Optional[dict[str, str]] = None
+        self._skip_rows_count: Optional[dict[str, int]] = None
 
     def add_block(self, block: BaseBlock) -> None:
         """
@@ -43,17 +47,19 @@ class Turn:
         """This method extracts file name, url and estimated_rows_above_header from
         the ICE_FILE_METADATA and TOOL_OUTPUT blocks.
         """
+        # The turn is shared by the validator threads, the results are only published once complete
+        datasets, skip_rows_count_by_file = {}, {}
         for block in self.blocks:
             if block.matched_tag == "ICE_FILE_METADATA:":
                 if block.metadata:
                     file_name = block.metadata.get("file_name:", {}).get("value", "")
                     file_path = block.metadata.get("FILE_PATH:", {}).get("value", "")
                     if file_name.endswith((".csv", ".tsv", ".pdf")):
-                        self.datasets.update({file_name: file_path})
+                        datasets.update({file_name: file_path})
 
                     skip_rows_count = block.metadata.get("estimated_rows_above_header:", {}).get("value", None)
                     if skip_rows_count:
-                        self.skip_rows_count.update({file_name: int(skip_rows_count)})
+                        skip_rows_count_by_file.update({file_name: int(skip_rows_count)})
 
             elif block.matched_tag == "TOOL_OUTPUT:":
                 if block.metadata:
@@ -61,7 +67,24 @@ class Turn:
                     file_name = tool_dict.get("file_name", "")
                     file_path = tool_dict.get("file_attachment", {}).get("serving_url", "")
                     if file_name.endswith((".csv", ".tsv", ".pdf")):
-                        self.datasets.update({file_name: file_path})
+                        datasets.update({file_name: file_path})
+
+        self._skip_rows_count = skip_rows_count_by_file
+        self._datasets = datasets
+
+    @property
+    def datasets(self) -> dict[str, str]:
+        """The file names and urls of the datasets of the turn."""
+        if self._datasets is None:
+            self.parse_datasets()
+        return self._datasets
+
+    @property
+    def skip_rows_count(self) -> dict[str, int]:
+        """The number of rows above the header of the datasets of the turn."""
+        if self._skip_rows_count is None:
+            self.parse_datasets()
+        return self._skip_rows_count
 
     def __str__(self):
         print(f"Turn {self.idx}:")  # noqa: T201
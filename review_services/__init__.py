@@ -1,4 +1,6 @@
 """"Module containing the SFT AutoReview / Validation services for the review app."""
+from .artifact_store import NotebookArtifactStore  # noqa
 from .colab import Colab  # noqa
-from .services_list import VALIDATOR_LIST  # noqa
+from .services_list import VALIDATOR_LIST, VALIDATOR_VERSIONS  # noqa
 from .services_runner import ServicesRunner  # noqa
+from .validation_store import ValidationStore, validation_store  # noqa
@@ -0,0 +1,274 @@
+"""This file contains the run-scoped store that shares notebook artifacts across validators."""
+
+import threading
+from typing import Optional, Union
+
+from parsing import ColabPlanParser
+from parsing.colab_to_plan import create_a_plan_from_notebook_content, download_drive_notebook
+from parsing.output_retention import OutputRetention
+from parsing.parsed_plan_cache import PARSED_PLAN_CACHE_ENABLED, get_plan_key, parsed_plan_cache
+from utils import get_revision_key, get_timing_recorder, logger
+
+
+class NotebookArtifacts:
+    """
+    Holds the artifacts computed for a single Drive notebook.
+
+    Attributes
+    ----------
+    file_info (dict): The file information of the notebook.
+
+    raw_content (bytes): The raw notebook content downloaded from Drive.
+
+    plan (list): The plan tuples created from the notebook cells.
+
+    parsed_colab (ColabPlanParser): The parsed notebook plan.
+
+    pending_validators (int): Number of validators that still need the artifacts.
+    """
+
+    def __init__(self, file_info: dict[str, str]):
+        """
+        Initializes an empty NotebookArtifacts instance.
+
+        Parameters
+        ----------
+        file_info (dict): The file information of the notebook.
+        """
+        self.file_info: dict[str, str] = file_info
+        self.raw_content: Optional[bytes] = None
+        self.plan: Optional[list[tuple[str, Union[str, list[dict]]]]] = None
+        self.parsed_colab: Optional[ColabPlanParser] = None
+        self.pending_validators: int = 0
+
+        # Single-flight lock, every artifact of the notebook is computed by exactly one validator task
+        self.lock = threading.RLock()
+        self.computed: set[str] = set()
+
+
+class NotebookArtifactStore:
+    """
+    Run-scoped store of notebook artifacts keyed by Drive file id.
+
+    The raw bytes, the plan tuples and the parsed ColabPlanParser of a notebook are computed once
+    and shared by all the validator tasks of that notebook. The artifacts are evicted when the last
+    registered validator releases the notebook. The parsed plans are also kept in the persistent
+    parsed plan cache, so that warm runs do not parse the unchanged notebooks again.
+
+    A validator that is the only reader of a notebook can stream its parsed turns instead, so that the
+    turns are parsed while they are validated and only one turn is held at a time.
+    """
+
+    def __init__(self, output_retention: str = OutputRetention.FULL):
+        """
+        Initializes an empty NotebookArtifactStore.
+
+        Parameters
+        ----------
+        output_retention : str, optional
+            Retention policy applied to the code cell outputs of the plans, by default OutputRetention.FULL.
+            Use the most permissive policy of the validators sharing the store.
+        """
+        self.output_retention: str = output_retention
+        self.__lock = threading.RLock()
+        self.__artifacts: dict[str, NotebookArtifacts] = {}
+
+    def __len__(self) -> int:
+        """Returns the number of notebooks currently held by the store."""
+        return len(self.__artifacts)
+
+    def register(self, file_info: dict[str, str], num_validators: int) -> None:
+        """
+        Registers the number of validators that are going to read the notebook artifacts.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        num_validators : int
+            Number of validator tasks submitted for the file.
+        """
+        with self.__lock:
+            self.__get_entry(file_info).pending_validators += num_validators
+
+    def release(self, file_id: str) -> None:
+        """
+        Marks one validator of the notebook as finished and evicts the artifacts after the last one.
+
+        Parameters
+        ----------
+        file_id : str
+            Drive file id of the notebook.
+        """
+        with self.__lock:
+            entry = self.__artifacts.get(file_id)
+            if entry is None:
+                return
+
+            entry.pending_validators -= 1
+            if entry.pending_validators <= 0:
+                del self.__artifacts[file_id]
+
+    def get_raw_content(self, file_info: dict[str, str]) -> Optional[bytes]:
+        """
+        Returns the raw notebook content, downloading it on first access.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        Returns
+        -------
+        Optional[bytes]
+            Raw notebook content, None if the download failed.
+        """
+        entry = self.__get_entry(file_info)
+        with entry.lock:
+            if "raw_content" not in entry.computed:
+                with get_timing_recorder().measure("download"):
+                    entry.raw_content = download_drive_notebook(file_info["id"], get_revision_key(file_info))
+                entry.computed.add("raw_content")
+            return entry.raw_content
+
+    def set_raw_content(self, file_info: dict[str, str], raw_content: Optional[bytes]) -> None:
+        """
+        Stores the raw notebook content downloaded by the caller, so that it is not downloaded again.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        raw_content : Optional[bytes]
+            Raw notebook content, None if the download failed.
+        """
+        entry = self.__get_entry(file_info)
+        with entry.lock:
+            entry.raw_content = raw_content
+            entry.computed.add("raw_content")
+
+    def get_plan(self, file_info: dict[str, str]) -> Optional[list[tuple[str, Union[str, list[dict]]]]]:
+        """
+        Returns the plan tuples of the notebook, creating them on first access.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        Returns
+        -------
+        Optional[list[tuple[str, Union[str, list[dict]]]]]
+            Plan created from the notebook cells, None if the notebook could not be loaded.
+        """
+        entry = self.__get_entry(file_info)
+        with entry.lock:
+            if "plan" not in entry.computed:
+                file_content = self.get_raw_content(file_info)
+                if file_content is not None:
+                    with get_timing_recorder().measure("notebook_load"):
+                        entry.plan = create_a_plan_from_notebook_content(
+                            file_content, file_info["id"], self.output_retention
+                        )
+                entry.computed.add("plan")
+            return entry.plan
+
+    def get_parsed_colab(self, file_info: dict[str, str], stream: bool = False) -> Optional[ColabPlanParser]:
+        """
+        Returns the parsed notebook plan, parsing it on first access.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        stream : bool, optional
+            Whether the caller only iterates the turns once with `ColabPlanParser.iter_turns`, by default False.
+            The plan is then parsed in streaming mode and not shared, unless it is already parsed or another
+            registered validator needs it.
+
+        Returns
+        -------
+        Optional[ColabPlanParser]
+            Parsed notebook plan, None if the plan could not be parsed.
+        """
+        entry = self.__get_entry(file_info)
+        with entry.lock:
+            if stream and "parsed_colab" not in entry.computed and entry.pending_validators <= 1:
+                return self.__get_streamed_parsed_colab(file_info)
+
+            if "parsed_colab" not in entry.computed:
+                entry.parsed_colab = self.__get_cached_parsed_colab(file_info)
+                if entry.parsed_colab is None:
+                    colab_plan = self.get_plan(file_info)
+                    try:
+                        # Initialize the parser
+                        with get_timing_recorder().measure("parse"):
+                            entry.parsed_colab = ColabPlanParser(
+                                colab_plan, file_info["sft_type"], file_info["is_stepwise"]
+                            )
+                        self.__put_cached_parsed_colab(file_info, entry.parsed_colab)
+                    except Exception as e:
+                        logger.error(f"Error while parsing the plan: {e}")
+                        entry.parsed_colab = None
+                entry.computed.add("parsed_colab")
+            return entry.parsed_colab
+
+    def __get_streamed_parsed_colab(self, file_info: dict[str, str]) -> Optional[ColabPlanParser]:
+        """Returns the parsed notebook plan in streaming mode, storing the streamed turns in the parsed plan cache."""
+        parsed_colab = self.__get_cached_parsed_colab(file_info, stream=True)
+        if parsed_colab is not None:
+            return parsed_colab
+
+        colab_plan = self.get_plan(file_info)
+        if colab_plan is None:
+            logger.error("Error while parsing the plan: the notebook could not be loaded")
+            return None
+
+        sft_type, is_stepwise = file_info["sft_type"], file_info["is_stepwise"]
+        # The turns are parsed while they are validated, only the parsing of each turn is measured
+        turns = get_timing_recorder().iter_measured(
+            "parse", ColabPlanParser(colab_plan, sft_type, is_stepwise, stream=True).iter_turns()
+        )
+        key = self.__get_plan_key(file_info)
+        if key is not None:
+            turns = parsed_plan_cache.iter_put(key, turns)
+        return ColabPlanParser.from_turns(turns, sft_type, is_stepwise, stream=True)
+
+    def __get_plan_key(self, file_info: dict[str, str]) -> Optional[str]:
+        """Returns the parsed plan cache key of the notebook, None if the cache is disabled or the download failed."""
+        raw_content = self.get_raw_content(file_info) if PARSED_PLAN_CACHE_ENABLED else None
+        if raw_content is None:
+            return None
+        return get_plan_key(raw_content, self.output_retention, file_info["sft_type"], file_info["is_stepwise"])
+
+    def __get_cached_parsed_colab(self, file_info: dict[str, str], stream: bool = False) -> Optional[ColabPlanParser]:
+        """Returns the parsed plan of the notebook from the parsed plan cache, None on cache miss."""
+        key = self.__get_plan_key(file_info)
+        if key is None:
+            return None
+        try:
+            return parsed_plan_cache.get(key, file_info["sft_type"], file_info["is_stepwise"], stream=stream)
+        except Exception as e:
+            logger.warning(f"Failed to read notebook {file_info['id']} from the parsed plan cache: {e}")
+            return None
+
+    def __put_cached_parsed_colab(self, file_info: dict[str, str], parsed_colab: ColabPlanParser) -> None:
+        """Stores the parsed plan of the notebook in the parsed plan cache."""
+        key = self.__get_plan_key(file_info)
+        if key is None:
+            return
+        try:
+            parsed_plan_cache.put(key, parsed_colab)
+        except Exception as e:
+            logger.warning(f"Failed to write notebook {file_info['id']} to the parsed plan cache: {e}")
+
+    def __get_entry(self, file_info: dict[str, str]) -> NotebookArtifacts:
+        """Returns the artifacts entry of the notebook, creating it if it does not exist."""
+        with self.__lock:
+            entry = self.__artifacts.get(file_info["id"])
+            if entry is None:
+                entry = self.__artifacts[file_info["id"]] = NotebookArtifacts(file_info)
+            return entry
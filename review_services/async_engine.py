@@ -0,0 +1,225 @@
+"""This file contains the asyncio engine running the I/O of the validation services on a single event loop.
+
+The Drive downloads and the AutoReview requests are plain HTTP requests awaited on a shared httpx client, so
+thousands of them can be in flight at once without a thread each. Every endpoint has its own semaphore to stay
+within its quota, and the CPU-bound parsing and validations are offloaded to a bounded executor.
+"""
+
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import httpx
+
+from review_services.autoreview_spelling_grammar.spell_grammar_service_utils import get_endpoint_url
+from utils import logger, notebook_cache
+from utils.drive_auth import client_manager
+from utils.notebook_cache import NOTEBOOK_CACHE_ENABLED
+
+DRIVE_API_URL = "https://www.googleapis.com/drive/v3"
+
+# Maximum number of in-flight requests per endpoint
+DRIVE_MAX_CONCURRENCY: int = int(os.getenv("DRIVE_MAX_CONCURRENCY", 256))
+AUTOREVIEW_MAX_CONCURRENCY: int = int(os.getenv("AUTOREVIEW_MAX_CONCURRENCY", 64))
+
+# Number of workers running the CPU-bound parsing and validations
+EXECUTOR_WORKERS: int = int(os.getenv("EXECUTOR_WORKERS", os.cpu_count() or 4))
+
+
+class AsyncEngine:
+    """
+    Runs the Drive and AutoReview requests of a validation run on the current event loop.
+
+    Use it as an async context manager, the HTTP client and the executor are closed on exit.
+    """
+
+    def __init__(
+        self,
+        drive_max_concurrency: int = DRIVE_MAX_CONCURRENCY,
+        autoreview_max_concurrency: int = AUTOREVIEW_MAX_CONCURRENCY,
+        executor_workers: int = EXECUTOR_WORKERS,
+    ):
+        """
+        Initializes the AsyncEngine instance.
+
+        Parameters
+        ----------
+        drive_max_concurrency : int, optional
+            Maximum number of in-flight Drive requests, by default DRIVE_MAX_CONCURRENCY.
+
+        autoreview_max_concurrency : int, optional
+            Maximum number of in-flight AutoReview requests, by default AUTOREVIEW_MAX_CONCURRENCY.
+
+        executor_workers : int, optional
+            Number of workers running the CPU-bound work, by default EXECUTOR_WORKERS.
+        """
+        self.__max_concurrency: dict[str, int] = {
+            "drive": drive_max_concurrency,
+            "autoreview": autoreview_max_concurrency,
+        }
+        self.__executor_workers: int = executor_workers
+        self.__semaphores: dict[str, asyncio.Semaphore] = {}
+        self.__client: Optional[httpx.AsyncClient] = None
+        self.__executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> "AsyncEngine":
+        """Opens the HTTP client and the executor."""
+        # The semaphores are bound to the running event loop
+        self.__semaphores = {endpoint: asyncio.Semaphore(limit) for endpoint, limit in self.__max_concurrency.items()}
+        self.__client = httpx.AsyncClient(
+            timeout=httpx.Timeout(1000, connect=60),
+            limits=httpx.Limits(max_connections=sum(self.__max_concurrency.values())),
+        )
+        self.__executor = ThreadPoolExecutor(max_workers=self.__executor_workers)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Closes the HTTP client and the executor."""
+        await self.__client.aclose()
+        self.__executor.shutdown(wait=False)
+
+    async def run_in_executor(self, func: Callable, *args) -> Any:
+        """
+        Runs the CPU-bound or blocking function in the engine executor, in a copy of the current context.
+
+        Parameters
+        ----------
+        func : Callable
+            Function to run.
+
+        *args
+            Positional arguments of the function.
+
+        Returns
+        -------
+        Any
+            Return value of the function.
+        """
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.__executor, functools.partial(context.run, func, *args)
+        )
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends the HTTP request, waiting for a free slot of the endpoint.
+
+        Parameters
+        ----------
+        endpoint : str
+            Name of the endpoint limiting the concurrency, "drive" or "autoreview".
+
+        method : str
+            HTTP method.
+
+        url : str
+            URL of the request.
+
+        **kwargs
+            Arguments passed to `httpx.AsyncClient.request`.
+
+        Returns
+        -------
+        httpx.Response
+            Successful response.
+
+        Raises
+        ------
+        httpx.HTTPStatusError
+            If the response has an error status code.
+        """
+        async with self.__semaphores[endpoint]:
+            response = await self.__client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+
+    async def download_drive_notebook(self, file_id: str, revision: Optional[str] = None) -> Optional[bytes]:
+        """
+        Async version of `parsing.colab_to_plan.download_drive_notebook`.
+
+        Parameters
+        ----------
+        file_id : str
+            The unique identifier of the file in Google Drive.
+
+        revision : Optional[str], optional
+            Revision key of the file from the Drive listing, by default None.
+            When provided, unchanged notebooks are served from the on-disk notebook cache.
+
+        Returns
+        -------
+        Optional[bytes]
+            The raw notebook content, None if any error occurs during the download.
+        """
+        use_cache = NOTEBOOK_CACHE_ENABLED and revision is not None
+        if use_cache:
+            try:
+                file_content = await self.run_in_executor(notebook_cache.get, file_id, revision)
+                if file_content is not None:
+                    return file_content
+            except Exception as error:
+                logger.warning(f"Failed to read notebook {file_id} from the notebook cache: {str(error)}")
+
+        try:
+            # Folders and other non-downloadable files are rejected by Drive with an error status
+            response = await self.request(
+                "drive",
+                "GET",
+                f"{DRIVE_API_URL}/files/{file_id}",
+                params={"alt": "media"},
+                headers=await self.__get_authorization_headers(),
+            )
+            file_content = response.content
+        except Exception as error:
+            logger.exception(f"An error occurred while retrieving the file: {str(error)}")
+            return None
+
+        if use_cache:
+            try:
+                await self.run_in_executor(notebook_cache.put, file_id, revision, file_content)
+            except Exception as error:
+                logger.warning(f"Failed to write notebook {file_id} to the notebook cache: {str(error)}")
+
+        return file_content
+
+    async def query_autoreview(self, request: dict, stream: bool = False) -> dict:
+        """
+        Async version of `spell_grammar_service_utils.query_endpoint`.
+
+        Parameters
+        ----------
+        request : dict
+            Request to send to the AutoReview endpoint.
+
+        stream : bool, optional
+            Flag to enable streaming, by default False.
+
+        Returns
+        -------
+        dict
+            Response from the AutoReview endpoint.
+        """
+        request["bardConfig"] = {}
+        try:
+            response = await self.request(
+                "autoreview",
+                "POST",
+                get_endpoint_url(request, stream),
+                json=request,
+                headers={"Content-Type": "application/json"},
+            )
+        except httpx.HTTPStatusError as e:
+            logger.error("Request failed: %s", e)
+            logger.error(e.response.text)
+            raise e
+
+        logger.info("Status Code: %s", response.status_code)
+        return response.json()
+
+    async def __get_authorization_headers(self) -> dict[str, str]:
+        """Returns the authorization headers of the Google API requests, refreshing the credentials if needed."""
+        credentials = await self.run_in_executor(client_manager.get_credentials)
+        return {"Authorization": f"Bearer {credentials.token}"}
@@ -1,2 +1,2 @@
 """This is AutoReview Spelling and Grammar Service Module."""
-from .spell_grammar_runner import spell_grammar_autoreview  # noqa
+from .spell_grammar_runner import spell_grammar_autoreview, spell_grammar_autoreview_async  # noqa
@@ -2,10 +2,18 @@
 
 import re
 import traceback
+from typing import Optional
 
-from review_services.autoreview_spelling_grammar.spell_grammar_service_utils import process_autoreview_request
+from parsing import ColabPlanParser
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.async_engine import AsyncEngine
+from review_services.autoreview_spelling_grammar.spell_grammar_service_utils import (
+    build_autoreview_request,
+    get_response_candidate_text,
+    process_autoreview_request,
+)
 from review_services.colab import Colab
-from utils import Status, logger
+from utils import Status, get_timing_recorder, logger
 
 
 def parse_result(response: str) -> dict[str, str]:
@@ -42,7 +50,30 @@ def parse_result(response: str) -> dict[str, str]:
     return {"status": Status.FAILED, "errors": errors}
 
 
-def spell_grammar_autoreview(file_info: dict[str, str]) -> Colab:
+def build_autoreview_text(parsed_colab: ColabPlanParser) -> str:
+    """Build the text of the colab reviewed by the AutoReview endpoint.
+
+    Parameters
+    ----------
+    parsed_colab : ColabPlanParser
+        Parsed colab.
+
+    Returns
+    -------
+    str
+        THOUGHT and RESPONSE_TO_USER blocks of the colab, one per line.
+    """
+    text = ""
+    for turn in parsed_colab.get_turns():
+        for block in turn.blocks:
+            if block.matched_tag in ["THOUGHT:", "RESPONSE_TO_USER:"]:
+                text += f"Turn {turn.idx}, Block {block.serial_number}, [{block.matched_tag}] {block.content[0]}\n"
+    return text
+
+
+def spell_grammar_autoreview(
+    file_info: dict[str, str], artifact_store: Optional[NotebookArtifactStore] = None
+) -> Colab:
     """Function to process a single Colab file.
 
     Parameters
@@ -50,27 +81,64 @@ def spell_grammar_autoreview(file_info: dict[str, str]) -> Colab:
     file_info : dict[str, str]
         Dictionary containing the file information.
 
+    artifact_store : Optional[NotebookArtifactStore], optional
+        Run-scoped store sharing the notebook artifacts across validators, by default None
+
     Returns
     -------
     Colab
         Colab object containing the Colab name, URL, and errors (if any).
     """
-    colab: Colab = Colab(file_info)
+    colab: Colab = Colab(file_info, artifact_store)
     if colab.parsed_colab is None:
         colab.colab_res["errors"] = None
         colab.colab_res["status"] = "colab parsing failed"
         return colab
 
     # Process the request
-    text = ""
-    for turn in colab.parsed_colab.get_turns():
-        for block in turn.blocks:
-            if block.matched_tag in ["THOUGHT:", "RESPONSE_TO_USER:"]:
-                text += f"Turn {turn.idx}, Block {block.serial_number}, [{block.matched_tag}] {block.content[0]}\n"
-
-    response = process_autoreview_request(text)
+    text = build_autoreview_text(colab.parsed_colab)
+    with get_timing_recorder().measure("autoreview_request"):
+        response = process_autoreview_request(text)
     parsed_response = parse_result(response)
     colab.colab_res["errors"] = parsed_response.get("errors")
     colab.colab_res["status"] = parsed_response.get("status")
 
     return colab
+
+
+async def spell_grammar_autoreview_async(
+    file_info: dict[str, str], artifact_store: NotebookArtifactStore, engine: AsyncEngine
+) -> Colab:
+    """Async version of `spell_grammar_autoreview`, awaiting the AutoReview request on the engine.
+
+    Parameters
+    ----------
+    file_info : dict[str, str]
+        Dictionary containing the file information.
+
+    artifact_store : NotebookArtifactStore
+        Run-scoped store sharing the notebook artifacts across validators.
+
+    engine : AsyncEngine
+        Engine running the requests and the CPU-bound work of the run.
+
+    Returns
+    -------
+    Colab
+        Colab object containing the Colab name, URL, and errors (if any).
+    """
+    colab: Colab = await engine.run_in_executor(Colab, file_info, artifact_store)
+    if colab.parsed_colab is None:
+        colab.colab_res["errors"] = None
+        colab.colab_res["status"] = "colab parsing failed"
+        return colab
+
+    # Process the request
+    text = await engine.run_in_executor(build_autoreview_text, colab.parsed_colab)
+    with get_timing_recorder().measure("autoreview_request", cpu=False):
+        response = await engine.query_autoreview(build_autoreview_request(text))
+    parsed_response = parse_result(get_response_candidate_text(response))
+    colab.colab_res["errors"] = parsed_response.get("errors")
+    colab.colab_res["status"] = parsed_response.get("status")
+
+    return colab
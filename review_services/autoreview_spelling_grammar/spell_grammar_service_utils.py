@@ -9,6 +9,25 @@ from review_services.model_configs import AutoReview
 from utils import logger
 
 
+def get_endpoint_url(request: dict, stream: bool = False) -> str:
+    """Get the AutoReview endpoint URL for the model of the given request.
+
+    Parameters
+    ----------
+    request : dict
+        Request to send to the AutoReview endpoint.
+    stream : bool, optional
+        Flag to enable streaming, by default False.
+
+    Returns
+    -------
+    str
+        URL of the AutoReview endpoint.
+    """
+    method = "streamGenerateContent" if stream else "generateContent"
+    return f"{AutoReview.URL}/v1beta/{request.get('model')}:{method}?key={AutoReview.API_KEY}"
+
+
 def query_endpoint(
     request: dict,
     iceFlowState: dict = {},
@@ -37,15 +56,11 @@ def query_endpoint(
         Response from the AutoReview endpoint.
     """
     # Send POST request
-    model = request.get("model")
     try:
-
-        method = "streamGenerateContent" if stream else "generateContent"
-
         request["bardConfig"] = {}
 
         response = requests.post(
-            f"{AutoReview.URL}/v1beta/{model}:{method}?key={AutoReview.API_KEY}",
+            get_endpoint_url(request, stream),
             json=request,
             headers={
                 "Content-Type": "application/json",
@@ -80,8 +95,8 @@ def get_response_candidate_text(response: dict) -> str:
     return response["candidates"][0]["content"]["parts"][0]["text"]
 
 
-def process_autoreview_request(text: str) -> str:
-    """Process the AutoReview request for the given text.
+def build_autoreview_request(text: str) -> dict:
+    """Build the AutoReview request for the given text.
 
     Parameters
     ----------
@@ -90,8 +105,8 @@ def process_autoreview_request(text: str) -> str:
 
     Returns
     -------
-    str
-        Processed text.
+    dict
+        Request to send to the AutoReview endpoint.
     """
     with open(os.path.join("review_services", "prompts_instructions.yaml")) as f:
         prompt_instructions = yaml.safe_load(f)
@@ -114,6 +129,22 @@ def process_autoreview_request(text: str) -> str:
         },
     }
 
-    autoreview_resp = query_endpoint(autoreview_req)
+    return autoreview_req
+
+
+def process_autoreview_request(text: str) -> str:
+    """Process the AutoReview request for the given text.
+
+    Parameters
+    ----------
+    text : str
+        Text to be processed.
+
+    Returns
+    -------
+    str
+        Processed text.
+    """
+    autoreview_resp = query_endpoint(build_autoreview_request(text))
     autoreview_resp_text = get_response_candidate_text(autoreview_resp)
     return autoreview_resp_text
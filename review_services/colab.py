@@ -1,23 +1,23 @@
 """This file contain class that stores the colab information and parsed colab plan."""
 
-from parsing import ColabPlanParser
-from parsing.colab_to_plan import create_a_plan_from_drive_notebook
-from utils import logger
+from typing import Optional
+
+from review_services.artifact_store import NotebookArtifactStore
 
 
 class Colab:
-    def __init__(self, file_info: dict[str, str]):
+    def __init__(
+        self, file_info: dict[str, str], artifact_store: Optional[NotebookArtifactStore] = None, stream: bool = False
+    ):
         self.file_info: dict[str, str] = file_info
         self.file_name: str = file_info["name"]
         file_id: str = file_info["id"]
         self.colab_url: str = f"https://colab.research.google.com/drive/{file_id}"
         self.colab_res: dict[str, str] = {"colab_name": file_info["name"], "colab_url": self.colab_url}
 
-        colab_plan_str = create_a_plan_from_drive_notebook(file_id)
+        # Without a run-scoped store the notebook is downloaded and parsed for this Colab only
+        if artifact_store is None:
+            artifact_store = NotebookArtifactStore()
 
-        try:
-            # Initialize the parser
-            self.parsed_colab = ColabPlanParser(colab_plan_str, file_info["sft_type"], file_info["is_stepwise"])
-        except Exception as e:
-            logger.error(f"Error while parsing the plan: {e}")
-            self.parsed_colab = None
+        # Validators that iterate the turns once can stream them, see NotebookArtifactStore.get_parsed_colab
+        self.parsed_colab = artifact_store.get_parsed_colab(file_info, stream)
@@ -0,0 +1,5 @@
+"""This is the Near-Duplicate Detection Service Module."""
+from .minhash import MinHasher, get_shingles  # noqa
+from .near_duplicate_runner import flag_near_duplicate_pairs  # noqa
+from .near_duplicate_runner import near_duplicate_validator, near_duplicate_validator_async  # noqa
+from .signature_store import SignatureStore, signature_store  # noqa
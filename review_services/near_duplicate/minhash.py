@@ -0,0 +1,142 @@
+"""This file contains the MinHash signatures and the LSH banding of the near-duplicate detection.
+
+The review text of a notebook is split into overlapping word shingles, and the MinHash signature of the shingles
+estimates the Jaccard similarity of two notebooks from the fraction of equal signature values. The signatures are
+cut into bands, and two notebooks sharing the values of a whole band are candidate near-duplicates: with `b` bands
+of `r` rows, notebooks of Jaccard similarity `s` become candidates with probability `1 - (1 - s^r)^b`, so that only
+the candidates are compared instead of every pair of notebooks.
+"""
+
+import re
+import zlib
+from typing import Iterable
+
+import numpy as np
+
+# Number of words of a shingle
+SHINGLE_SIZE = 5
+# Number of hash functions of the signatures, split into NUM_BANDS bands of NUM_PERM / NUM_BANDS rows
+NUM_PERM = 128
+NUM_BANDS = 16
+# Seed of the hash functions, the stored signatures are only comparable with the same seed and number of hashes
+MINHASH_SEED = 1
+
+# Mersenne prime modulus of the hash functions, larger than the 32-bit shingle hashes
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+WORD_REGEX = re.compile(r"\w+")
+
+
+def get_shingles(text: str, size: int = SHINGLE_SIZE) -> set[str]:
+    """
+    Splits a text into its overlapping word shingles, regardless of the case and the punctuation.
+
+    Parameters
+    ----------
+    text : str
+        Text to shingle.
+
+    size : int, optional
+        Number of words of a shingle, by default SHINGLE_SIZE.
+
+    Returns
+    -------
+    set[str]
+        Shingles of the text, a single shingle for the texts shorter than a shingle.
+    """
+    words = WORD_REGEX.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+class MinHasher:
+    """
+    MinHash signatures of shingle sets, with universal hash functions `(a * x + b) mod p`.
+
+    Attributes
+    ----------
+    num_perm (int): Number of hash functions, the length of the signatures.
+
+    num_bands (int): Number of LSH bands the signatures are cut into.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, num_bands: int = NUM_BANDS, seed: int = MINHASH_SEED):
+        """
+        Initializes the MinHasher instance.
+
+        Parameters
+        ----------
+        num_perm (int): Number of hash functions, the length of the signatures.
+
+        num_bands (int): Number of LSH bands, dividing num_perm.
+
+        seed (int): Seed of the hash functions.
+        """
+        if num_perm % num_bands:
+            raise ValueError(f"The {num_perm} hash functions cannot be cut into {num_bands} bands.")
+
+        self.num_perm: int = num_perm
+        self.num_bands: int = num_bands
+        # The 32-bit coefficients keep a * x + b below 2^64 for the 32-bit shingle hashes
+        rng = np.random.default_rng(seed)
+        self.__a = rng.integers(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.__b = rng.integers(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def get_signature(self, shingles: Iterable[str]) -> np.ndarray:
+        """
+        Computes the MinHash signature of a set of shingles.
+
+        Parameters
+        ----------
+        shingles : Iterable[str]
+            Shingles of the text.
+
+        Returns
+        -------
+        np.ndarray
+            Minimum value of every hash function over the shingles, as 32-bit integers.
+        """
+        hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64)
+        if not len(hashes):
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+
+        values = (np.outer(hashes, self.__a) + self.__b) % MERSENNE_PRIME & MAX_HASH
+        return values.min(axis=0).astype(np.uint32)
+
+    def get_band_keys(self, signature: np.ndarray) -> list[bytes]:
+        """
+        Cuts a signature into its LSH bands.
+
+        Parameters
+        ----------
+        signature : np.ndarray
+            MinHash signature.
+
+        Returns
+        -------
+        list[bytes]
+            Values of every band, the notebooks with an equal band are candidate near-duplicates.
+        """
+        return [band.astype("<u4").tobytes() for band in np.split(signature, self.num_bands)]
+
+    @staticmethod
+    def get_similarity(signature: np.ndarray, other_signature: np.ndarray) -> float:
+        """
+        Estimates the Jaccard similarity of the shingles of two signatures.
+
+        Parameters
+        ----------
+        signature : np.ndarray
+            MinHash signature.
+
+        other_signature : np.ndarray
+            MinHash signature computed with the same hash functions.
+
+        Returns
+        -------
+        float
+            Fraction of equal signature values.
+        """
+        return float(np.mean(signature == other_signature))
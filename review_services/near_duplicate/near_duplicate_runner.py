@@ -0,0 +1,172 @@
+"""This file contains function that runs the near-duplicate detection on a Colab file."""
+
+import os
+from typing import Iterable, Optional
+
+from parsing import PlanParsingError, Turn
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.async_engine import AsyncEngine
+from review_services.colab import Colab
+from review_services.near_duplicate.minhash import MinHasher, get_shingles
+from review_services.near_duplicate.signature_store import signature_store
+from utils import Status, logger
+
+# Estimated Jaccard similarity of the shingles above which two notebooks are near-duplicates
+NEAR_DUPLICATE_THRESHOLD: float = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+# Blocks whose text is compared across notebooks
+NEAR_DUPLICATE_TAGS = ["USER_QUERY:", "THOUGHT:", "RESPONSE_TO_USER:"]
+
+min_hasher = MinHasher()
+
+
+def build_review_text(turns: Iterable[Turn]) -> str:
+    """Function to build the text of the colab compared across notebooks.
+
+    Parameters
+    ----------
+    turns : Iterable[Turn]
+        Parsed turns, in order
+
+    Returns
+    -------
+    str
+        Content of the USER_QUERY, THOUGHT and RESPONSE_TO_USER blocks of the colab, one block per line.
+    """
+    texts = []
+    for turn in turns:
+        for block in turn.blocks:
+            if block.matched_tag in NEAR_DUPLICATE_TAGS:
+                texts.append(" ".join(content for content in block.content if isinstance(content, str)))
+    return "\n".join(texts)
+
+
+def near_duplicate_validator(
+    file_info: dict[str, str], artifact_store: Optional[NotebookArtifactStore] = None
+) -> Colab:
+    """Function to find the previously validated colabs that are near-duplicates of a Colab file.
+
+    Parameters
+    ----------
+    file_info : dict[str, str]
+        Dictionary containing the file information
+
+    artifact_store : Optional[NotebookArtifactStore], optional
+        Run-scoped store sharing the notebook artifacts across validators, by default None
+
+    Returns
+    -------
+    Colab
+        Colab object containing the Colab name, URL, and errors (if any).
+    """
+    # The turns are only read once to build the text
+    colab: Colab = Colab(file_info, artifact_store, stream=True)
+    if colab.parsed_colab is None:
+        colab.colab_res["errors"] = None
+        colab.colab_res["status"] = "colab parsing failed"
+        return colab
+
+    try:
+        shingles = get_shingles(build_review_text(colab.parsed_colab.iter_turns()))
+    except PlanParsingError as e:
+        logger.error(str(e))
+        colab.colab_res["errors"] = None
+        colab.colab_res["status"] = "colab parsing failed"
+        return colab
+    if not shingles:
+        colab.colab_res["errors"] = None
+        colab.colab_res["status"] = Status.PASSED
+        return colab
+
+    signature = min_hasher.get_signature(shingles)
+    candidates = signature_store.add(file_info, signature, min_hasher.get_band_keys(signature))
+
+    errors = []
+    # The near-duplicates validated before the colab, see flag_near_duplicate_pairs
+    near_duplicates = []
+    for file_id, file_name, candidate_signature in candidates:
+        similarity = min_hasher.get_similarity(signature, candidate_signature)
+        if similarity >= NEAR_DUPLICATE_THRESHOLD:
+            colab_url = f"https://colab.research.google.com/drive/{file_id}"
+            errors.append(get_near_duplicate_error(colab_url, file_name, similarity))
+            near_duplicates.append([colab_url, file_name, similarity])
+
+    colab.colab_res["near_duplicates"] = near_duplicates
+    if errors:
+        colab.colab_res["errors"] = errors
+        colab.colab_res["status"] = Status.FAILED
+    else:
+        colab.colab_res["errors"] = None
+        colab.colab_res["status"] = Status.PASSED
+
+    return colab
+
+
+def get_near_duplicate_error(colab_url: str, colab_name: str, similarity: float) -> list:
+    """Function to build the error reporting a near-duplicate of a colab.
+
+    Parameters
+    ----------
+    colab_url : str
+        URL of the near-duplicate
+
+    colab_name : str
+        Name of the near-duplicate
+
+    similarity : float
+        Estimated Jaccard similarity of the two colabs
+
+    Returns
+    -------
+    list
+        Error of the colab, without turn and block
+    """
+    return [None, None, f"NEAR_DUPLICATE: {similarity:.0%} similar to '{colab_name}' ({colab_url})"]
+
+
+def flag_near_duplicate_pairs(results: list[dict]) -> None:
+    """Function to report the near-duplicates of a run on both colabs of every pair.
+
+    A colab is only compared with the colabs validated before it, so the pairs found by the colab validated
+    second are also reported on the colab validated first, whatever the order of the run.
+
+    Parameters
+    ----------
+    results : list[dict]
+        Results of the run, the results of the near-duplicate detection are updated in place
+    """
+    results_by_url = {result["colab_url"]: result for result in results if "near_duplicates" in result}
+    for colab_url, result in results_by_url.items():
+        for other_url, _, similarity in result["near_duplicates"]:
+            other_result = results_by_url.get(other_url)
+            if other_result is None or any(url == colab_url for url, _, _ in other_result["near_duplicates"]):
+                continue
+            other_result["near_duplicates"].append([colab_url, result["colab_name"], similarity])
+            other_result["errors"] = (other_result["errors"] or []) + [
+                get_near_duplicate_error(colab_url, result["colab_name"], similarity)
+            ]
+            other_result["status"] = Status.FAILED
+
+
+async def near_duplicate_validator_async(
+    file_info: dict[str, str], artifact_store: NotebookArtifactStore, engine: AsyncEngine
+) -> Colab:
+    """Async version of `near_duplicate_validator`, running the parsing and the signatures in the engine executor.
+
+    Parameters
+    ----------
+    file_info : dict[str, str]
+        Dictionary containing the file information
+
+    artifact_store : NotebookArtifactStore
+        Run-scoped store sharing the notebook artifacts across validators
+
+    engine : AsyncEngine
+        Engine running the requests and the CPU-bound work of the run
+
+    Returns
+    -------
+    Colab
+        Colab object containing the Colab name, URL, and errors (if any).
+    """
+    return await engine.run_in_executor(near_duplicate_validator, file_info, artifact_store)
@@ -0,0 +1,179 @@
+"""This file contains the persistent store of the MinHash signatures of the validated notebooks.
+
+Every notebook keeps its latest signature and the LSH band keys of the signature, indexed so that the candidate
+near-duplicates of a new notebook are found with one lookup per band, and every new notebook is compared against
+all the notebooks validated before it, in this run or in the previous ones. The store also keeps the listing of
+every validated root folder, so that the signatures of the notebooks deleted or moved out of the folder are dropped
+by its next run. Changing `SIGNATURE_VERSION` drops the signatures computed with other shingles or hash functions.
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+import numpy as np
+
+from review_services.near_duplicate.minhash import MINHASH_SEED, NUM_BANDS, NUM_PERM, SHINGLE_SIZE
+
+NEAR_DUPLICATE_STORE_PATH: str = os.getenv(
+    "NEAR_DUPLICATE_STORE_PATH", os.path.join(".cache", "near_duplicates.sqlite3")
+)
+
+# Version of the stored signatures
+SIGNATURE_VERSION = f"{SHINGLE_SIZE}:{NUM_PERM}:{NUM_BANDS}:{MINHASH_SEED}"
+
+
+class SignatureStore:
+    """
+    SQLite store of the notebook signatures and of their LSH band keys.
+
+    Attributes
+    ----------
+    db_path (str): Path of the SQLite database.
+    """
+
+    def __init__(self, db_path: str = NEAR_DUPLICATE_STORE_PATH):
+        """
+        Initializes the SignatureStore instance.
+
+        Parameters
+        ----------
+        db_path (str): Path of the SQLite database.
+        """
+        self.db_path: str = db_path
+        self.__lock = threading.Lock()
+        self.__initialized = False
+
+    def add(
+        self, file_info: dict[str, str], signature: np.ndarray, band_keys: list[bytes]
+    ) -> list[tuple[str, str, np.ndarray]]:
+        """
+        Stores the signature of a notebook and returns the stored notebooks sharing one of its bands.
+
+        The lookup and the insertion are a single transaction, so that two copies validated at the same time
+        still find each other.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        signature : np.ndarray
+            MinHash signature of the notebook.
+
+        band_keys : list[bytes]
+            LSH band keys of the signature.
+
+        Returns
+        -------
+        list[tuple[str, str, np.ndarray]]
+            File id, file name and signature of the other notebooks sharing a band with the notebook.
+        """
+        file_id = file_info["id"]
+        with self.__lock, self.__connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            candidate_ids = set()
+            for band, band_key in enumerate(band_keys):
+                rows = conn.execute("SELECT file_id FROM bands WHERE band = ? AND band_key = ?", (band, band_key))
+                candidate_ids.update(row[0] for row in rows)
+            candidate_ids.discard(file_id)
+
+            candidates = []
+            for candidate_id in sorted(candidate_ids):
+                row = conn.execute(
+                    "SELECT file_name, signature FROM signatures WHERE file_id = ?", (candidate_id,)
+                ).fetchone()
+                candidates.append((candidate_id, row[0], np.frombuffer(row[1], dtype="<u4")))
+
+            conn.execute("DELETE FROM bands WHERE file_id = ?", (file_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO signatures (file_id, file_name, version, signature) VALUES (?, ?, ?, ?)",
+                (file_id, file_info["name"], SIGNATURE_VERSION, signature.astype("<u4").tobytes()),
+            )
+            conn.executemany(
+                "INSERT INTO bands (band, band_key, file_id) VALUES (?, ?, ?)",
+                [(band, band_key, file_id) for band, band_key in enumerate(band_keys)],
+            )
+        return candidates
+
+    def prune(self, root_id: str, file_ids: set[str]) -> int:
+        """
+        Stores the listing of a root folder and drops the signatures of the notebooks missing from it.
+
+        Only the notebooks listed by the previous run on the root folder are dropped, and not the ones still listed
+        in another root folder, so that the runs on other folders keep their signatures.
+
+        Parameters
+        ----------
+        root_id : str
+            Drive id of the root folder.
+
+        file_ids : set[str]
+            Drive ids of the notebooks of the root folder.
+
+        Returns
+        -------
+        int
+            Number of dropped signatures.
+        """
+        with self.__lock, self.__connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute("SELECT file_id FROM listings WHERE root_id = ?", (root_id,))
+            missing_ids = {row[0] for row in rows} - file_ids
+            conn.execute("DELETE FROM listings WHERE root_id = ?", (root_id,))
+            conn.executemany(
+                "INSERT INTO listings (root_id, file_id) VALUES (?, ?)", [(root_id, file_id) for file_id in file_ids]
+            )
+
+            removed_ids = [
+                (file_id,)
+                for file_id in sorted(missing_ids)
+                if conn.execute("SELECT 1 FROM listings WHERE file_id = ?", (file_id,)).fetchone() is None
+            ]
+            conn.executemany("DELETE FROM bands WHERE file_id = ?", removed_ids)
+            conn.executemany("DELETE FROM signatures WHERE file_id = ?", removed_ids)
+        return len(removed_ids)
+
+    def __len__(self) -> int:
+        """Returns the number of stored signatures."""
+        with self.__lock, self.__connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection to the database, creating it and dropping the outdated signatures on first use."""
+        if not self.__initialized and os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self.__initialized:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS signatures (file_id TEXT PRIMARY KEY, file_name TEXT NOT NULL, "
+                    "version TEXT NOT NULL, signature BLOB NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, band_key BLOB NOT NULL, "
+                    "file_id TEXT NOT NULL, PRIMARY KEY (band, band_key, file_id))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS bands_file_id ON bands (file_id)")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS listings (root_id TEXT NOT NULL, file_id TEXT NOT NULL, "
+                    "PRIMARY KEY (root_id, file_id))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS listings_file_id ON listings (file_id)")
+                outdated = "SELECT file_id FROM signatures WHERE version != ?"
+                conn.execute(f"DELETE FROM bands WHERE file_id IN ({outdated})", (SIGNATURE_VERSION,))
+                conn.execute("DELETE FROM signatures WHERE version != ?", (SIGNATURE_VERSION,))
+                conn.commit()
+                self.__initialized = True
+
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+signature_store = SignatureStore()
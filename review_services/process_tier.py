@@ -0,0 +1,105 @@
+"""This file contains the process-pool tier running the CPU-bound parsing and validations of a run.
+
+The parsing and the SFT validations are pure Python and serialize on the GIL in the thread pool of the runner.
+The process tier runs them in a `ProcessPoolExecutor` sized to the cores: the raw notebook bytes downloaded by
+the I/O threads go in and the result record of the validator comes back, so parsed plans are never pickled.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.services_list import PROCESS_VALIDATOR_LIST, bind_validation_mode
+from review_services.sft_validator import OnlineSFTCodeErrors, ValidationMode
+from utils import TimingRecorder
+
+# Number of processes running the CPU-bound parsing and validations
+PROCESS_POOL_WORKERS: int = int(os.getenv("PROCESS_POOL_WORKERS", os.cpu_count() or 1))
+# Start method of the processes, "spawn" is safe to use from the threads of the runner and of Streamlit
+PROCESS_POOL_START_METHOD: str = os.getenv("PROCESS_POOL_START_METHOD", "spawn")
+
+
+def init_process_worker(code_errors: dict[str, str]) -> None:
+    """
+    Initializes a worker process with the state loaded by the runner process.
+
+    Parameters
+    ----------
+    code_errors : dict[str, str]
+        Expected number of code errors by colab name, as loaded from the code error tracker.
+    """
+    OnlineSFTCodeErrors.set_res_dict(code_errors)
+
+
+def create_process_pool(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """
+    Creates the process pool of a run.
+
+    Parameters
+    ----------
+    max_workers : Optional[int], optional
+        Number of worker processes, by default PROCESS_POOL_WORKERS.
+
+    Returns
+    -------
+    ProcessPoolExecutor
+        Process pool whose workers share the code error tracker of the runner process.
+    """
+    OnlineSFTCodeErrors.ensure_loaded()
+    return ProcessPoolExecutor(
+        max_workers=max_workers or PROCESS_POOL_WORKERS,
+        mp_context=multiprocessing.get_context(PROCESS_POOL_START_METHOD),
+        initializer=init_process_worker,
+        initargs=(OnlineSFTCodeErrors.res_dict,),
+    )
+
+
+def validate_notebook_content(
+    validator_name: str,
+    file_info: dict[str, str],
+    raw_content: Optional[bytes],
+    output_retention: str,
+    record_timings: bool = False,
+    validation_mode: Optional[ValidationMode] = None,
+) -> dict:
+    """
+    Parses the raw notebook content and runs a validator on it, in a worker process.
+
+    Parameters
+    ----------
+    validator_name : str
+        Name of the validator, in `PROCESS_VALIDATOR_LIST`.
+
+    file_info : dict[str, str]
+        Dictionary containing the file information.
+
+    raw_content : Optional[bytes]
+        Raw notebook content, None if the download failed.
+
+    output_retention : str
+        Retention policy applied to the code cell outputs.
+
+    record_timings : bool, optional
+        Whether to record the timings of the notebook in the worker, by default False.
+
+    validation_mode : Optional[ValidationMode], optional
+        Execution mode of the run, by default the default one of the validator.
+
+    Returns
+    -------
+    dict
+        Result record of the validator, with the raw timings of the notebook in `timings` when they are recorded.
+    """
+    artifact_store = NotebookArtifactStore(output_retention)
+    artifact_store.set_raw_content(file_info, raw_content)
+    validator = bind_validation_mode(validator_name, PROCESS_VALIDATOR_LIST[validator_name], validation_mode)
+    if not record_timings:
+        return validator(file_info, artifact_store).colab_res
+
+    # The timings recorded by the worker are handed back to the runner process with the result record
+    timing_recorder = TimingRecorder(enabled=True)
+    with timing_recorder.notebook(file_info):
+        colab_res = validator(file_info, artifact_store).colab_res
+    return colab_res | {"timings": timing_recorder.export_notebook(file_info["id"])}
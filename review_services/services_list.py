@@ -1,9 +1,74 @@
 """This file contains Validator list."""
 
-from review_services.autoreview_spelling_grammar import spell_grammar_autoreview
-from review_services.sft_validator import sft_validator
+from functools import partial
+from typing import Callable, Optional
+
+from parsing.output_retention import OutputRetention
+from review_services.autoreview_spelling_grammar import spell_grammar_autoreview, spell_grammar_autoreview_async
+from review_services.near_duplicate import near_duplicate_validator, near_duplicate_validator_async
+from review_services.sft_validator import ValidationMode, sft_validator, sft_validator_async
 
 VALIDATOR_LIST = {
     "SFT Validator": sft_validator,
     "AutoReview Spelling and Grammar": spell_grammar_autoreview,
+    "Near-Duplicate Detection": near_duplicate_validator,
+}
+
+# Async versions of the validators, run by ServicesRunner.run_services_async
+ASYNC_VALIDATOR_LIST = {
+    "SFT Validator": sft_validator_async,
+    "AutoReview Spelling and Grammar": spell_grammar_autoreview_async,
+    "Near-Duplicate Detection": near_duplicate_validator_async,
+}
+
+# CPU-bound validators, run in the process tier of ServicesRunner when it is enabled
+PROCESS_VALIDATOR_LIST = {
+    "SFT Validator": sft_validator,
+}
+
+# Code cell outputs needed by each validator, the notebooks are loaded with the most permissive policy of a run
+VALIDATOR_OUTPUT_RETENTION = {
+    "SFT Validator": OutputRetention.SUMMARY,
+    "AutoReview Spelling and Grammar": OutputRetention.SUMMARY,
+    "Near-Duplicate Detection": OutputRetention.SUMMARY,
+}
+
+# Bump the version of a validator when its checks change, to invalidate its stored incremental results
+VALIDATOR_VERSIONS = {
+    "SFT Validator": "1",
+    "AutoReview Spelling and Grammar": "1",
+    "Near-Duplicate Detection": "1",
 }
+
+# Validators comparing a colab with the other colabs, whose results change with the other colabs as well: they are
+# never reused by the incremental runs, and the runs drop the signatures of the colabs missing from their listing
+CROSS_COLAB_VALIDATORS = {"Near-Duplicate Detection"}
+
+# Validators accepting the execution mode of a run, see ValidationMode
+VALIDATION_MODE_VALIDATORS = {"SFT Validator"}
+
+
+def bind_validation_mode(
+    validator_name: str, validator: Callable, validation_mode: Optional[ValidationMode]
+) -> Callable:
+    """Function to pass the execution mode of a run to a validator accepting it.
+
+    Parameters
+    ----------
+    validator_name : str
+        Name of the validator.
+
+    validator : Callable
+        Sync or async version of the validator.
+
+    validation_mode : Optional[ValidationMode]
+        Execution mode of the run, None for the default one of the validators.
+
+    Returns
+    -------
+    Callable
+        The validator, called with the execution mode if it accepts it.
+    """
+    if validation_mode is None or validator_name not in VALIDATION_MODE_VALIDATORS:
+        return validator
+    return partial(validator, validation_mode=validation_mode)
@@ -1,21 +1,119 @@
 """This file contains class that runs all the services on a Colab file."""
 
+import asyncio
+import os
+import queue
+import threading
 import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import Callable, Iterator, Optional, Union
 
 import pandas as pd
 from streamlit.delta_generator import DeltaGenerator
 
+from parsing.output_retention import OutputRetention, get_most_permissive_policy
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.async_engine import AsyncEngine
 from review_services.colab import Colab
-from review_services.services_list import VALIDATOR_LIST
-from utils import Status, get_colabs, logger
+from review_services.near_duplicate import flag_near_duplicate_pairs, signature_store
+from review_services.process_tier import create_process_pool, validate_notebook_content
+from review_services.services_list import (
+    ASYNC_VALIDATOR_LIST,
+    CROSS_COLAB_VALIDATORS,
+    PROCESS_VALIDATOR_LIST,
+    VALIDATOR_LIST,
+    VALIDATION_MODE_VALIDATORS,
+    VALIDATOR_OUTPUT_RETENTION,
+    VALIDATOR_VERSIONS,
+    bind_validation_mode,
+)
+from review_services.sft_validator import ValidationMode, default_validation_mode
+from review_services.validation_store import validation_store
+from utils import (
+    Status,
+    TimingRecorder,
+    apply_changes,
+    get_revision_key,
+    get_start_page_token,
+    get_timing_recorder,
+    iter_colabs,
+    list_changes,
+    logger,
+)
+
+# Maximum number of discovered files waiting to be dispatched
+DISCOVERY_QUEUE_SIZE = 64
+# Maximum number of validation tasks submitted to the executor at once
+MAX_PENDING_TASKS = 64
+# Maximum number of colabs validated at once by the async runs
+MAX_PENDING_FILES: int = int(os.getenv("MAX_PENDING_FILES", 1000))
+# Marks the end of the discovery in the files queue
+_DISCOVERY_DONE = object()
+# Statuses of the results stored and reused by the incremental runs, the other statuses are transient failures
+STORED_STATUSES = (Status.PASSED, Status.FAILED)
+
+
+class _RunProgress:
+    """Reports the progress and the ETA of a run against the running estimate of its total tasks."""
+
+    def __init__(
+        self,
+        services_progress_bar: DeltaGenerator,
+        services_eta_placeholder: DeltaGenerator,
+        format_time: Callable[[float], str],
+    ):
+        self.services_progress_bar = services_progress_bar
+        self.services_eta_placeholder = services_eta_placeholder
+        self.format_time = format_time
+        self.start_time: float = time.time()
+        self.total_files: int = 0  # Number of files discovered so far
+        self.total_tasks: int = 0  # Number of validator tasks to run so far
+        self.completed_tasks: int = 0
+        self.discovery_done: bool = False
+
+    @property
+    def avg_time_per_task(self) -> float:
+        """Average time per completed task."""
+        return (time.time() - self.start_time) / self.completed_tasks if self.completed_tasks else 0.0
+
+    def add_file(self, num_tasks: int) -> None:
+        """Adds a discovered file and the number of validator tasks to run on it."""
+        self.total_files += 1
+        self.total_tasks += num_tasks
+
+    def end_discovery(self, num_validators: int) -> None:
+        """Marks the end of the discovery, the total number of tasks is final."""
+        self.discovery_done = True
+        logger.info(f"Running {num_validators} validators on {self.total_files} files.")
+
+    def complete_task(self) -> None:
+        """Marks a task as completed and updates the progress bar and the ETA."""
+        self.completed_tasks += 1
+        self.services_progress_bar.progress(self.completed_tasks / self.total_tasks)
+        remaining_time = self.format_time(self.avg_time_per_task * (self.total_tasks - self.completed_tasks))
+        if self.discovery_done:
+            self.services_eta_placeholder.text(f"Estimated time remaining: {remaining_time}")
+        else:
+            self.services_eta_placeholder.text(
+                f"Estimated time remaining: at least {remaining_time} (still discovering colabs)"
+            )
 
 
 class ServicesRunner:
     """This class runs all the services on provided Folder."""
 
-    def __init__(self, folder_id: str, selected_validators: list[str], folder_name: str = "Root Folder"):
+    def __init__(
+        self,
+        folder_id: str,
+        selected_validators: list[str],
+        folder_name: str = "Root Folder",
+        incremental: bool = False,
+        use_processes: bool = False,
+        record_timings: bool = False,
+        validation_mode: Optional[str] = None,
+    ):
         """Initializes the ServicesRunner class.
 
         Parameters
@@ -25,9 +123,112 @@ class ServicesRunner:
 
         folder_name : str, optional
             Folder name, by default "Root Folder"
+
+        incremental : bool, optional
+            Only validate the colabs changed since the previous incremental run and reuse the stored
+            results of the other ones, except for the validators comparing the colabs with each other,
+            by default False
+
+        use_processes : bool, optional
+            Run the parsing and the CPU-bound validators in a process pool sized to the cores, while the
+            downloads and the I/O-bound validators stay in threads, by default False
+
+        record_timings : bool, optional
+            Record the wall and CPU time of every stage, rule and notebook of the run in `timings`,
+            by default False
+
+        validation_mode : Optional[str], optional
+            Execution mode of the SFT validations, e.g. "first_failure", "max_errors=5" or "severity>=high" for the
+            gate runs, see ValidationMode, by default the one of SFT_VALIDATION_MODE
+
+        Raises
+        ------
+        ValueError
+            If the validation mode is invalid.
+        """
+        self.__folder_id = folder_id
+        self.__folder_name = folder_name
+        self.__validation_mode = (
+            default_validation_mode if validation_mode is None else ValidationMode.parse(validation_mode)
+        )
+        self.__validators = {
+            name: bind_validation_mode(name, func, self.__validation_mode)
+            for name, func in VALIDATOR_LIST.items()
+            if name in selected_validators
+        }
+        self.__incremental = incremental
+        self.__use_processes = use_processes
+        self.__record_timings = record_timings
+        self.__checkpoint = None
+        # Ids of the colabs listed by the discovery of the last run
+        self.__listed_file_ids = None
+        # Timings of the last run, see TimingRecorder.export, None if they were not recorded
+        self.timings = None
+
+    def __iter_files(self) -> Iterator[dict[str, str]]:
+        """Yields the colabs to validate.
+
+        In incremental mode the listing of the previous run is updated with the Drive changes made since,
+        and the folder is listed again only when that is not possible. The new checkpoint is kept in
+        `self.__checkpoint` until the run completes.
+
+        Yields
+        ------
+        dict[str, str]
+            Colabs with SFT type and stepwise info
         """
-        self.__files: list[dict[str, str]] = get_colabs(folder_id, folder_name)
-        self.__validators = {name: func for name, func in VALIDATOR_LIST.items() if name in selected_validators}
+        if not self.__incremental:
+            yield from iter_colabs(self.__folder_id, self.__folder_name)
+            return
+
+        # Take the token first so that no change made during the listing is missed
+        page_token = get_start_page_token()
+        checkpoint = validation_store.get_checkpoint(self.__folder_id)
+
+        colabs, folders = None, {}
+        if checkpoint is not None:
+            try:
+                changes = list_changes(checkpoint["page_token"])
+                colabs = apply_changes(checkpoint["colabs"], checkpoint["folders"], changes)
+                folders = checkpoint["folders"]
+            except Exception as e:
+                logger.warning(f"Could not list the Drive changes of {self.__folder_id}: {e}")
+
+        if colabs is None:
+            logger.info(f"Listing all the colabs of {self.__folder_name}: {self.__folder_id}")
+            colabs, folders = {}, {}
+            for file in iter_colabs(self.__folder_id, self.__folder_name, visited_folders=folders):
+                colabs[file["id"]] = file
+                yield file
+        else:
+            logger.info(f"Updated the previous listing of {self.__folder_name} with {len(changes)} Drive changes.")
+            yield from colabs.values()
+
+        self.__checkpoint = {"page_token": page_token, "colabs": colabs, "folders": folders}
+
+    def __discover_files(self, put: Callable[[object], None], timing_recorder: TimingRecorder) -> None:
+        """Puts the colabs of the folder in the files queue of the run as they are discovered.
+
+        The queue is closed with `_DISCOVERY_DONE`, or with the exception raised by the discovery.
+
+        Parameters
+        ----------
+        put : Callable[[object], None]
+            Blocking put of the bounded queue consumed by the run.
+
+        timing_recorder : TimingRecorder
+            Recorder of the run, measuring the Drive listing.
+        """
+        try:
+            listed_file_ids = set()
+            with timing_recorder.bind():
+                for file in self.__iter_files():
+                    listed_file_ids.add(file["id"])
+                    put(file)
+            self.__listed_file_ids = listed_file_ids
+            put(_DISCOVERY_DONE)
+        except Exception as e:
+            put(e)
 
     def run_services(
         self,
@@ -36,6 +237,11 @@ class ServicesRunner:
     ) -> tuple[pd.DataFrame, float]:
         """Runs all the services with parallel processing support.
 
+        The colabs are validated while the folder is still being listed, so the total number of
+        tasks used for the progress and the ETA is a running estimate until the discovery ends.
+        In incremental mode the stored results of unchanged colabs are reused instead. With the
+        process tier, the threads download the colabs and hand them over to the process pool.
+
         Parameters
         ----------
         services_progress_bar : DeltaGenerator
@@ -49,82 +255,449 @@ class ServicesRunner:
         tuple[pd.DataFrame, float]
             Tuple containing the final results and pass rate
         """
-        logger.info(f"Running {len(self.__validators)} validators on {len(self.__files)} files.")
-        # Total number of tasks
-        total_files = len(self.__files)  # Total number of files
-        total_tasks = total_files * len(self.__validators)
-        if total_tasks == 0:
+        if not self.__validators:
             logger.warning("No tasks to process. Exiting.")
             return [], 0.0
 
         results = []
-        completed_tasks = 0
+        progress = _RunProgress(services_progress_bar, services_eta_placeholder, self.__format_time)
+        timing_recorder = TimingRecorder.for_run(self.__record_timings)
+
+        # Notebook artifacts shared by all the validators of a file during this run
+        artifact_store = NotebookArtifactStore(self.__get_output_retention())
+
+        # List the folder in the background and validate the colabs as soon as they are found
+        files_queue = queue.Queue(maxsize=DISCOVERY_QUEUE_SIZE)
+        threading.Thread(target=self.__discover_files, args=(files_queue.put, timing_recorder), daemon=True).start()
+
+        process_pool = create_process_pool() if self.__use_processes else None
+        with ThreadPoolExecutor() as executor, process_pool or nullcontext():
+            future_to_file = {}
+            while not progress.discovery_done or future_to_file:
+                # Dispatch the discovered files while the executor has room for them
+                while not progress.discovery_done and len(future_to_file) < MAX_PENDING_TASKS:
+                    try:
+                        # Block only when there is nothing else to wait for
+                        file = files_queue.get(block=not future_to_file)
+                    except queue.Empty:
+                        break
+
+                    if file is _DISCOVERY_DONE:
+                        progress.end_discovery(len(self.__validators))
+                        break
+                    if isinstance(file, Exception):
+                        raise file
+
+                    validators = self.__get_pending_validators(file, self.__validators, results)
+                    progress.add_file(len(validators))
+                    if validators:
+                        artifact_store.register(file, len(validators))
+                    for validator_name, validator in validators.items():
+                        stage = f"validator:{validator_name}"
+                        if process_pool is not None and validator_name in PROCESS_VALIDATOR_LIST:
+                            future = executor.submit(
+                                timing_recorder.run,
+                                file,
+                                stage,
+                                self.__validate_in_process,
+                                process_pool,
+                                validator_name,
+                                file,
+                                artifact_store,
+                                self.__validation_mode,
+                            )
+                        else:
+                            future = executor.submit(timing_recorder.run, file, stage, validator, file, artifact_store)
+                        future_to_file[future] = (file, validator_name)
+
+                if not future_to_file:
+                    continue
 
-        # Start time
-        start_time = time.time()
+                # Poll for new files as well while the discovery is running
+                timeout = None if progress.discovery_done else 0.5
+                done, _ = wait(future_to_file, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file, validator_name = future_to_file.pop(future)
+                    # Evict the notebook artifacts once its last validator is done
+                    artifact_store.release(file["id"])
+                    results.append(self.__collect_result(file, validator_name, future.result))
+                    progress.complete_task()
 
-        # Run validators in parallel for each file
-        with ThreadPoolExecutor() as executor:
-            future_to_file = {
-                executor.submit(validator, file): (file, validator_name)
-                for file in self.__files
-                for validator_name, validator in self.__validators.items()
-            }
+        return self.__finish_run(results, progress, services_progress_bar, services_eta_placeholder, timing_recorder)
 
-            for future in as_completed(future_to_file):
-                file, validator_name = future_to_file[future]
-                try:
-                    result: Colab = future.result()
-                    result.colab_res.update({"validator": validator_name})
-                    # Collect the result
-                    results.append(result.colab_res)
-                    del result
-                except Exception as e:
-                    # Handle any exceptions during validation
-                    error_details = traceback.format_exc()
-                    logger.error(
-                        f"[Running Validations] Error processing file {file['name']}"
-                        f"with {validator_name}: {error_details}"
-                    )
-                    results.append(
-                        {
-                            "colab_name": file["name"],
-                            "colab_url": None,
-                            "validator": validator_name,
-                            "errors": [[None, None, str(e)]],
-                            "status": Status.FAILED,
-                        }
+    @staticmethod
+    def __validate_in_process(
+        process_pool: ProcessPoolExecutor,
+        validator_name: str,
+        file: dict[str, str],
+        artifact_store: NotebookArtifactStore,
+        validation_mode: ValidationMode,
+    ) -> dict:
+        """Downloads the colab in the calling thread and runs the validator on it in the process pool.
+
+        Parameters
+        ----------
+        process_pool : ProcessPoolExecutor
+            Process pool of the run.
+
+        validator_name : str
+            Name of the validator.
+
+        file : dict[str, str]
+            Dictionary containing the file information.
+
+        artifact_store : NotebookArtifactStore
+            Run-scoped store sharing the notebook artifacts across validators.
+
+        validation_mode : ValidationMode
+            Execution mode of the run.
+
+        Returns
+        -------
+        dict
+            Result record of the validator.
+        """
+        raw_content = artifact_store.get_raw_content(file)
+        # The task runs in the context of the recorder of the run, see TimingRecorder.run
+        timing_recorder = get_timing_recorder()
+        result = process_pool.submit(
+            validate_notebook_content,
+            validator_name,
+            file,
+            raw_content,
+            artifact_store.output_retention,
+            timing_recorder.enabled,
+            validation_mode,
+        ).result()
+        if "timings" in result:
+            timing_recorder.merge(file, result.pop("timings"))
+        return result
+
+    async def run_services_async(
+        self,
+        services_progress_bar: DeltaGenerator,
+        services_eta_placeholder: DeltaGenerator,
+    ) -> tuple[pd.DataFrame, float]:
+        """Runs all the services on the running event loop.
+
+        The Drive downloads and the AutoReview requests of all the colabs are in flight at the same
+        time, limited by the per-endpoint semaphores of the `AsyncEngine`, while the parsing and the
+        validations run in the engine executor. The results are the same as `run_services`.
+
+        Parameters
+        ----------
+        services_progress_bar : DeltaGenerator
+            Streamlit progress bar for services processing.
+
+        services_eta_placeholder : DeltaGenerator
+            Streamlit placeholder for services ETA.
+
+        Returns
+        -------
+        tuple[pd.DataFrame, float]
+            Tuple containing the final results and pass rate
+        """
+        if not self.__validators:
+            logger.warning("No tasks to process. Exiting.")
+            return [], 0.0
+
+        results = []
+        progress = _RunProgress(services_progress_bar, services_eta_placeholder, self.__format_time)
+        async_validators = {
+            name: bind_validation_mode(name, ASYNC_VALIDATOR_LIST[name], self.__validation_mode)
+            for name in self.__validators
+        }
+        timing_recorder = TimingRecorder.for_run(self.__record_timings)
+
+        # Notebook artifacts shared by all the validators of a file during this run
+        artifact_store = NotebookArtifactStore(self.__get_output_retention())
+
+        # List the folder in the background and validate the colabs as soon as they are found
+        loop = asyncio.get_running_loop()
+        files_queue = asyncio.Queue(maxsize=DISCOVERY_QUEUE_SIZE)
+
+        def put(item: object) -> None:
+            """Puts the item in the files queue from the discovery thread."""
+            asyncio.run_coroutine_threadsafe(files_queue.put(item), loop).result()
+
+        threading.Thread(target=self.__discover_files, args=(put, timing_recorder), daemon=True).start()
+
+        async with AsyncEngine() as engine:
+            # Bounds the number of notebooks held in memory at once
+            pending_files = asyncio.Semaphore(MAX_PENDING_FILES)
+            tasks = []
+            try:
+                while True:
+                    file = await files_queue.get()
+                    if file is _DISCOVERY_DONE:
+                        progress.end_discovery(len(self.__validators))
+                        break
+                    if isinstance(file, Exception):
+                        raise file
+
+                    validators = self.__get_pending_validators(file, async_validators, results)
+                    progress.add_file(len(validators))
+                    if not validators:
+                        continue
+
+                    await pending_files.acquire()
+                    task = asyncio.create_task(
+                        self.__validate_file_async(
+                            file, validators, engine, artifact_store, results, progress, timing_recorder
+                        )
                     )
+                    task.add_done_callback(lambda _: pending_files.release())
+                    tasks.append(task)
+
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return self.__finish_run(results, progress, services_progress_bar, services_eta_placeholder, timing_recorder)
+
+    async def __validate_file_async(
+        self,
+        file: dict[str, str],
+        validators: dict[str, Callable],
+        engine: AsyncEngine,
+        artifact_store: NotebookArtifactStore,
+        results: list[dict],
+        progress: "_RunProgress",
+        timing_recorder: TimingRecorder,
+    ) -> None:
+        """Downloads the colab once and runs the async validators on it concurrently."""
+        # The measures of the task and of the tasks it creates go to the recorder of the run and to the colab
+        with timing_recorder.notebook(file):
+            await self.__run_file_validators_async(file, validators, engine, artifact_store, results, progress)
+
+    async def __run_file_validators_async(
+        self,
+        file: dict[str, str],
+        validators: dict[str, Callable],
+        engine: AsyncEngine,
+        artifact_store: NotebookArtifactStore,
+        results: list[dict],
+        progress: "_RunProgress",
+    ) -> None:
+        """Downloads the colab once and runs the async validators on it concurrently, see `__validate_file_async`."""
+        artifact_store.register(file, len(validators))
+        with get_timing_recorder().measure("download", cpu=False):
+            raw_content = await engine.download_drive_notebook(file["id"], get_revision_key(file))
+        artifact_store.set_raw_content(file, raw_content)
+
+        async def run_validator(validator_name: str, validator: Callable) -> None:
+            """Runs a single validator and collects its result."""
+            with get_timing_recorder().measure(f"validator:{validator_name}", cpu=False):
+                task = asyncio.ensure_future(validator(file, artifact_store, engine))
+                await asyncio.wait([task])
+            # Evict the notebook artifacts once its last validator is done
+            artifact_store.release(file["id"])
+            results.append(self.__collect_result(file, validator_name, task.result))
+            progress.complete_task()
+
+        await asyncio.gather(*(run_validator(name, validator) for name, validator in validators.items()))
+
+    def __get_output_retention(self) -> str:
+        """Returns the output retention policy keeping the code cell outputs needed by all the selected validators.
+
+        Returns
+        -------
+        str
+            Output retention policy of the run.
+        """
+        return get_most_permissive_policy(
+            [VALIDATOR_OUTPUT_RETENTION.get(name, OutputRetention.FULL) for name in self.__validators]
+        )
+
+    def __get_version(self, validator_name: str) -> str:
+        """Returns the version of the stored results of a validator.
+
+        The results of the gate runs only hold the first errors found, they are stored apart from the full results.
+
+        Parameters
+        ----------
+        validator_name : str
+            Name of the validator.
+
+        Returns
+        -------
+        str
+            Version of the validator, with the execution mode of the run if it is not the full validation.
+        """
+        version = VALIDATOR_VERSIONS[validator_name]
+        if validator_name in VALIDATION_MODE_VALIDATORS and not self.__validation_mode.is_full:
+            return f"{version}:{self.__validation_mode}"
+        return version
 
-                # Update progress and ETA
-                completed_tasks += 1
-                progress = completed_tasks / total_tasks
+    def __get_pending_validators(
+        self, file: dict[str, str], validators: dict[str, Callable], results: list[dict]
+    ) -> dict[str, Callable]:
+        """Returns the validators to run on the colab.
 
-                # Update UI every 5 tasks to reduce overhead
-                # if completed_tasks % 5 == 0:
-                services_progress_bar.progress(progress)
-                elapsed_time = time.time() - start_time
-                avg_time_per_task = elapsed_time / completed_tasks
-                remaining_time = avg_time_per_task * (total_tasks - completed_tasks)
-                services_eta_placeholder.text(f"Estimated time remaining: {self.__format_time(remaining_time)}")
+        In incremental mode the stored results of the other validators are added to the results.
+
+        Parameters
+        ----------
+        file : dict[str, str]
+            Dictionary containing the file information.
+
+        validators : dict[str, Callable]
+            Selected validators by name.
+
+        results : list[dict]
+            Results of the run.
+
+        Returns
+        -------
+        dict[str, Callable]
+            Validators to run by name.
+        """
+        if not self.__incremental:
+            return validators
+
+        stored_results = self.__get_stored_results(file)
+        results.extend(stored_results.values())
+        return {name: func for name, func in validators.items() if name not in stored_results}
+
+    def __collect_result(
+        self, file: dict[str, str], validator_name: str, get_result: Callable[[], Union[Colab, dict]]
+    ) -> dict:
+        """Returns the result of a validator task, turning the exception of a failed task into a failed result.
+
+        Parameters
+        ----------
+        file : dict[str, str]
+            Dictionary containing the file information.
+
+        validator_name : str
+            Name of the validator.
+
+        get_result : Callable[[], Union[Colab, dict]]
+            Returns the Colab validated by the task, or the result record of the process tier,
+            or raises its exception.
+
+        Returns
+        -------
+        dict
+            Result of the validator.
+        """
+        try:
+            result: Union[Colab, dict] = get_result()
+            colab_res = result if isinstance(result, dict) else result.colab_res
+            colab_res.update({"validator": validator_name})
+            # Only the verdicts are stored, a colab that failed to load or parse is validated again by the next run
+            if (
+                self.__incremental
+                and colab_res.get("status") in STORED_STATUSES
+                and validator_name not in CROSS_COLAB_VALIDATORS
+            ):
+                validation_store.put_result(file, validator_name, self.__get_version(validator_name), colab_res)
+            return colab_res
+        except Exception as e:
+            # Handle any exceptions during validation
+            error_details = traceback.format_exc()
+            logger.error(
+                f"[Running Validations] Error processing file {file['name']}"
+                f"with {validator_name}: {error_details}"
+            )
+            return {
+                "colab_name": file["name"],
+                "colab_url": None,
+                "validator": validator_name,
+                "errors": [[None, None, str(e)]],
+                "status": Status.FAILED,
+            }
+
+    def __finish_run(
+        self,
+        results: list[dict],
+        progress: "_RunProgress",
+        services_progress_bar: DeltaGenerator,
+        services_eta_placeholder: DeltaGenerator,
+        timing_recorder: TimingRecorder,
+    ) -> tuple[pd.DataFrame, float]:
+        """Stores the checkpoint of the run and formats its results.
+
+        Parameters
+        ----------
+        results : list[dict]
+            Results of the run.
+
+        progress : _RunProgress
+            Progress of the run.
+
+        services_progress_bar : DeltaGenerator
+            Streamlit progress bar for services processing.
+
+        services_eta_placeholder : DeltaGenerator
+            Streamlit placeholder for services ETA.
+
+        timing_recorder : TimingRecorder
+            Recorder of the run.
+
+        Returns
+        -------
+        tuple[pd.DataFrame, float]
+            Tuple containing the final results and pass rate
+        """
+        self.timings = timing_recorder.export() if timing_recorder.enabled else None
+
+        if CROSS_COLAB_VALIDATORS.intersection(self.__validators):
+            flag_near_duplicate_pairs(results)
+            num_pruned = signature_store.prune(self.__folder_id, self.__listed_file_ids)
+            logger.info(f"Dropped the signatures of {num_pruned} colabs missing from {self.__folder_name}.")
+
+        if self.__checkpoint is not None:
+            validation_store.save_checkpoint(self.__folder_id, **self.__checkpoint)
+            logger.info(
+                f"Reused {len(results) - progress.completed_tasks} stored results, "
+                f"validated {progress.completed_tasks} colabs again."
+            )
 
         # Clear the ETA placeholder and progress bar after completion
         self.__clear_placeholders(services_eta_placeholder, services_progress_bar)
 
+        if not results:
+            logger.warning("No tasks to process. Exiting.")
+            return [], 0.0
+
         # Format the results
         results_df = self.__format_results(results)
 
         # Calculate pass rate
         pass_rate = results_df["Status"].value_counts(normalize=True).get("Passed", 0) * 100
 
-        end_time = time.time()
         logger.info(
-            f"Services completed in {self.__format_time(end_time - start_time)} "
-            f"with average time per task: {avg_time_per_task:.2f} seconds."
+            f"Services completed in {self.__format_time(time.time() - progress.start_time)} "
+            f"with average time per task: {progress.avg_time_per_task:.2f} seconds."
         )
 
         return results_df, pass_rate
 
+    def __get_stored_results(self, file: dict[str, str]) -> dict[str, dict]:
+        """Returns the stored results of the selected validators on the current revision of the colab.
+
+        Parameters
+        ----------
+        file : dict[str, str]
+            Dictionary containing the file information.
+
+        Returns
+        -------
+        dict[str, dict]
+            Stored results by validator name, the validators without a stored result are missing.
+        """
+        stored_results = {}
+        for validator_name in self.__validators:
+            # The result depends on the other colabs, which might have changed
+            if validator_name in CROSS_COLAB_VALIDATORS:
+                continue
+            result = validation_store.get_result(file, validator_name, self.__get_version(validator_name))
+            if result is not None and result.get("status") in STORED_STATUSES:
+                stored_results[validator_name] = result
+        return stored_results
+
     @staticmethod
     def __clear_placeholders(*placeholders: DeltaGenerator):
         """Clear the given Streamlit placeholders."""
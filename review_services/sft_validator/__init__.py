@@ -1,8 +1,8 @@
 """SFT Validator Module."""
 from .sft_consts import OnlineSFTCodeErrors  # noqa
-from .sft_consts import BaseSFTSequence, FileSFTSequence, PDFSFTSequence  # noqa
-from .sft_validator_runner import sft_validator  # noqa
+from .rule_registry import RuleRegistry, rule_registry  # noqa
+from .sequence_automaton import SequenceAutomaton, get_sequence_automaton  # noqa
+from .sft_consts import SFT_SEQUENCES, BaseSFTSequence, FileSFTSequence, OtherSFTSequence, PDFSFTSequence  # noqa
+from .sft_validator_runner import sft_validator, sft_validator_async  # noqa
 from .turn_validations import TurnValidators  # noqa
-
-# Initialize the OnlineSFTCodeErrors class
-OnlineSFTCodeErrors.initialize_res_df()
+from .validation_mode import ValidationMode, default_validation_mode  # noqa
@@ -1,5 +1,5 @@
 """This module contains block level validations."""
-from .base_validator import BaseBlockValidators  # noqa
+from .base_validator import BaseBlockValidators, Severity, applies_to, get_severity, rule  # noqa
 from .code import CODEValidator  # noqa
 from .code_output import CODEOutputValidators  # noqa
 from .ice_file_metadata import ICEFileMetadataValidators  # noqa
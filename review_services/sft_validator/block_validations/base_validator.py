@@ -1,16 +1,106 @@
 """This file contains base block validator class."""
 
-from abc import abstractmethod
-from typing import Optional
+from typing import Callable, Iterable, Optional
 
+from parsing import Turn
 from parsing.block_parser import BaseBlock
+from review_services.sft_validator.pattern_scanner import PatternHit, get_pattern_scanner
+
+
+class Severity:
+    """Class to define the severities of the validation rules, from the least to the most severe."""
+
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+    LEVELS = [LOW, MEDIUM, HIGH]
+
+    @classmethod
+    def is_at_least(cls, severity: str, min_severity: str) -> bool:
+        """Check whether a severity is at least as severe as the minimum severity."""
+        return cls.LEVELS.index(severity) >= cls.LEVELS.index(min_severity)
+
+
+def rule(
+    sft_types: Optional[Iterable[str]] = None,
+    exclude_sft_types: Optional[Iterable[str]] = None,
+    severity: str = Severity.MEDIUM,
+) -> Callable[[Callable], Callable]:
+    """Decorator declaring the SFT types a validation rule applies to and its severity.
+
+    Parameters
+    ----------
+    sft_types : Optional[Iterable[str]], optional
+        SFT types the rule applies to, by default all of them.
+    exclude_sft_types : Optional[Iterable[str]], optional
+        SFT types the rule does not apply to, by default None.
+    severity : str, optional
+        Severity of the errors of the rule, one of `Severity.LEVELS`, by default Severity.MEDIUM.
+
+    Returns
+    -------
+    Callable[[Callable], Callable]
+        Decorator of the rule.
+    """
+
+    def decorator(check: Callable) -> Callable:
+        check.sft_types = frozenset(sft_types) if sft_types is not None else None
+        check.exclude_sft_types = frozenset(exclude_sft_types or ())
+        check.severity = severity
+        return check
+
+    return decorator
+
+
+def applies_to(check: Callable, sft_type: str) -> bool:
+    """Check whether a validation rule applies to the blocks of an SFT type.
+
+    Parameters
+    ----------
+    check : Callable
+        The validation rule.
+    sft_type : str
+        The type of SFT.
+
+    Returns
+    -------
+    bool
+        Whether the rule applies to the SFT type, the rules without a declaration apply to all of them.
+    """
+    sft_types = getattr(check, "sft_types", None)
+    return (sft_types is None or sft_type in sft_types) and sft_type not in getattr(check, "exclude_sft_types", ())
+
+
+def get_severity(check: Callable) -> str:
+    """Get the severity of a validation rule.
+
+    Parameters
+    ----------
+    check : Callable
+        The validation rule.
+
+    Returns
+    -------
+    str
+        The declared severity of the rule, Severity.MEDIUM for the rules without a declaration.
+    """
+    return getattr(check, "severity", Severity.MEDIUM)
 
 
 class BaseBlockValidators:
     """
     Base class for block-level validations.
+
+    The validation rules of a validator are listed in order in `rules`, and apply to the blocks whose matched
+    tag is in `block_tags`. The rule registry dispatches every block to the rules of its tag and SFT type.
     """
 
+    # Matched tags of the blocks validated by the validator
+    block_tags: tuple[str, ...] = ()
+    # Names of the validation rules, in the order they run
+    rules: tuple[str, ...] = ("has_typo_in_tag", "validate_content_exists")
+
     def __init__(self, block: BaseBlock, turn_idx: int):
         """Initialise the BaseBlockValidators instance.
 
@@ -23,6 +113,72 @@ class BaseBlockValidators:
         """
         self._block: BaseBlock = block
         self._msg: list = [turn_idx, block.serial_number]
+        # Forbidden pattern hits of the block, scanned on first access
+        self._pattern_hits: Optional[list[PatternHit]] = None
+
+    @classmethod
+    def from_turn(cls, block: BaseBlock, turn: Turn) -> "BaseBlockValidators":
+        """Create the validator of a block of the turn.
+
+        Parameters
+        ----------
+        block : BaseBlock
+            The block to be validated.
+        turn : Turn
+            The turn of the block.
+
+        Returns
+        -------
+        BaseBlockValidators
+            The validator of the block.
+        """
+        return cls(block, turn.idx)
+
+    @classmethod
+    def get_rules(
+        cls, sft_type: str, disabled_rules: Iterable[str] = (), min_severity: str = Severity.LOW
+    ) -> tuple[Callable, ...]:
+        """Get the validation rules that apply to the blocks of an SFT type.
+
+        Parameters
+        ----------
+        sft_type : str
+            The type of SFT.
+        disabled_rules : Iterable[str], optional
+            Names of the disabled rules, either `rule` or `Validator.rule`, by default none.
+        min_severity : str, optional
+            Minimum severity of the rules, by default Severity.LOW.
+
+        Returns
+        -------
+        tuple[Callable, ...]
+            The rules, in order, to be called with the validator instance.
+        """
+        disabled_rules = set(disabled_rules)
+        return tuple(
+            getattr(cls, name)
+            for name in cls.rules
+            if name not in disabled_rules
+            and f"{cls.__name__}.{name}" not in disabled_rules
+            and applies_to(getattr(cls, name), sft_type)
+            and Severity.is_at_least(get_severity(getattr(cls, name)), min_severity)
+        )
+
+    def _get_scanned_text(self) -> str:
+        """Get the text of the block scanned for the forbidden patterns."""
+        return "\n".join(self._block.content)
+
+    @property
+    def pattern_hits(self) -> list[PatternHit]:
+        """The forbidden pattern hits of the block with their offsets, scanned once on first access."""
+        if self._pattern_hits is None:
+            scanner = get_pattern_scanner(self._block.matched_tag)
+            self._pattern_hits = scanner.scan(self._get_scanned_text()) if self._block.content else []
+        return self._pattern_hits
+
+    def _has_pattern_hit(self, name: str) -> bool:
+        """Check whether the block has a hit of a forbidden pattern."""
+        return any(hit_name == name for hit_name, _, _ in self.pattern_hits)
 
     def has_typo_in_tag(self) -> Optional[str]:
         """Check for typos in the block tag."""
@@ -30,12 +186,14 @@ class BaseBlockValidators:
             return self._msg + [f"[{self._block.original_tag}] TYPO_IN_TAG, SHOULD_BE '{self._block.matched_tag}'"]
         return None
 
+    @rule(severity=Severity.HIGH)
     def validate_content_exists(self) -> Optional[list]:
         """Ensure that every block has content."""
-        if not "".join(self._block.content):
+        if not any(self._block.content):
             return self._msg + [f"[{self._block.matched_tag}]: MISSING_CONTENT"]
         return None
 
+    @rule(severity=Severity.LOW)
     def has_smart_quotes(self) -> Optional[list]:
         """Check for smart quotes in the block content."""
         smart_quotes = ["’", "’"]
@@ -47,6 +205,19 @@ class BaseBlockValidators:
                 return self._msg + [f"[{self._block.matched_tag}]: SMART_QUOTES_FOUND"]
         return None
 
-    @abstractmethod
-    def validate(self):
-        """Abstract method to be implemented by subclasses."""
+    def validate(self) -> list[list]:
+        """
+        Run all the validation rules that apply to the block.
+
+        Returns
+        ------
+        list[list]
+            A list of failed check IDs.
+        """
+        failed_checks = []
+        for check in self.get_rules(self._block.sft_type):
+            check_id = check(self)
+            if check_id:
+                failed_checks.append(check_id)
+
+        return failed_checks
@@ -1,10 +1,11 @@
 """This script contains class that handles validations for the CODE block."""
 
-import re
 from typing import Optional
 
+from parsing import Turn
 from parsing.block_parser import BaseBlock
-from review_services.sft_validator.block_validations import BaseBlockValidators
+from parsing.block_parser.code_calls import CallSite
+from review_services.sft_validator.block_validations import BaseBlockValidators, Severity, rule
 
 
 class CODEValidator(BaseBlockValidators):
@@ -12,76 +13,83 @@ class CODEValidator(BaseBlockValidators):
     This class handles validations for the CODE block.
     """
 
+    block_tags = ("CODE:",)
+    rules = (
+        "has_typo_in_tag",
+        "validate_content_exists",
+        "has_code_reading_from_invalid_sources",
+        "has_invalid_file_name_in_code",
+        "has_matplotlib_plot",
+        # "has_smart_quotes",
+        "has_altair_display",
+        "has_altair_save",
+        "has_incorrect_skip_rows",
+    )
+
     def __init__(self, block: BaseBlock, turn_idx: int, datasets: dict[str, str], skip_rows_count: dict[str, int]):
         super().__init__(block, turn_idx)
         self.datasets = datasets
         self.skip_rows_count = skip_rows_count
 
+    @classmethod
+    def from_turn(cls, block: BaseBlock, turn: Turn) -> "CODEValidator":
+        """Create the validator of a code block of the turn, with the datasets of the turn."""
+        return cls(block, turn.idx, turn.datasets, turn.skip_rows_count)
+
+    @rule(severity=Severity.HIGH)
     def has_code_reading_from_invalid_sources(self) -> Optional[str]:
         """
         Check if any code block is reading from disallowed sources (e.g., '/cns/', 'url', etc.).
         """
-        if self._block.matched_tag == "CODE:" and self._block.content:
-            code = "\n".join(self._block.content)
-            if any(
-                invalid_source in code.lower()
-                for invalid_source in [
-                    ".read_csv('/cns/",
-                    ".read_excel(",
-                    " url",
-                    "url.",
-                    "url=",
-                ]
-            ):
-                return self._msg + [f"[{self._block.matched_tag}]: CODE_READING_INVALID_SOURCE"]
+        if self._block.matched_tag == "CODE:" and self._has_pattern_hit("INVALID_SOURCE"):
+            return self._msg + [f"[{self._block.matched_tag}]: CODE_READING_INVALID_SOURCE"]
         return None
 
     def has_matplotlib_plot(self) -> Optional[str]:
         """
         Check if the code block contains matplotlib plot code.
         """
-        if self._block.matched_tag == "CODE:" and self._block.content:
-            code = "\n".join(self._block.content)
-            if any(matplotlib_keyword in code for matplotlib_keyword in ["matplotlib.pyplot", "plt.show"]):
-                return self._msg + [f"[{self._block.matched_tag}]: MATPLOTLIB_PLOT_FOUND"]
+        if self._block.matched_tag == "CODE:" and self._has_pattern_hit("MATPLOTLIB_PLOT"):
+            return self._msg + [f"[{self._block.matched_tag}]: MATPLOTLIB_PLOT_FOUND"]
         return None
 
+    def _get_read_csv_files(self) -> list[tuple[str, CallSite]]:
+        """Get the file names read with read_csv in the code, with their call sites."""
+        return [
+            (file_name, call)
+            for call in self._block.call_index.find_calls("read_csv")
+            if isinstance(file_name := call.get_arg(0, "filepath_or_buffer"), str)
+        ]
+
+    @rule(severity=Severity.HIGH)
     def has_invalid_file_name_in_code(self):
         """
         Check if any code line contains an invalid file name.
         """
         if self._block.content:
-            # Regular expression to find filenames
-            if self._block.content:
-                csv_files = re.findall(r'pd\.read_csv\([\'"]([^\'\"]*\.[^\'\"]*)[\'"]\)', self._block.content[0])
-                invalid_files = ", ".join([file for file in csv_files if file not in self.datasets])
+            csv_files = dict.fromkeys(file_name for file_name, _ in self._get_read_csv_files())
+            invalid_files = ", ".join([file for file in csv_files if file not in self.datasets])
 
-                if invalid_files:
-                    return self._msg + [f"[{self._block.matched_tag}]: CODE_INVALID_FILE_NAME '{invalid_files}'"]
-            return None
+            if invalid_files:
+                return self._msg + [f"[{self._block.matched_tag}]: CODE_INVALID_FILE_NAME '{invalid_files}'"]
+        return None
 
     def has_altair_display(self) -> Optional[str]:
         """
         Check if Altair Chart code uses .display() instead of .save().
         """
-        if self._block.content:
-            code = "\n".join(self._block.content)
-            # Check if code contains Altair Chart creation
-            if "alt.Chart" in code or "altair.Chart" in code:
-                if ".display" in code:
-                    return self._msg + [f"[{self._block.matched_tag}]: USE_OF_ALTAIR_DISPLAY_DETECTED"]
+        # Check if code contains Altair Chart creation
+        if self._has_pattern_hit("ALTAIR_CHART") and self._has_pattern_hit("ALTAIR_DISPLAY"):
+            return self._msg + [f"[{self._block.matched_tag}]: USE_OF_ALTAIR_DISPLAY_DETECTED"]
         return None
 
     def has_altair_save(self) -> Optional[str]:
         """
         Validates that any alt.Chart usage includes .save() method.
         """
-        if self._block.content:
-            code = "\n".join(self._block.content)
-            # Check if code contains Altair Chart creation
-            if "alt.Chart" in code or "altair.Chart" in code:
-                if ".save" not in code:
-                    return self._msg + [f"[{self._block.matched_tag}]: ALTAIR_PLOT_MISSING_SAVE_METHOD"]
+        # Check if code contains Altair Chart creation
+        if self._has_pattern_hit("ALTAIR_CHART") and not self._has_pattern_hit("ALTAIR_SAVE"):
+            return self._msg + [f"[{self._block.matched_tag}]: ALTAIR_PLOT_MISSING_SAVE_METHOD"]
         return None
 
     def has_incorrect_skip_rows(self) -> Optional[str]:
@@ -91,62 +99,22 @@ class CODEValidator(BaseBlockValidators):
         if not self._block.content or not self.skip_rows_count:
             return None
 
-        code = "\n".join(self._block.content)
-
-        # Find all read_csv calls with their file names
-        file_matches = re.findall(r'pd\.read_csv\([\'"]([^\'"]*\.csv)[\'"]', code)
-
-        for file_name in file_matches:
+        # The read_csv calls are indexed with their literal arguments, the file names may be given by a variable
+        for file_name, call in self._get_read_csv_files():
             if file_name in self.skip_rows_count:
                 expected_skip_rows = self.skip_rows_count[file_name]
+                skip_rows = call.get_arg(keyword="skiprows")
 
-                # Look for skiprows parameter for this specific file
-                file_code_pattern = rf'pd\.read_csv\([\'"]({file_name})[\'"][^)]*\)'
-                file_code = re.search(file_code_pattern, code)
-                if file_code:
-                    skip_rows_match = re.search(r"skiprows\s*=\s*(\d+)", file_code.group(0))
+                # If skiprows parameter is missing
+                if skip_rows is None:
+                    return self._msg + [
+                        f"[{self._block.matched_tag}]: MISSING_SKIPROWS_PARAMETER for {file_name} (should be {expected_skip_rows})"
+                    ]
 
-                    # If skiprows parameter is missing
-                    if not skip_rows_match:
-                        return self._msg + [
-                            f"[{self._block.matched_tag}]: MISSING_SKIPROWS_PARAMETER for {file_name} (should be {expected_skip_rows})"
-                        ]
-
-                    # If skiprows value doesn't match expected count
-                    skip_rows = int(skip_rows_match.group(1))
-
-                    if skip_rows != expected_skip_rows:
-                        return self._msg + [
-                            f"[{self._block.matched_tag}]: INCORRECT_SKIPROWS_VALUE for {file_name} (found {skip_rows}, should be {expected_skip_rows})"
-                        ]
+                # If skiprows value doesn't match expected count, the rows given as a list or a callable are not checked
+                if isinstance(skip_rows, int) and skip_rows != expected_skip_rows:
+                    return self._msg + [
+                        f"[{self._block.matched_tag}]: INCORRECT_SKIPROWS_VALUE for {file_name} (found {skip_rows}, should be {expected_skip_rows})"
+                    ]
 
         return None
-
-    def validate(self) -> list[list]:
-        """
-        Run all code-specific validations.
-
-        Return
-        ------
-        List[list]
-            A list of detected errors.
-        """
-        checks = [
-            self.has_typo_in_tag,
-            self.validate_content_exists,
-            self.has_code_reading_from_invalid_sources,
-            self.has_invalid_file_name_in_code,
-            self.has_matplotlib_plot,
-            # self.has_smart_quotes,
-            self.has_altair_display,
-            self.has_altair_save,
-            self.has_incorrect_skip_rows,
-        ]
-
-        failed_checks = []
-        for check in checks:
-            check_id = check()
-            if check_id:
-                failed_checks.append(check_id)
-
-        return failed_checks
@@ -1,10 +1,9 @@
 """This script contains class that handles validations for the ICE_FILE_METADATA block."""
 
-import re
 from typing import Optional
 
-from review_services.sft_validator.block_validations import BaseBlockValidators
-from utils import FILE_METADATA_SUB_TAGS, OPTIONAL_FILE_METADATA_SUB_TAGS, initialize_drive_service, logger
+from review_services.sft_validator.block_validations import BaseBlockValidators, Severity, rule
+from utils import FILE_METADATA_SUB_TAGS, OPTIONAL_FILE_METADATA_SUB_TAGS, drive_file_names, get_file_id_from_link
 
 
 class ICEFileMetadataValidators(BaseBlockValidators):
@@ -12,6 +11,18 @@ class ICEFileMetadataValidators(BaseBlockValidators):
     This class handles validations for the ICE_FILE_METADATA block.
     """
 
+    block_tags = ("ICE_FILE_METADATA:",)
+    rules = (
+        "has_typo_in_tag",
+        "has_invalid_file_metadata_tag",
+        "missing_input_file",
+        "validate_file_name_format",
+        "has_spreadsheet_url",
+        "validate_content_exists",
+        "validate_filename_in_url_matches_file_name",
+    )
+
+    @rule(severity=Severity.HIGH)
     def has_invalid_file_metadata_tag(self) -> Optional[str]:
         """Check for typos in the file_metadata tags."""
         metadata = self._block.metadata
@@ -29,12 +40,14 @@ class ICEFileMetadataValidators(BaseBlockValidators):
                 return self._msg + [f"[{self._block.matched_tag}] MISSING_TAG: '{file_tag}'"]
         return None
 
+    @rule(severity=Severity.HIGH)
     def missing_input_file(self) -> Optional[str]:
         """Check if the ICE_FILE_METADATA block is missing input file information"""
         if "file_name:" not in self._block.metadata or not self._block.metadata["file_name:"]["value"]:
             return self._msg + [f"[{self._block.matched_tag}]: MISSING_INPUT_FILE"]
         return None
 
+    @rule(severity=Severity.HIGH)
     def validate_file_name_format(self) -> Optional[str]:
         """Validate that the file_name in ICE_FILE_METADATA ends with .csv, .tsv, or .pdf."""
         if "file_name:" in self._block.metadata:
@@ -43,6 +56,7 @@ class ICEFileMetadataValidators(BaseBlockValidators):
                 return self._msg + [f"[{self._block.matched_tag}]: INVALID_FILE_FORMAT"]
         return None
 
+    @rule(severity=Severity.HIGH)
     def has_spreadsheet_url(self) -> Optional[str]:
         """Check if the FILE_PATH contains a spreadsheet URL."""
         if "FILE_PATH:" in self._block.metadata:
@@ -51,6 +65,7 @@ class ICEFileMetadataValidators(BaseBlockValidators):
                 return self._msg + [f"[{self._block.matched_tag}]: SPREADSHEET_URL_FOUND in FILE_PATH"]
         return None
 
+    @rule(severity=Severity.HIGH)
     def validate_filename_in_url_matches_file_name(self) -> Optional[str]:
         """Check if the filename in the Google Drive URL matches the expected file_name."""
         if "FILE_PATH:" in self._block.metadata and "file_name:" in self._block.metadata:
@@ -58,12 +73,12 @@ class ICEFileMetadataValidators(BaseBlockValidators):
             file_name = self._block.metadata["file_name:"]["value"]
 
             # Extract file ID from FILE_PATH
-            file_id = self.__get_file_id_from_link(file_path)
+            file_id = get_file_id_from_link(file_path)
             if not file_id:
                 return self._msg + [f"[{self._block.matched_tag}]: INVALID_FILE_PATH_FORMAT"]
 
             # Get actual filename from Google Drive and compare
-            drive_file_name = self.__get_filename_from_drive(file_id)
+            drive_file_name = drive_file_names.get_name(file_id)
             if drive_file_name:
                 if drive_file_name != file_name:
                     return self._msg + [
@@ -74,46 +89,3 @@ class ICEFileMetadataValidators(BaseBlockValidators):
                 return self._msg + [f"[{self._block.matched_tag}]: FILE_URL_INVALID"]
 
         return None
-
-    def __get_file_id_from_link(self, link: str) -> Optional[str]:
-        """Extract the file ID from a Google Drive link."""
-        match = re.search(r"/d/([a-zA-Z0-9_-]+)", link)
-        return match.group(1) if match else None
-
-    def __get_filename_from_drive(self, file_id: str) -> Optional[str]:
-        """Retrieve the filename from Google Drive using the file ID."""
-
-        try:
-            drive_service = initialize_drive_service()
-            file_metadata = drive_service.files().get(fileId=file_id, fields="name").execute()  # noqa
-            return file_metadata.get("name")
-        except Exception as e:
-            logger.error(f"An error occurred: {e}")
-            return None
-
-    def validate(self) -> list[list]:
-        """
-        Run all block-specific validations.
-
-        Returns
-        ------
-        List[str]
-            A list of failed check IDs.
-        """
-        checks = [
-            self.has_typo_in_tag,
-            self.has_invalid_file_metadata_tag,
-            self.missing_input_file,
-            self.validate_file_name_format,
-            self.has_spreadsheet_url,
-            self.validate_content_exists,
-            self.validate_filename_in_url_matches_file_name,
-        ]
-
-        failed_checks = []
-        for check in checks:
-            check_id = check()
-            if check_id:
-                failed_checks.append(check_id)
-
-        return failed_checks
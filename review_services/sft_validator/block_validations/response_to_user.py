@@ -8,25 +8,9 @@ class RTUValidators(BaseBlockValidators):
     This class handles validations for the RESPONSE_TO_USER block.
     """
 
-    def validate(self) -> list[list]:
-        """
-        Run all RTU-specific validations.
-
-        Returns
-        ------
-        List[str]
-            A list of failed check IDs.
-        """
-        checks = [
-            self.has_typo_in_tag,
-            self.validate_content_exists,
-            # self.has_smart_quotes,
-        ]
-
-        failed_checks = []
-        for check in checks:
-            check_id = check()
-            if check_id:
-                failed_checks.append(check_id)
-
-        return failed_checks
+    block_tags = ("RESPONSE_TO_USER:",)
+    rules = (
+        "has_typo_in_tag",
+        "validate_content_exists",
+        # "has_smart_quotes",
+    )
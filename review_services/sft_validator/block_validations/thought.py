@@ -2,8 +2,9 @@
 
 import re
 
+from parsing import Turn
 from parsing.block_parser import BaseBlock
-from review_services.sft_validator.block_validations import BaseBlockValidators
+from review_services.sft_validator.block_validations import BaseBlockValidators, Severity, rule
 
 
 class ThoughtValidators(BaseBlockValidators):
@@ -11,6 +12,15 @@ class ThoughtValidators(BaseBlockValidators):
     This class handles validations for the THOUGHT block.
     """
 
+    block_tags = ("THOUGHT:",)
+    rules = (
+        "has_typo_in_tag",
+        "validate_content_exists",
+        "has_thought_reading_from_invalid_sources",
+        "has_invalid_file_name_in_thought",
+        # "has_smart_quotes",
+    )
+
     def __init__(self, block: BaseBlock, turn_idx: int, datasets: dict[str, str]):
         """Initialise the ThoughtValidators instance.
 
@@ -26,25 +36,25 @@ class ThoughtValidators(BaseBlockValidators):
         super().__init__(block, turn_idx)
         self.datasets = datasets
 
+    @classmethod
+    def from_turn(cls, block: BaseBlock, turn: Turn) -> "ThoughtValidators":
+        """Create the validator of a thought block of the turn, with the datasets of the turn."""
+        return cls(block, turn.idx, turn.datasets)
+
+    def _get_scanned_text(self) -> str:
+        """Get the plain text of the thought, without its code snippets."""
+        return self._block.content[0]
+
+    @rule(exclude_sft_types=["search", "browse"], severity=Severity.HIGH)
     def has_thought_reading_from_invalid_sources(self):
         """
         Check if any thought block contains references to invalid data sources.
         """
-        if self._block.content and self._block.sft_type not in ["search", "browse"]:
-            thought_text = self._block.content[0]
-            if any(
-                invalid_source in thought_text.lower()
-                for invalid_source in [
-                    ".read_csv('/cns/",
-                    ".read_excel(",
-                    " url",
-                    "url.",
-                    "url=",
-                ]
-            ):
-                return self._msg + [f"[{self._block.matched_tag}]: THOUGHT_INVALID_SOURCE"]
+        if self._has_pattern_hit("INVALID_SOURCE"):
+            return self._msg + [f"[{self._block.matched_tag}]: THOUGHT_INVALID_SOURCE"]
         return None
 
+    @rule(severity=Severity.HIGH)
     def has_invalid_file_name_in_thought(self):
         """
         Check if any thought block contains an invalid file name.
@@ -57,28 +67,3 @@ class ThoughtValidators(BaseBlockValidators):
             if invalid_files:
                 return self._msg + [f"[{self._block.matched_tag}]: THOUGHT_INVALID_FILE_NAME '{invalid_files}'"]
         return None
-
-    def validate(self) -> list[list]:
-        """
-        Run all Thought-specific validations.
-
-        Returns
-        ------
-        List[str]
-            A list of failed check IDs.
-        """
-        checks = [
-            self.has_typo_in_tag,
-            self.validate_content_exists,
-            self.has_thought_reading_from_invalid_sources,
-            self.has_invalid_file_name_in_thought,
-            # self.has_smart_quotes,
-        ]
-
-        failed_checks = []
-        for check in checks:
-            check_id = check()
-            if check_id:
-                failed_checks.append(check_id)
-
-        return failed_checks
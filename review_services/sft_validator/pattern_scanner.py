@@ -0,0 +1,158 @@
+"""This file contains the multi-pattern scanner of the forbidden patterns of the CODE and THOUGHT blocks.
+
+The patterns are declared in a table (see `forbidden_patterns.yaml`) and the patterns of a block tag are compiled
+into a single regex: the literals are merged into a trie, so that the regex engine follows one branch per
+character instead of trying every pattern. The lowercased block is searched once from every hit onwards, so that
+the overlapping hits are reported as well, and every hit is reported with its offset.
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+import yaml
+
+# Table of the forbidden patterns, see forbidden_patterns.yaml for its format
+FORBIDDEN_PATTERNS_PATH: str = os.getenv(
+    "SFT_FORBIDDEN_PATTERNS_PATH", os.path.join(os.path.dirname(__file__), "forbidden_patterns.yaml")
+)
+
+# A pattern hit: name of the hit, offset in the text and matched text
+PatternHit = tuple[str, int, str]
+
+
+def build_trie_regex(literals: Iterable[str]) -> str:
+    """
+    Builds a regex matching the longest of the literals, with the literals merged into a trie.
+
+    Parameters
+    ----------
+    literals : Iterable[str]
+        Literal texts.
+
+    Returns
+    -------
+    str
+        Regex of the literals, empty if there is no literal.
+    """
+    trie: dict = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def to_regex(node: dict) -> str:
+        """Builds the regex of a trie node, the end of a literal makes the rest of the branches optional."""
+        branches = [re.escape(char) + to_regex(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        regex = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{regex})?" if "" in node else regex
+
+    return to_regex(trie)
+
+
+class PatternScanner:
+    """
+    Compiled matcher of a set of literal patterns, scanning a text in a single pass.
+
+    Attributes
+    ----------
+    names (frozenset): Names of the hits the scanner can report.
+    """
+
+    def __init__(self, patterns: list[dict]):
+        """
+        Compiles the patterns into a single regex.
+
+        Parameters
+        ----------
+        patterns (list): Pattern table entries, with the `name`, the literal `patterns` and `ignore_case` of each hit.
+        """
+        # Patterns by lowercase literal, the case-sensitive patterns are checked on the hits
+        self.__patterns: dict[str, list[tuple[str, str, bool]]] = {}
+        for entry in patterns:
+            for literal in entry["patterns"]:
+                self.__patterns.setdefault(literal.lower(), []).append(
+                    (entry["name"], literal, bool(entry.get("ignore_case", False)))
+                )
+        self.names: frozenset[str] = frozenset(entry["name"] for entry in patterns)
+
+        # The literals matching at the offset of a hit are the prefixes of the longest literal matching there
+        self.__prefixes: dict[str, list[str]] = {
+            literal: [prefix for prefix in self.__patterns if literal.startswith(prefix)] for literal in self.__patterns
+        }
+
+        # The texts are lowercased once, the case-insensitive regex is kept for the texts changing length on lowercasing
+        trie_regex = build_trie_regex(literal for literal in self.__patterns if literal)
+        self.__regex: Optional[re.Pattern] = re.compile(trie_regex) if trie_regex else None
+        self.__ignore_case_regex: Optional[re.Pattern] = re.compile(trie_regex, re.IGNORECASE) if trie_regex else None
+
+    def scan(self, text: str) -> list[PatternHit]:
+        """
+        Scans the text for all the patterns.
+
+        Parameters
+        ----------
+        text (str): The text to scan.
+
+        Returns
+        -------
+        list: The name, the offset and the matched text of every hit, in the order of the offsets.
+        """
+        hits = []
+        if self.__regex is None or not text:
+            return hits
+
+        scanned_text, regex = text.lower(), self.__regex
+        if len(scanned_text) != len(text):
+            scanned_text, regex = text, self.__ignore_case_regex
+
+        # Searching again from the offset following every hit reports the hits starting inside the previous ones
+        match = regex.search(scanned_text)
+        while match is not None:
+            offset = match.start()
+            for literal in self.__prefixes.get(match.group().lower(), ()):
+                for name, pattern, ignore_case in self.__patterns[literal]:
+                    if ignore_case or text.startswith(pattern, offset):
+                        hits.append((name, offset, text[offset : offset + len(pattern)]))
+            match = regex.search(scanned_text, offset + 1)
+        return hits
+
+
+def load_forbidden_patterns(path: str = FORBIDDEN_PATTERNS_PATH) -> list[dict]:
+    """
+    Loads the table of the forbidden patterns.
+
+    Parameters
+    ----------
+    path : str, optional
+        Path of the YAML table, by default FORBIDDEN_PATTERNS_PATH.
+
+    Returns
+    -------
+    list[dict]
+        Pattern table entries.
+    """
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or []
+
+
+@lru_cache(maxsize=None)
+def get_pattern_scanner(matched_tag: str) -> PatternScanner:
+    """
+    Returns the scanner of the forbidden patterns of a block tag, compiled on first use.
+
+    Parameters
+    ----------
+    matched_tag : str
+        The matched tag of the scanned blocks.
+
+    Returns
+    -------
+    PatternScanner
+        The scanner of the patterns of the tag.
+    """
+    return PatternScanner([entry for entry in load_forbidden_patterns() if matched_tag in entry.get("tags", [])])
@@ -0,0 +1,215 @@
+"""This file contains the registry dispatching the blocks to their validation rules.
+
+Every block validator declares the tags of the blocks it validates and its ordered rules, and every rule may
+declare the SFT types it applies to. The registry precompiles a dispatch table from (matched tag, SFT type) to
+the validator class and the rules to run, so that validating a block is a single lookup followed by the calls
+of the rules that apply. Rules can be disabled with `SFT_DISABLED_RULES`, the gate runs only dispatch to the rules
+of a minimum severity and stop at an error budget, and the calls and the time spent in every rule are recorded
+when `SFT_RULE_PROFILING` is enabled, or in the run timings when they are recorded.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+from parsing import Turn
+from parsing.block_parser import BaseBlock
+from review_services.sft_validator.block_validations import (
+    BaseBlockValidators,
+    CODEOutputValidators,
+    CODEValidator,
+    ICEFileMetadataValidators,
+    OtherBlockValidators,
+    RTUValidators,
+    Severity,
+    ThoughtValidators,
+    UserQueryValidators,
+)
+from utils import EVENTS_TAG_UNIQUE_COLAB, SFT_TYPES, get_timing_recorder
+
+# Comma-separated names of the disabled rules, either `rule` or `Validator.rule`
+SFT_DISABLED_RULES: list[str] = [
+    name.strip() for name in os.getenv("SFT_DISABLED_RULES", "").split(",") if name.strip()
+]
+# Whether to record the calls and the time spent in every rule
+SFT_RULE_PROFILING: bool = os.getenv("SFT_RULE_PROFILING", "false").lower() == "true"
+
+BLOCK_VALIDATORS: list[type[BaseBlockValidators]] = [
+    UserQueryValidators,
+    ICEFileMetadataValidators,
+    ThoughtValidators,
+    RTUValidators,
+    CODEValidator,
+    CODEOutputValidators,
+]
+
+
+class RuleRegistry:
+    """
+    Dispatch table of the block validation rules, keyed by matched tag, SFT type and minimum severity.
+
+    Attributes
+    ----------
+    disabled_rules (frozenset): Names of the disabled rules.
+
+    profiling (bool): Whether the calls and the time spent in every rule are recorded.
+    """
+
+    def __init__(
+        self,
+        validators: Iterable[type[BaseBlockValidators]] = BLOCK_VALIDATORS,
+        default_validator: type[BaseBlockValidators] = OtherBlockValidators,
+        disabled_rules: Iterable[str] = SFT_DISABLED_RULES,
+        profiling: bool = SFT_RULE_PROFILING,
+    ):
+        """
+        Initializes the RuleRegistry instance and precompiles the dispatch table of the known tags, SFT types and
+        severities.
+
+        Parameters
+        ----------
+        validators (Iterable): Block validators, each validating the blocks of its `block_tags`.
+
+        default_validator (type): Block validator of the blocks with any other tag.
+
+        disabled_rules (Iterable): Names of the disabled rules, either `rule` or `Validator.rule`.
+
+        profiling (bool): Whether to record the calls and the time spent in every rule.
+        """
+        self.disabled_rules: frozenset[str] = frozenset(disabled_rules)
+        self.profiling: bool = profiling
+        self.__validators: dict[str, type[BaseBlockValidators]] = {
+            tag: validator for validator in validators for tag in validator.block_tags
+        }
+        self.__default_validator = default_validator
+        self.__lock = threading.Lock()
+        self.__rule_stats: dict[str, list] = {}
+
+        self.__dispatch_table: dict[tuple[str, str, str], tuple[type[BaseBlockValidators], tuple[Callable, ...]]] = {}
+        for tag in EVENTS_TAG_UNIQUE_COLAB + ["MISSING_TAG:"]:
+            for sft_type in SFT_TYPES:
+                for min_severity in Severity.LEVELS:
+                    self.__compile(tag, sft_type, min_severity)
+
+    def get_rules(
+        self, matched_tag: str, sft_type: str, min_severity: str = Severity.LOW
+    ) -> tuple[type[BaseBlockValidators], tuple[Callable, ...]]:
+        """
+        Returns the validator class and the rules that apply to the blocks of a tag and an SFT type.
+
+        Parameters
+        ----------
+        matched_tag (str): The matched tag of the block.
+
+        sft_type (str): The type of SFT.
+
+        min_severity (str): Minimum severity of the rules.
+
+        Returns
+        -------
+        tuple: The validator class and its rules, in order.
+        """
+        rules = self.__dispatch_table.get((matched_tag, sft_type, min_severity))
+        if rules is None:
+            rules = self.__compile(matched_tag, sft_type, min_severity)
+        return rules
+
+    def has_rule(self, matched_tag: str, sft_type: str, check: Callable, min_severity: str = Severity.LOW) -> bool:
+        """
+        Checks whether a rule runs on the blocks of a tag and an SFT type, e.g. to skip the lookups it needs.
+
+        Parameters
+        ----------
+        matched_tag (str): The matched tag of the block.
+
+        sft_type (str): The type of SFT.
+
+        check (Callable): The rule.
+
+        min_severity (str): Minimum severity of the rules.
+
+        Returns
+        -------
+        bool: Whether the rule is dispatched to the blocks.
+        """
+        return check in self.get_rules(matched_tag, sft_type, min_severity)[1]
+
+    def validate_block(
+        self, block: BaseBlock, turn: Turn, min_severity: str = Severity.LOW, max_errors: Optional[int] = None
+    ) -> list[list]:
+        """
+        Runs the rules that apply to the block.
+
+        Parameters
+        ----------
+        block (BaseBlock): The block to be validated.
+
+        turn (Turn): The turn of the block.
+
+        min_severity (str): Minimum severity of the rules.
+
+        max_errors (Optional[int]): Number of failed checks after which the remaining rules are skipped,
+            None to run every rule.
+
+        Returns
+        -------
+        list: A list of failed check IDs.
+        """
+        validator_class, rules = self.get_rules(block.matched_tag, block.sft_type, min_severity)
+        if not rules:
+            return []
+
+        validator = validator_class.from_turn(block, turn)
+        profiling = self.profiling or get_timing_recorder().enabled
+        failed_checks = []
+        for check in rules:
+            if profiling:
+                start, start_cpu = time.perf_counter(), time.thread_time()
+                check_id = check(validator)
+                self.__record(validator_class, check, time.perf_counter() - start, time.thread_time() - start_cpu)
+            else:
+                check_id = check(validator)
+            if check_id:
+                failed_checks.append(check_id)
+                if len(failed_checks) == max_errors:
+                    break
+
+        return failed_checks
+
+    def rule_stats(self) -> dict[str, dict[str, float]]:
+        """
+        Returns the number of calls and the time spent in every rule since profiling was enabled.
+
+        Returns
+        -------
+        dict: Calls and total seconds by rule, as `Validator.rule`.
+        """
+        with self.__lock:
+            return {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in self.__rule_stats.items()}
+
+    def __record(
+        self, validator_class: type[BaseBlockValidators], check: Callable, seconds: float, cpu_seconds: float
+    ) -> None:
+        """Records a call of a rule."""
+        name = f"{validator_class.__name__}.{check.__name__}"
+        get_timing_recorder().record(f"rule:{name}", seconds, cpu_seconds)
+        if not self.profiling:
+            return
+
+        with self.__lock:
+            stats = self.__rule_stats.setdefault(name, [0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+
+    def __compile(
+        self, matched_tag: str, sft_type: str, min_severity: str
+    ) -> tuple[type[BaseBlockValidators], tuple[Callable, ...]]:
+        """Compiles the dispatch table entry of a tag, an SFT type and a minimum severity."""
+        validator_class = self.__validators.get(matched_tag, self.__default_validator)
+        entry = (validator_class, validator_class.get_rules(sft_type, self.disabled_rules, min_severity))
+        self.__dispatch_table[(matched_tag, sft_type, min_severity)] = entry
+        return entry
+
+
+rule_registry = RuleRegistry()
@@ -0,0 +1,211 @@
+"""This file contains the finite-state automaton validating the sequence of blocks of a turn.
+
+The sequence grammar of an SFT type (see `SFT_SEQUENCES`) and the neighbour rules shared by all the SFT types
+are compiled once into a DFA over the block tags. The state of the DFA tracks the position in the initial
+sequence and the repeating cycle, the previous tag and the expectations left open by the previous blocks, and
+every transition carries the violations it detects. A turn is then validated in a single linear pass over its
+tags, and the violations left open at the end of the turn come from the end table of the last state.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+from parsing.block_parser import BaseBlock
+from review_services.sft_validator.sft_consts import SFT_SEQUENCES, BaseSFTSequence, OtherSFTSequence
+from utils import EVENTS_TAG_UNIQUE_COLAB
+
+# Violation messages, formatted with the expected tags and the original tag of the block
+EXPECTED_TAG = "SEQUENCE_MISMATCH: Expected '{expected}' but got '{got}'"
+EXPECTED_LAST_TAG = "SEQUENCE_MISMATCH: Expected last block to be '{expected}' but got '{got}'"
+CODE_WITHOUT_OUTPUT = "SEQUENCE_MISMATCH: 'CODE:' must be followed by 'CODE_OUTPUT:'"
+TOOL_OUTPUT_WITHOUT_CODE = "SEQUENCE_MISMATCH: 'TOOL_OUTPUT:' must be preceded by 'TOOL_CODE:'"
+DOC_RELEVANCE_WITHOUT_OUT = (
+    "SEQUENCE_MISMATCH: 'DOC_RELEVANCE_RETRIEVAL:' must be followed by 'DOC_RELEVANCE_RETRIEVAL_OUT:'"
+)
+DOC_RELEVANCE_WITHOUT_QUERY = (
+    "SEQUENCE_MISMATCH: 'DOC_RELEVANCE_RETRIEVAL:' "
+    "must be followed by 'DOC_RELEVANCE_RETRIEVAL_OUT:' and 'REWRITTEN_QUERY:'"
+)
+THOUGHT_AFTER_RTU = "SEQUENCE_MISMATCH: 'THOUGHT:' must not come after 'RESPONSE_TO_USER:'"
+THOUGHT_WITHOUT_RTU = "SEQUENCE_MISMATCH: 'THOUGHT:' must be followed by 'RESPONSE_TO_USER:'"
+LAST_TURN_ENDS_WITH_TAG = "SEQUENCE_MISMATCH: Found '{expected}' at the end of the Stepwise SFT."
+
+# Symbol of the tags outside of the alphabet of the automaton
+OTHER_TAG = ""
+
+# A violation detected by a transition: offset of the block from the current block (0, -1 or -2),
+# message and expected tags
+Violation = tuple[int, str, str]
+
+
+class SequenceAutomaton:
+    """
+    DFA validating the sequence of blocks of the turns of an SFT type, in a stepwise mode.
+
+    The states are tuples of (initial sequence position, repeating cycle position, pending repeating cycle
+    mismatch, previous tag, DOC_RELEVANCE_RETRIEVAL one and two blocks back, THOUGHT seen, THOUGHT waiting
+    for a RESPONSE_TO_USER). Only the states reachable from the start state are compiled.
+    """
+
+    def __init__(self, grammar: type[BaseSFTSequence], is_stepwise: bool):
+        """
+        Compiles the automaton of a sequence grammar.
+
+        Parameters
+        ----------
+        grammar (type): Sequence grammar of the SFT type, see `SFT_SEQUENCES`.
+
+        is_stepwise (bool): Whether the SFT is stepwise.
+        """
+        self.grammar: type[BaseSFTSequence] = grammar
+        self.is_stepwise: bool = is_stepwise
+
+        alphabet = EVENTS_TAG_UNIQUE_COLAB + ["MISSING_TAG:"] + grammar.init_seq + grammar.repeating_seq
+        self.__symbols: dict[str, int] = {tag: symbol for symbol, tag in enumerate(dict.fromkeys(alphabet))}
+        self.__other_symbol: int = len(self.__symbols)
+        tags = list(self.__symbols) + [OTHER_TAG]
+
+        # Transitions and end violations by state id, the start state is 0
+        self.__transitions: list[list[tuple[int, tuple[Violation, ...]]]] = []
+        self.__end_violations: list[tuple[tuple[Violation, ...], tuple[Violation, ...]]] = []
+
+        start = (0, 0, None, None, False, False, False, False)
+        state_ids = {start: 0}
+        states = [start]
+        while len(self.__transitions) < len(states):
+            state = states[len(self.__transitions)]
+            transitions = []
+            for tag in tags:
+                next_state, violations = self.__step(state, tag)
+                if next_state not in state_ids:
+                    state_ids[next_state] = len(states)
+                    states.append(next_state)
+                transitions.append((state_ids[next_state], tuple(violations)))
+            self.__transitions.append(transitions)
+            self.__end_violations.append((tuple(self.__end(state, False)), tuple(self.__end(state, True))))
+
+    @property
+    def num_states(self) -> int:
+        """The number of states of the automaton."""
+        return len(self.__transitions)
+
+    def validate(self, blocks: list[BaseBlock], is_last_turn: bool) -> list[tuple[int, str]]:
+        """
+        Validates the sequence of blocks of a turn in a single pass.
+
+        Parameters
+        ----------
+        blocks (list): The blocks of the turn.
+
+        is_last_turn (bool): Whether the turn is the last one of the colab.
+
+        Returns
+        -------
+        list: The serial number of the block and the message of every violation, in the order they are detected.
+        """
+        failed_checks = []
+        state, window = 0, (None, None, None)
+        for block in blocks:
+            window = (window[1], window[2], block)
+            state, violations = self.__transitions[state][self.__symbols.get(block.matched_tag, self.__other_symbol)]
+            for offset, message, expected in violations:
+                failed_checks.append(self.__format(window[2 + offset], message, expected))
+
+        for offset, message, expected in self.__end_violations[state][is_last_turn]:
+            failed_checks.append(self.__format(window[2 + offset], message, expected))
+        return failed_checks
+
+    @staticmethod
+    def __format(block: BaseBlock, message: str, expected: str) -> tuple[int, str]:
+        """Formats a violation of the block."""
+        return block.serial_number, message.format(expected=expected, got=block.original_tag)
+
+    def __step(self, state: tuple, tag: str) -> tuple[tuple, list[Violation]]:
+        """Computes the transition of a state on a tag, while compiling the automaton."""
+        init_index, cycle_index, cycle_mismatch, previous_tag, doc_1, doc_2, thought_seen, thought_pending = state
+        init_seq, repeating_seq = self.grammar.init_seq, self.grammar.repeating_seq
+        violations = []
+
+        # The previous block was not the last one, so its repeating cycle mismatch is reported
+        if cycle_mismatch is not None:
+            violations.append((-1, EXPECTED_TAG, cycle_mismatch))
+            cycle_mismatch = None
+
+        # Skip the repeatable tags of the initial sequence that are not repeated anymore
+        repeatable_tags = self.grammar.repeatable_tags
+        while init_index < len(init_seq) and init_seq[init_index] in repeatable_tags and tag != init_seq[init_index]:
+            init_index += 1
+        if init_index < len(init_seq):
+            if init_seq[init_index] not in repeatable_tags:
+                if tag != init_seq[init_index]:
+                    violations.append((0, EXPECTED_TAG, init_seq[init_index]))
+                init_index += 1
+        elif repeating_seq:
+            # The last block of the turn is not part of the repeating cycle, its mismatch is reported on the next block
+            if tag != repeating_seq[cycle_index]:
+                cycle_mismatch = repeating_seq[cycle_index]
+            cycle_index = (cycle_index + 1) % len(repeating_seq)
+
+        # Neighbour rules, the first block of the turn is only checked as the previous block of the second one
+        if previous_tag is not None:
+            if previous_tag == "CODE:" and tag != "CODE_OUTPUT:":
+                violations.append((-1, CODE_WITHOUT_OUTPUT, ""))
+            if doc_1 and tag != "DOC_RELEVANCE_RETRIEVAL_OUT:":
+                violations.append((-1, DOC_RELEVANCE_WITHOUT_OUT, ""))
+            if doc_2 and tag != "REWRITTEN_QUERY:":
+                violations.append((-2, DOC_RELEVANCE_WITHOUT_QUERY, ""))
+            if thought_pending and tag != "RESPONSE_TO_USER:":
+                violations.append((-1, THOUGHT_WITHOUT_RTU, ""))
+            if tag == "TOOL_OUTPUT:" and previous_tag != "TOOL_CODE:":
+                violations.append((0, TOOL_OUTPUT_WITHOUT_CODE, ""))
+            if tag == "THOUGHT:" and previous_tag == "RESPONSE_TO_USER:":
+                violations.append((0, THOUGHT_AFTER_RTU, ""))
+
+            # Every THOUGHT after the first one must be immediately followed by RESPONSE_TO_USER
+            doc_1, doc_2 = tag == "DOC_RELEVANCE_RETRIEVAL:", doc_1
+            thought_pending = tag == "THOUGHT:" and thought_seen
+            thought_seen = thought_seen or tag == "THOUGHT:"
+
+        next_state = (init_index, cycle_index, cycle_mismatch, tag, doc_1, doc_2, thought_seen, thought_pending)
+        return next_state, violations
+
+    def __end(self, state: tuple, is_last_turn: bool) -> list[Violation]:
+        """Computes the violations left open at the end of a turn in a state, while compiling the automaton."""
+        previous_tag, thought_pending = state[3], state[7]
+        violations = []
+        if thought_pending:
+            violations.append((0, THOUGHT_WITHOUT_RTU, ""))
+
+        # The empty turns have no last block
+        if previous_tag is None:
+            return violations
+
+        if self.is_stepwise:
+            if is_last_turn and previous_tag in self.grammar.stepwise_last_turn_invalid_tags:
+                violations.append((0, LAST_TURN_ENDS_WITH_TAG, previous_tag))
+            elif previous_tag not in self.grammar.stepwise_last_tags:
+                violations.append((0, EXPECTED_LAST_TAG, " or ".join(self.grammar.stepwise_last_tags)))
+        elif previous_tag not in self.grammar.last_tags:
+            violations.append((0, EXPECTED_LAST_TAG, " or ".join(self.grammar.last_tags)))
+        return violations
+
+
+@lru_cache(maxsize=None)
+def get_sequence_automaton(sft_type: Optional[str], is_stepwise: bool) -> SequenceAutomaton:
+    """
+    Returns the sequence automaton of an SFT type, compiled on first use.
+
+    Parameters
+    ----------
+    sft_type : Optional[str]
+        The type of SFT.
+
+    is_stepwise : bool
+        Whether the SFT is stepwise.
+
+    Returns
+    -------
+    SequenceAutomaton
+        The automaton validating the sequence of blocks of the turns.
+    """
+    return SequenceAutomaton(SFT_SEQUENCES.get(sft_type, OtherSFTSequence), bool(is_stepwise))
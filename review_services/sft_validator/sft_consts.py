@@ -1,5 +1,7 @@
 """This file contains the Constants and Classes for the SFT Validator Service."""
 
+import threading
+
 import pandas as pd
 
 from utils import initialize_sheets_service
@@ -14,9 +16,30 @@ class OnlineSFTCodeErrors:
 
     Attributes:
         res_dict (dict): A dictionary with 'Shared Link' as keys and 'Number of Expected Code Errors' as values.
+        is_loaded (bool): Whether `res_dict` holds the tracker, fetched by this process or handed over by the
+            runner process to the workers of the process tier.
     """
 
     res_dict = {}  # Static attribute for the exposed dictionary
+    is_loaded = False
+    _lock = threading.Lock()
+
+    @classmethod
+    def ensure_loaded(cls):
+        """Fetches the tracker on first use, unless the runner process handed it over to this worker process."""
+        with cls._lock:
+            if not cls.is_loaded:
+                cls.initialize_res_df()
+
+    @classmethod
+    def set_res_dict(cls, res_dict: dict):
+        """Installs the tracker fetched by another process, without fetching it again.
+
+        Args:
+            res_dict (dict): Expected number of code errors by colab name.
+        """
+        cls.res_dict = res_dict
+        cls.is_loaded = True
 
     @classmethod
     def initialize_res_df(cls):
@@ -50,6 +73,7 @@ class OnlineSFTCodeErrors:
                 # Generate res_dict from the specified columns
                 if "SFT File Name" in res_df.columns and "Number of Expected Code Errors" in res_df.columns:
                     cls.res_dict = res_df.set_index("SFT File Name")["Number of Expected Code Errors"].to_dict()
+        cls.is_loaded = True
 
     def __init__(self):
         """Initializes an instance of OnlineSFTCodeErrors.
@@ -69,6 +93,16 @@ class BaseSFTSequence:
 
     repeating_seq = []
 
+    # Tags of the initial sequence that can appear consecutively any number of times
+    repeatable_tags = ["ICE_FILE_METADATA:"]
+
+    # Tags the turns can end with, in the non-stepwise and in the stepwise SFTs
+    last_tags = ["RESPONSE_TO_USER:"]
+    stepwise_last_tags = ["RESPONSE_TO_USER:", "CODE_OUTPUT:"]
+
+    # Tags the last turn of a stepwise SFT cannot end with
+    stepwise_last_turn_invalid_tags = ["RESPONSE_TO_USER:"]
+
 
 class FileSFTSequence(BaseSFTSequence):
     """This class contains the initial sequence for SFTs with FILE"""
@@ -87,3 +121,21 @@ class PDFSFTSequence(BaseSFTSequence):
         "USER_QUERY:",
         "ICE_FILE_METADATA:",
     ]
+
+
+class OtherSFTSequence(BaseSFTSequence):
+    """This class contains the sequence for the SFTs of an unknown type, without an initial sequence"""
+
+    init_seq = []
+
+
+# Sequence grammar of each SFT type, the other SFT types use OtherSFTSequence
+SFT_SEQUENCES = {
+    "file": FileSFTSequence,
+    "marketing": FileSFTSequence,
+    "pdf": PDFSFTSequence,
+    "no_file": BaseSFTSequence,
+    "reasoning": BaseSFTSequence,
+    "search": BaseSFTSequence,
+    "browse": BaseSFTSequence,
+}
@@ -1,12 +1,75 @@
 """This file contains function that runs the SFT validator on a Colab file."""
 
+from typing import Iterable, Iterator, Optional
+
+from parsing import PlanParsingError, Turn
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.async_engine import AsyncEngine
 from review_services.colab import Colab
+from review_services.sft_validator.block_validations import ICEFileMetadataValidators, Severity
+from review_services.sft_validator.rule_registry import rule_registry
 from review_services.sft_validator.sft_consts import OnlineSFTCodeErrors
 from review_services.sft_validator.turn_validations import TurnValidators
-from utils import Status
+from review_services.sft_validator.validation_mode import ValidationMode, default_validation_mode
+from utils import Status, drive_file_names, get_file_id_from_link, logger
+
+# Severity of the errors of the code error tracker checks
+CODE_ERROR_TRACKER_SEVERITY = Severity.HIGH
+
+
+def get_referenced_file_ids(turn: Turn) -> list[str]:
+    """Function to collect the Google Drive file IDs referenced by the ICE_FILE_METADATA blocks of a turn.
+
+    Parameters
+    ----------
+    turn : Turn
+        Parsed turn
+
+    Returns
+    -------
+    list[str]
+        File IDs found in the FILE_PATH of the ICE_FILE_METADATA blocks
+    """
+    file_ids = []
+    for block in turn.blocks:
+        if block.matched_tag != "ICE_FILE_METADATA:" or not block.metadata:
+            continue
+        file_id = get_file_id_from_link(block.metadata.get("FILE_PATH:", {}).get("value", ""))
+        if file_id:
+            file_ids.append(file_id)
+    return file_ids
+
+
+def iter_turns_with_count(turns: Iterable[Turn]) -> Iterator[tuple[Turn, Optional[int]]]:
+    """Function to pair the streamed turns with the total number of turns, looking one turn ahead.
+
+    Parameters
+    ----------
+    turns : Iterable[Turn]
+        Parsed turns, in order
+
+    Yields
+    ------
+    tuple[Turn, Optional[int]]
+        Turn and total number of turns, None while the last turn is not reached
+    """
+    previous_turn = None
+    num_turns = 0
+    for turn in turns:
+        if previous_turn is not None:
+            yield previous_turn, None
+        previous_turn = turn
+        num_turns += 1
+
+    if previous_turn is not None:
+        yield previous_turn, num_turns
 
 
-def sft_validator(file_info: dict[str, str]) -> Colab:
+def sft_validator(
+    file_info: dict[str, str],
+    artifact_store: Optional[NotebookArtifactStore] = None,
+    validation_mode: Optional[ValidationMode] = None,
+) -> Colab:
     """Function to process a single Colab file.
 
     Parameters
@@ -14,25 +77,101 @@ def sft_validator(file_info: dict[str, str]) -> Colab:
     file_info : dict[str, str]
         Dictionary containing the file information
 
+    artifact_store : Optional[NotebookArtifactStore], optional
+        Run-scoped store sharing the notebook artifacts across validators, by default None
+
+    validation_mode : Optional[ValidationMode], optional
+        Execution mode of the validations, by default the one of SFT_VALIDATION_MODE
+
     Returns
     -------
     Colab
         Colab object containing the Colab name, URL, and errors (if any).
     """
-    colab: Colab = Colab(file_info)
+    # The turns are validated while they are parsed, only the cross-turn state is kept
+    colab: Colab = Colab(file_info, artifact_store, stream=True)
     if colab.parsed_colab is None:
         colab.colab_res["errors"] = None
         colab.colab_res["status"] = "colab parsing failed"
         return colab
 
-    all_turn_checks, total_turns = [], len(colab.parsed_colab.get_turns())
-    for turn in colab.parsed_colab.get_turns():
+    try:
+        return validate_turns(colab, validation_mode or default_validation_mode)
+    except PlanParsingError as e:
+        # The streamed turns are parsed while they are validated, a turn failing to parse fails the whole colab
+        logger.error(str(e))
+        colab.colab_res["errors"] = None
+        colab.colab_res["status"] = "colab parsing failed"
+        return colab
+
+
+def validate_turns(colab: Colab, validation_mode: ValidationMode) -> Colab:
+    """Function to validate the turns of a parsed colab.
+
+    Parameters
+    ----------
+    colab : Colab
+        Colab whose turns are streamed
+
+    validation_mode : ValidationMode
+        Execution mode of the validator
+
+    Returns
+    -------
+    Colab
+        Colab object containing the Colab name, URL, and errors (if any).
+
+    Raises
+    ------
+    PlanParsingError
+        If a streamed turn cannot be parsed
+    """
+    error_budget = validation_mode.error_budget
+
+    all_turn_checks = []
+    for turn, total_turns in iter_turns_with_count(colab.parsed_colab.iter_turns()):
+        # The file names are only looked up by the rule comparing them with the FILE_PATH of the metadata
+        if rule_registry.has_rule(
+            "ICE_FILE_METADATA:",
+            turn.sft_type,
+            ICEFileMetadataValidators.validate_filename_in_url_matches_file_name,
+            validation_mode.min_severity,
+        ):
+            # Resolve the names of all the files referenced by the turn at once, the validations only look them up.
+            # The lookups of the notebooks validated at the same time share their Drive batch requests.
+            drive_file_names.resolve(get_referenced_file_ids(turn))
+
         turn_validator = TurnValidators(turn)
 
         # Call the validation function for the entire turn
-        failed_checks = turn_validator.validate_turn(total_turns)
+        remaining_errors = None if error_budget is None else error_budget - len(all_turn_checks)
+        failed_checks = turn_validator.validate_turn(total_turns, validation_mode.min_severity, remaining_errors)
         all_turn_checks.extend(failed_checks)
+        if len(all_turn_checks) == error_budget:
+            # The remaining turns are neither parsed nor validated
+            return set_colab_result(colab, all_turn_checks)
+
+    if Severity.is_at_least(CODE_ERROR_TRACKER_SEVERITY, validation_mode.min_severity):
+        all_turn_checks.extend(get_code_error_tracker_checks(colab))
+
+    return set_colab_result(colab, all_turn_checks[:error_budget])
+
+
+def get_code_error_tracker_checks(colab: Colab) -> list[list]:
+    """Function to compare the number of code errors of a fully parsed colab with the code error tracker.
 
+    Parameters
+    ----------
+    colab : Colab
+        Colab whose turns were all parsed
+
+    Returns
+    -------
+    list[list]
+        Failed checks of the colab against the code error tracker
+    """
+    OnlineSFTCodeErrors.ensure_loaded()
+    all_turn_checks = []
     if colab.parsed_colab.num_code_errors > 0 and colab.file_name not in OnlineSFTCodeErrors.res_dict:
         all_turn_checks.append(
             [
@@ -56,7 +195,25 @@ def sft_validator(file_info: dict[str, str]) -> Colab:
                 f"The colab has {num_errors} code errors but code error tracker has {expected_num_errors} errors.",
             ]
         )
+    return all_turn_checks
+
+
+def set_colab_result(colab: Colab, all_turn_checks: list[list]) -> Colab:
+    """Function to set the errors and the status of a validated colab.
 
+    Parameters
+    ----------
+    colab : Colab
+        Validated colab
+
+    all_turn_checks : list[list]
+        Failed checks of the colab
+
+    Returns
+    -------
+    Colab
+        Colab object containing the Colab name, URL, and errors (if any).
+    """
     if all_turn_checks:
         colab.colab_res["errors"] = all_turn_checks
         colab.colab_res["status"] = Status.FAILED
@@ -65,3 +222,33 @@ def sft_validator(file_info: dict[str, str]) -> Colab:
         colab.colab_res["status"] = Status.PASSED
 
     return colab
+
+
+async def sft_validator_async(
+    file_info: dict[str, str],
+    artifact_store: NotebookArtifactStore,
+    engine: AsyncEngine,
+    validation_mode: Optional[ValidationMode] = None,
+) -> Colab:
+    """Async version of `sft_validator`, running the parsing and the validations in the engine executor.
+
+    Parameters
+    ----------
+    file_info : dict[str, str]
+        Dictionary containing the file information
+
+    artifact_store : NotebookArtifactStore
+        Run-scoped store sharing the notebook artifacts across validators
+
+    engine : AsyncEngine
+        Engine running the requests and the CPU-bound work of the run
+
+    validation_mode : Optional[ValidationMode], optional
+        Execution mode of the validations, by default the one of SFT_VALIDATION_MODE
+
+    Returns
+    -------
+    Colab
+        Colab object containing the Colab name, URL, and errors (if any).
+    """
+    return await engine.run_in_executor(sft_validator, file_info, artifact_store, validation_mode)
@@ -0,0 +1,105 @@
+"""This file contains the execution modes of the SFT validator.
+
+A full validation runs every rule on every turn and reports every error. The gate modes stop early: with
+`first_failure` a colab stops at its first error, with `max_errors=N` it stops once N errors are found, and with
+`severity>=X` only the rules of severity X or above run. A stopped colab is neither parsed nor validated past the
+turn of its last error, so its Drive lookups and its code error tracker checks are skipped as well, and its errors
+are the first ones found rather than all of them.
+"""
+
+import os
+from typing import NamedTuple, Optional
+
+from review_services.sft_validator.block_validations import Severity
+
+# Execution mode of the SFT validator, e.g. "first_failure", "max_errors=5" or "severity>=high,max_errors=10"
+SFT_VALIDATION_MODE: str = os.getenv("SFT_VALIDATION_MODE", "")
+
+
+class ValidationMode(NamedTuple):
+    """
+    Execution mode of the SFT validator.
+
+    Attributes
+    ----------
+    first_failure (bool): Whether a colab stops at its first error.
+
+    max_errors (Optional[int]): Number of errors after which a colab stops, None for no limit.
+
+    min_severity (str): Minimum severity of the rules that run.
+    """
+
+    first_failure: bool = False
+    max_errors: Optional[int] = None
+    min_severity: str = Severity.LOW
+
+    @classmethod
+    def parse(cls, mode: Optional[str]) -> "ValidationMode":
+        """
+        Parses an execution mode from its comma-separated options.
+
+        Parameters
+        ----------
+        mode : Optional[str]
+            Options of the mode among `first_failure`, `max_errors=N` and `severity>=X`, the full validation
+            if it is empty, None or `full`.
+
+        Returns
+        -------
+        ValidationMode
+            The execution mode.
+
+        Raises
+        ------
+        ValueError
+            If an option is unknown or invalid.
+        """
+        first_failure, max_errors, min_severity = False, None, Severity.LOW
+        for option in (mode or "").split(","):
+            option = option.strip().lower().replace(" ", "")
+            if option in ("", "full"):
+                continue
+            if option == "first_failure":
+                first_failure = True
+            elif option.startswith("max_errors="):
+                value = option.removeprefix("max_errors=")
+                if not value.isdigit() or int(value) < 1:
+                    raise ValueError(f"Invalid validation mode '{option}', max_errors must be a positive integer.")
+                max_errors = int(value)
+            elif option.startswith("severity>="):
+                min_severity = option.removeprefix("severity>=")
+                if min_severity not in Severity.LEVELS:
+                    raise ValueError(
+                        f"Invalid validation mode '{option}', the severity must be one of {Severity.LEVELS}."
+                    )
+            else:
+                raise ValueError(
+                    f"Unknown validation mode '{option}', expected first_failure, max_errors=N or severity>=X."
+                )
+        return cls(first_failure, max_errors, min_severity)
+
+    @property
+    def error_budget(self) -> Optional[int]:
+        """Number of errors after which a colab stops, None for no limit."""
+        if self.first_failure:
+            return 1
+        return self.max_errors
+
+    @property
+    def is_full(self) -> bool:
+        """Whether every rule runs and every error is reported."""
+        return self == ValidationMode()
+
+    def __str__(self) -> str:
+        """Returns the options of the mode, parsed back by `parse`."""
+        options = []
+        if self.first_failure:
+            options.append("first_failure")
+        if self.max_errors is not None:
+            options.append(f"max_errors={self.max_errors}")
+        if self.min_severity != Severity.LOW:
+            options.append(f"severity>={self.min_severity}")
+        return ",".join(options) or "full"
+
+
+default_validation_mode = ValidationMode.parse(SFT_VALIDATION_MODE)
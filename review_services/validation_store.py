@@ -0,0 +1,198 @@
+"""This file contains the persistent store used by the incremental validation runs.
+
+For every root folder it keeps the Drive changes checkpoint and the listing of the previous run, and for every
+notebook revision it keeps the last result of each validator version, so that unchanged notebooks do not have
+to be validated again. Besides the content, the validators read the name of the notebook and the SFT type and
+stepwise flag derived from its folder and name, so a stored result is only reused while those are unchanged.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from utils import get_revision_key
+
+VALIDATION_STORE_PATH: str = os.getenv("VALIDATION_STORE_PATH", os.path.join(".cache", "validation.sqlite3"))
+
+# Fields of the file information read by the validators besides the notebook content
+VALIDATED_FIELDS: tuple[str, ...] = ("name", "sft_type", "is_stepwise")
+
+
+def get_validated_revision(file_info: dict[str, str]) -> Optional[str]:
+    """Function to build the key of a notebook revision together with the file information read by the validators.
+
+    Parameters
+    ----------
+    file_info : dict[str, str]
+        Dictionary containing the file information.
+
+    Returns
+    -------
+    Optional[str]
+        Key of the validated revision, None if the listing did not return any revision field.
+    """
+    revision = get_revision_key(file_info)
+    if revision is None:
+        return None
+    fields = json.dumps([file_info.get(field) for field in VALIDATED_FIELDS])
+    return f"{revision}:{hashlib.sha256(fields.encode()).hexdigest()[:16]}"
+
+
+class ValidationStore:
+    """
+    SQLite store of the incremental validation checkpoints and results.
+
+    Attributes
+    ----------
+    db_path (str): Path of the SQLite database.
+    """
+
+    def __init__(self, db_path: str = VALIDATION_STORE_PATH):
+        """
+        Initializes the ValidationStore instance.
+
+        Parameters
+        ----------
+        db_path (str): Path of the SQLite database.
+        """
+        self.db_path: str = db_path
+        self.__lock = threading.Lock()
+        self.__initialized = False
+
+    def get_checkpoint(self, root_id: str) -> Optional[dict]:
+        """
+        Returns the checkpoint of the previous run on the root folder.
+
+        Parameters
+        ----------
+        root_id : str
+            Drive id of the root folder.
+
+        Returns
+        -------
+        Optional[dict]
+            Changes page token, colabs and folders of the previous run, None if the folder was never validated.
+        """
+        with self.__lock, self.__connect() as conn:
+            row = conn.execute(
+                "SELECT page_token, colabs, folders FROM checkpoints WHERE root_id = ?", (root_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"page_token": row[0], "colabs": json.loads(row[1]), "folders": json.loads(row[2])}
+
+    def save_checkpoint(self, root_id: str, page_token: str, colabs: dict[str, dict], folders: dict[str, dict]) -> None:
+        """
+        Stores the checkpoint of the run on the root folder.
+
+        Parameters
+        ----------
+        root_id : str
+            Drive id of the root folder.
+
+        page_token : str
+            Drive changes page token taken before the colabs were listed.
+
+        colabs : dict[str, dict]
+            Colabs validated by the run, by id.
+
+        folders : dict[str, dict]
+            Folders listed by the run, by id.
+        """
+        with self.__lock, self.__connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (root_id, page_token, colabs, folders) VALUES (?, ?, ?, ?)",
+                (root_id, page_token, json.dumps(colabs), json.dumps(folders)),
+            )
+
+    def get_result(self, file_info: dict[str, str], validator: str, version: str) -> Optional[dict]:
+        """
+        Returns the stored result of the validator version on the notebook revision.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        validator : str
+            Name of the validator.
+
+        version : str
+            Version of the validator.
+
+        Returns
+        -------
+        Optional[dict]
+            Stored result, None if the revision was not validated by this validator version.
+        """
+        revision = get_validated_revision(file_info)
+        if revision is None:
+            return None
+
+        with self.__lock, self.__connect() as conn:
+            row = conn.execute(
+                "SELECT result FROM results WHERE file_id = ? AND revision = ? AND validator = ? AND version = ?",
+                (file_info["id"], revision, validator, version),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_result(self, file_info: dict[str, str], validator: str, version: str, result: dict) -> None:
+        """
+        Stores the result of the validator version on the notebook revision, replacing older results.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        validator : str
+            Name of the validator.
+
+        version : str
+            Version of the validator.
+
+        result : dict
+            Result of the validator.
+        """
+        revision = get_validated_revision(file_info)
+        if revision is None:
+            return
+
+        with self.__lock, self.__connect() as conn:
+            conn.execute("DELETE FROM results WHERE file_id = ? AND validator = ?", (file_info["id"], validator))
+            conn.execute(
+                "INSERT INTO results (file_id, revision, validator, version, result) VALUES (?, ?, ?, ?, ?)",
+                (file_info["id"], revision, validator, version, json.dumps(result)),
+            )
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection to the SQLite database, creating the tables on first use."""
+        if not self.__initialized and os.path.dirname(self.db_path):
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            if not self.__initialized:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS checkpoints "
+                    "(root_id TEXT PRIMARY KEY, page_token TEXT NOT NULL, colabs TEXT NOT NULL, folders TEXT NOT NULL)"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS results (file_id TEXT NOT NULL, revision TEXT NOT NULL, "
+                    "validator TEXT NOT NULL, version TEXT NOT NULL, result TEXT NOT NULL, "
+                    "PRIMARY KEY (file_id, revision, validator, version))"
+                )
+                self.__initialized = True
+
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+validation_store = ValidationStore()
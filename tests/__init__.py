@@ -0,0 +1,4 @@
+import os
+
+# Keep the test runs independent of the plans parsed by previous runs
+os.environ.setdefault("PARSED_PLAN_CACHE_ENABLED", "false")
@@ -0,0 +1,13 @@
+"""Fixtures shared by the test cases."""
+from unittest.mock import patch
+
+import pytest
+
+from review_services.sft_validator import OnlineSFTCodeErrors
+
+
+@pytest.fixture(autouse=True, scope="session")
+def code_error_tracker():
+    """Uses an empty code error tracker instead of fetching the spreadsheet."""
+    with patch.object(OnlineSFTCodeErrors, "res_dict", {}), patch.object(OnlineSFTCodeErrors, "is_loaded", True):
+        yield
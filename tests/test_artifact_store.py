@@ -0,0 +1,80 @@
+"""Test cases for artifact_store.py."""
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.near_duplicate import near_duplicate_validator
+from review_services.sft_validator import sft_validator
+
+FILE_INFO = {"id": "file1", "name": "File1.ipynb", "sft_type": "file", "is_stepwise": False}
+
+
+class TestNotebookArtifactStore(unittest.TestCase):
+    """Test cases for artifact_store.py"""
+
+    @patch("review_services.artifact_store.create_a_plan_from_notebook_content")
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_artifacts_are_computed_once(self, mock_download, mock_create_plan):
+        """Test that concurrent validators share a single download and parse."""
+
+        def slow_download(file_id, revision):
+            time.sleep(0.05)
+            return b"{}"
+
+        mock_download.side_effect = slow_download
+        mock_create_plan.return_value = [("markdown", "**USER_QUERY:** hello")]
+
+        store = NotebookArtifactStore()
+        store.register(FILE_INFO, 4)
+        parsed = []
+        threads = [
+            threading.Thread(target=lambda: parsed.append(store.get_parsed_colab(FILE_INFO))) for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_download.assert_called_once_with("file1", None)
+        mock_create_plan.assert_called_once()
+        self.assertEqual(len({id(parsed_colab) for parsed_colab in parsed}), 1)
+        self.assertEqual(parsed[0].get_turns()[0].blocks[0].matched_tag, "USER_QUERY:")
+
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_artifacts_are_evicted_after_last_release(self, mock_download):
+        """Test that the artifacts are evicted when the last validator releases the file."""
+        mock_download.return_value = None
+
+        store = NotebookArtifactStore()
+        store.register(FILE_INFO, 2)
+        self.assertIsNone(store.get_parsed_colab(FILE_INFO))
+
+        store.release(FILE_INFO["id"])
+        self.assertEqual(len(store), 1)
+        store.release(FILE_INFO["id"])
+        self.assertEqual(len(store), 0)
+
+    @patch("review_services.artifact_store.create_a_plan_from_notebook_content")
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_streamed_parsing_errors(self, mock_download, mock_create_plan):
+        """Test that a turn failing to parse while it is streamed fails the parsing of the colab."""
+        mock_download.return_value = b"{}"
+        # The second turn has a cell without content, it is only parsed once the first turn is validated
+        mock_create_plan.return_value = [
+            ("markdown", "TURN: 1"),
+            ("markdown", "USER_QUERY: hello"),
+            ("markdown", "TURN: 2"),
+            ("markdown", None),
+        ]
+
+        for validator in [sft_validator, near_duplicate_validator]:
+            with self.subTest(validator=validator.__name__):
+                result = validator(FILE_INFO, NotebookArtifactStore()).colab_res
+                self.assertIsNone(result["errors"])
+                self.assertEqual(result["status"], "colab parsing failed")
+
+
+if __name__ == "__main__":
+    unittest.main()
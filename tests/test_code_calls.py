@@ -0,0 +1,70 @@
+"""Test cases for code_calls.py."""
+import unittest
+
+from parsing import ColabPlanParser
+from parsing.block_parser.code_calls import UNRESOLVED, CallSite, get_call_index
+from review_services.sft_validator import RuleRegistry
+
+CODE = """import pandas as pd
+%matplotlib inline
+path = "sales.csv"
+df = pd.read_csv(
+    path,
+    skiprows=3,
+)
+for path in files:
+    pd.read_csv(path, sep=",")
+"""
+
+
+class TestCodeCalls(unittest.TestCase):
+    """Test cases for code_calls.py"""
+
+    def test_call_index(self):
+        """Test that the call sites are indexed with their literal arguments, resolving the assigned names."""
+        call_index = get_call_index(CODE)
+        self.assertTrue(call_index.is_parsed)
+        self.assertEqual(
+            call_index.find_calls("read_csv"),
+            [
+                CallSite("pd.read_csv", ("sales.csv",), {"skiprows": 3}, 4),
+                CallSite("pd.read_csv", (UNRESOLVED,), {"sep": ","}, 9),
+            ],
+        )
+        self.assertEqual(call_index.find_calls("read_csv")[0].get_arg(0, "filepath_or_buffer"), "sales.csv")
+        self.assertIsNone(call_index.find_calls("read_csv")[1].get_arg(keyword="skiprows"))
+        self.assertEqual(call_index.find_calls("read_excel"), [])
+        self.assertIs(get_call_index(CODE), call_index)
+
+    def test_fallback(self):
+        """Test the regex extraction of the calls of a code that does not parse."""
+        call_index = get_call_index("df = pd.read_csv('a.csv', skiprows=2) if\nplt.show()")
+        self.assertFalse(call_index.is_parsed)
+        self.assertEqual(
+            call_index.calls,
+            [CallSite("pd.read_csv", ("a.csv",), {"skiprows": 2}, 1), CallSite("plt.show", (), {}, 2)],
+        )
+
+    def test_code_rules(self):
+        """Test the file name and skiprows rules of the CODE blocks on the call index."""
+        plan = [
+            ("markdown", "ICE_FILE_METADATA:\nfile_name: sales.csv\nestimated_rows_above_header: 2"),
+            ("code", CODE),
+            ("code", "df = pd.read_csv('other.csv')\ndf = pd.read_csv(\n    'sales.csv', skiprows=2\n)"),
+        ]
+        turn = ColabPlanParser(plan, "file", False).turns[0]
+        self.assertEqual(turn.skip_rows_count, {"sales.csv": 2})
+
+        registry = RuleRegistry(disabled_rules=["has_code_reading_from_invalid_sources"])
+        self.assertEqual(
+            registry.validate_block(turn.blocks[1], turn),
+            [[1, 2, "[CODE:]: INCORRECT_SKIPROWS_VALUE for sales.csv (found 3, should be 2)"]],
+        )
+        self.assertEqual(
+            registry.validate_block(turn.blocks[2], turn),
+            [[1, 3, "[CODE:]: CODE_INVALID_FILE_NAME 'other.csv'"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+"""Test cases for code_snippets.py."""
+import unittest
+
+from parsing.block_parser import RTU, Thought
+from parsing.block_parser.code_snippets import join_spans, split_code_snippets
+
+
+class TestCodeSnippets(unittest.TestCase):
+    """Test cases for code_snippets.py"""
+
+    def test_split_code_snippets(self):
+        """Test that the spans split the text on its code fences."""
+        text = "Load the file\n```python\ndf = pd.read_csv('a.csv')\n```\nthen ```df.head()``` it"
+        plain_text_spans, code_snippet_spans = split_code_snippets(text)
+        parts = text.split("```")
+        self.assertEqual(join_spans(text, plain_text_spans), "".join(parts[0::2]))
+        self.assertEqual(join_spans(text, code_snippet_spans), "".join(parts[1::2]))
+        self.assertEqual(split_code_snippets("no code"), ([(0, 7)], []))
+
+    def test_blocks_are_compact(self):
+        """Test that the blocks have no instance dictionary and split their content on the code fences."""
+        thought = Thought("Agentic", 1, "THOUGHT:", "THOUGHT:", ["Load the file", "```df = load()```"])
+        thought.parse_block()
+        self.assertEqual(thought.content, ["Load the file\n", "df = load()"])
+        self.assertTrue(thought.is_file_loading_thought)
+        self.assertFalse(hasattr(thought, "__dict__"))
+
+        response = RTU("Agentic", 2, "RESPONSE_TO_USER:", "RESPONSE_TO_USER:", ["Done"])
+        response.parse_block()
+        self.assertEqual(response.content, ["Done", ""])
+        self.assertFalse(hasattr(response, "__dict__"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Test cases for colab_parser.py."""
+import json
+import os
+import unittest
+
+from parsing import ColabPlanParser
+from parsing.colab_parser import EVENTS_TAG_MATCHER
+from parsing.plan_parser_utils import tokenize_markdown_line
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "colab_parser_golden.json")
+
+
+class TestColabPlanParser(unittest.TestCase):
+    """Test cases for colab_parser.py"""
+
+    def test_golden_outputs(self):
+        """Test that the parsed blocks match the golden outputs of the corpus of plans."""
+        with open(GOLDEN_PATH, encoding="utf-8") as f:
+            cases = json.load(f)
+
+        for case in cases:
+            parser = ColabPlanParser([tuple(cell) for cell in case["plan"]], "Agentic", True)
+            turns = [
+                [
+                    [type(block).__name__, block.serial_number, block.original_tag, block.matched_tag, block.content]
+                    for block in turn.blocks
+                ]
+                for turn in parser.turns
+            ]
+            self.assertEqual(json.loads(json.dumps(turns, default=repr)), case["turns"], case["plan"])
+
+    def test_derived_attributes_are_parsed_lazily(self):
+        """Test that the metadata and the code errors are only parsed when they are first accessed."""
+        plan = [
+            ("markdown", "**ICE_FILE_METADATA:**\nfile_name: data.csv\nFILE_PATH: /content/data.csv"),
+            ("markdown", "**TOOL_OUTPUT:**\ncode_generated_text_files {\n  file_name: 'out.csv'\n}"),
+            ("markdown", "**THOUGHT:** Load the data"),
+            ("code", "df = pd.read_csv('data.csv')"),
+            ("code_output", [{"output_type": "error", "ename": "KeyError"}]),
+        ]
+        parser = ColabPlanParser(plan, "Agentic", False)
+        ice_block, tool_block, thought_block, _, code_output_block = parser.turns[0].blocks
+        self.assertIsNone(ice_block._metadata)
+        self.assertIsNone(tool_block._metadata)
+        self.assertIsNone(thought_block._is_file_loading_thought)
+        self.assertIsNone(code_output_block._has_code_error)
+        self.assertEqual(thought_block.content, ["** Load the data", ""])
+
+        self.assertEqual(parser.turns[0].datasets, {"data.csv": "/content/data.csv", "out.csv": ""})
+        self.assertIsNotNone(ice_block._metadata)
+        self.assertEqual(parser.num_code_errors, 1)
+        self.assertTrue(code_output_block._has_code_error)
+
+    def test_streamed_turns(self):
+        """Test that the streamed turns are parsed one by one and match the turns parsed at once."""
+        with open(GOLDEN_PATH, encoding="utf-8") as f:
+            cases = json.load(f)
+
+        for case in cases:
+            plan = [tuple(cell) for cell in case["plan"]]
+            parser = ColabPlanParser(plan, "Agentic", True)
+            streamed_parser = ColabPlanParser(plan, "Agentic", True, stream=True)
+            self.assertEqual(streamed_parser.turns, [])
+            streamed_turns = streamed_parser.iter_turns()
+            self.assertEqual(
+                [[(block.matched_tag, block.content) for block in turn.blocks] for turn in streamed_turns],
+                [[(block.matched_tag, block.content) for block in turn.blocks] for turn in parser.turns],
+            )
+            self.assertEqual(streamed_parser.num_code_errors, parser.num_code_errors)
+            self.assertEqual(list(streamed_parser.iter_turns()), [])
+
+        read_cells = []
+        plan = [
+            ("markdown", "**USER_QUERY:** Load the data"),
+            ("markdown", "**RESPONSE_TO_USER:** Done\n**TURN:**\nThe first turn ends here"),
+            ("markdown", "**USER_QUERY:** Plot it"),
+            ("code_output", [{"output_type": "error", "ename": "KeyError"}]),
+        ]
+        cells = (read_cells.append(cell) or cell for cell in plan)
+        streamed_parser = ColabPlanParser(cells, "Agentic", False, stream=True)
+        turns = streamed_parser.iter_turns()
+        first_turn = next(turns)
+        self.assertEqual(len(read_cells), 3)
+        self.assertEqual(first_turn.blocks[-1].content, ["** Done\nThe first turn ends here", ""])
+        self.assertEqual(streamed_parser.num_code_errors, 0)
+        self.assertEqual(next(turns).idx, 2)
+        self.assertEqual(streamed_parser.num_code_errors, 1)
+
+    def test_tokenize_markdown_line(self):
+        """Test the tags with typos, the content following them and the lines without a tag."""
+        self.assertEqual(
+            tokenize_markdown_line("**USER_QUERY:** Plot the sales", EVENTS_TAG_MATCHER),
+            ("**USER_QUERY:", "USER_QUERY:", "** Plot the sales"),
+        )
+        self.assertEqual(
+            tokenize_markdown_line("RESPONSE TO  USER   it is done", EVENTS_TAG_MATCHER),
+            ("RESPONSE TO USER", "RESPONSE_TO_USER:", "it is done"),
+        )
+        self.assertEqual(tokenize_markdown_line("THOUGT: a: b", EVENTS_TAG_MATCHER), ("THOUGT:", "THOUGHT:", " a  b:"))
+        self.assertEqual(
+            tokenize_markdown_line("one two three four five six", EVENTS_TAG_MATCHER),
+            ("one two three four five", None, ""),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
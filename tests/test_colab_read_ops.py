@@ -1,6 +1,6 @@
 """Test cases for colab_read_ops.py."""
 import unittest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 from utils import get_colabs, get_sft_and_stepwise_info
 from utils.const import FOLDERS_TO_IGNORE
@@ -102,6 +102,45 @@ class TestColabReadOps(unittest.TestCase):
 
         self.assertEqual(colabs, [])  # Expect empty list as the folder should be ignored
 
+    @patch("utils.colab_read_ops.initialize_drive_service")
+    def test_get_colabs_lists_sibling_folders_together(self, mock_initialize_drive_service):
+        """Test the get_colabs function lists sibling folders with a combined query."""
+        folder_mime_type, colab_mime_type = "application/vnd.google-apps.folder", "application/vnd.google.colab"
+        listings = {
+            "('root_folder' in parents) and trashed=false": [
+                {"id": "folder1", "name": "With_File", "mimeType": folder_mime_type, "parents": ["root_folder"]},
+                {"id": "folder2", "name": "PDF Stepwise", "mimeType": folder_mime_type, "parents": ["root_folder"]},
+                {"id": "folder3", "name": FOLDERS_TO_IGNORE[0], "mimeType": folder_mime_type},
+            ],
+            "('folder1' in parents or 'folder2' in parents) and trashed=false": [
+                {"id": "file1", "name": "File1.ipynb", "mimeType": colab_mime_type, "parents": ["folder1"]},
+                {"id": "file2", "name": "File2.ipynb", "mimeType": colab_mime_type, "parents": ["folder2"]},
+                {"id": "folder4", "name": "Stepwise", "mimeType": folder_mime_type, "parents": ["folder2"]},
+            ],
+            "('folder4' in parents) and trashed=false": [
+                {"id": "file3", "name": "File3.ipynb", "mimeType": colab_mime_type, "parents": ["folder4"]},
+            ],
+        }
+
+        mock_drive_service = mock_initialize_drive_service.return_value
+        mock_drive_service.files.return_value.get.return_value.execute.return_value = {
+            "id": "root_folder",
+            "name": "Root Folder",
+            "mimeType": folder_mime_type,
+        }
+        mock_drive_service.files.return_value.list.side_effect = lambda q, **kwargs: MagicMock(
+            execute=MagicMock(return_value={"files": listings[q]})
+        )
+
+        expected_colabs = [
+            {"id": "file1", "name": "File1.ipynb", "sft_type": "file", "is_stepwise": False},
+            {"id": "file2", "name": "File2.ipynb", "sft_type": "pdf", "is_stepwise": True},
+            {"id": "file3", "name": "File3.ipynb", "sft_type": "pdf", "is_stepwise": True},
+        ]
+        colabs = sorted(get_colabs("root_folder", "Root Folder", []), key=lambda x: x["id"])
+        self.assertEqual(colabs, expected_colabs)
+        self.assertEqual(mock_drive_service.files.return_value.list.call_count, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,52 @@
+"""Test cases for drive_auth.py."""
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from googleapiclient.http import DEFAULT_HTTP_TIMEOUT_SEC
+
+from utils.drive_auth import SCOPES, GoogleClientManager
+
+
+class TestGoogleClientManager(unittest.TestCase):
+    """Test cases for drive_auth.py"""
+
+    @patch("utils.drive_auth.pydata_google_auth.get_user_credentials")
+    def test_credentials_are_loaded_once(self, mock_get_user_credentials):
+        """Test that the credentials are loaded once and refreshed only when invalid."""
+        mock_get_user_credentials.return_value.valid = True
+        manager = GoogleClientManager(SCOPES)
+
+        manager.get_service("drive", "v3")
+        manager.get_service("sheets", "v4")
+        mock_get_user_credentials.assert_called_once()
+        mock_get_user_credentials.return_value.refresh.assert_not_called()
+
+        mock_get_user_credentials.return_value.valid = False
+        manager.get_credentials()
+        mock_get_user_credentials.return_value.refresh.assert_called_once()
+
+    @patch("utils.drive_auth.pydata_google_auth.get_user_credentials", return_value=MagicMock(valid=True))
+    def test_services_are_per_thread(self, _):
+        """Test that a thread reuses its own service and other threads get a different one."""
+        manager = GoogleClientManager(SCOPES)
+        service = manager.get_service("drive", "v3")
+        self.assertIs(manager.get_service("drive", "v3"), service)
+
+        thread_services = []
+        thread = threading.Thread(target=lambda: thread_services.append(manager.get_service("drive", "v3")))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(thread_services[0], service)
+        self.assertIsNot(thread_services[0]._http, service._http)
+
+    @patch("utils.drive_auth.pydata_google_auth.get_user_credentials", return_value=MagicMock(valid=True))
+    def test_transports_time_out(self, _):
+        """Test that the transports time out instead of blocking their thread on a hung socket."""
+        service = GoogleClientManager(SCOPES).get_service("drive", "v3")
+        self.assertEqual(service._http.http.timeout, DEFAULT_HTTP_TIMEOUT_SEC)
+
+
+if __name__ == "__main__":
+    unittest.main()
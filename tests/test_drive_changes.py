@@ -0,0 +1,57 @@
+"""Test cases for drive_changes.py."""
+import unittest
+
+from utils import apply_changes
+from utils.const import FOLDER_MIME_TYPE
+
+FOLDERS = {
+    "root_folder": {"id": "root_folder", "name": "Root Folder", "sft_type": "other"},
+    "folder1": {"id": "folder1", "name": "PDF Stepwise", "sft_type": "pdf"},
+}
+COLABS = {
+    "file1": {"id": "file1", "name": "File1.ipynb", "sft_type": "pdf", "is_stepwise": True, "md5Checksum": "a"},
+    "file2": {"id": "file2", "name": "File2.ipynb", "sft_type": "other", "is_stepwise": False, "md5Checksum": "b"},
+}
+
+
+def change(file_id: str, name: str, parent: str, mime_type: str = "application/vnd.google.colab", **fields) -> dict:
+    """Build a Drive change of a file."""
+    return {"fileId": file_id, "file": {"name": name, "mimeType": mime_type, "parents": [parent]} | fields}
+
+
+class TestDriveChanges(unittest.TestCase):
+    """Test cases for drive_changes.py"""
+
+    def test_apply_changes_updates_colabs(self):
+        """Test that changed, new and removed colabs are applied to the previous listing."""
+        changes = [
+            change("file1", "File1.ipynb", "folder1", md5Checksum="c"),
+            {"fileId": "file2", "removed": True},
+            change("file3", "File3.ipynb", "root_folder"),
+            change("file4", "TODO File4.ipynb", "root_folder"),
+            change("file5", "Other.ipynb", "elsewhere"),
+        ]
+
+        self.assertEqual(
+            apply_changes(COLABS, FOLDERS, changes),
+            {
+                "file1": COLABS["file1"] | {"md5Checksum": "c"},
+                "file3": {"id": "file3", "name": "File3.ipynb", "sft_type": "other", "is_stepwise": False},
+            },
+        )
+        self.assertIn("file2", COLABS)  # The previous listing is left untouched
+
+    def test_apply_changes_requires_listing_on_folder_changes(self):
+        """Test that a change to a listed folder, or a new folder inside one, requires a new listing."""
+        renamed_folder = change("folder1", "PDF", "root_folder", FOLDER_MIME_TYPE)
+        new_folder = change("folder2", "New", "folder1", FOLDER_MIME_TYPE)
+        other_folder = change("folder3", "Other", "elsewhere", FOLDER_MIME_TYPE)
+
+        self.assertIsNone(apply_changes(COLABS, FOLDERS, [renamed_folder]))
+        self.assertIsNone(apply_changes(COLABS, FOLDERS, [new_folder]))
+        self.assertEqual(apply_changes(COLABS, FOLDERS, [other_folder]), COLABS)
+        self.assertIsNone(apply_changes(COLABS, {}, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
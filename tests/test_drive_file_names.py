@@ -0,0 +1,138 @@
+"""Test cases for drive_file_names.py."""
+import threading
+import time
+import unittest
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+from googleapiclient.errors import HttpError
+
+from utils.drive_file_names import MAX_BATCH_SIZE, DriveFileNameResolver, get_file_id_from_link
+
+
+def mock_batch_drive_service(names: dict[str, str], errors: Optional[dict[str, HttpError]] = None) -> MagicMock:
+    """Build a Drive service mock whose batch requests answer with the given names, or the given errors."""
+    errors = errors or {}
+    drive_service = MagicMock()
+    drive_service.files.return_value.get.side_effect = lambda fileId, fields: fileId
+
+    def new_batch_http_request(callback):
+        file_ids = []
+        batch = MagicMock()
+        batch.add.side_effect = lambda request, request_id: file_ids.append(request_id)
+
+        def execute():
+            for file_id in file_ids:
+                if file_id in names:
+                    callback(file_id, {"name": names[file_id]}, None)
+                elif file_id in errors:
+                    callback(file_id, None, errors[file_id])
+                else:
+                    callback(file_id, None, HttpError(MagicMock(status=404), b"File not found"))
+
+        batch.execute.side_effect = execute
+        return batch
+
+    drive_service.new_batch_http_request.side_effect = new_batch_http_request
+    return drive_service
+
+
+class TestDriveFileNameResolver(unittest.TestCase):
+    """Test cases for drive_file_names.py"""
+
+    def test_get_file_id_from_link(self):
+        """Test the get_file_id_from_link function."""
+        self.assertEqual(get_file_id_from_link("https://drive.google.com/file/d/1a-B_2/view?usp=sharing"), "1a-B_2")
+        self.assertIsNone(get_file_id_from_link("https://drive.google.com/drive/folders"))
+
+    @patch("utils.drive_file_names.initialize_drive_service")
+    def test_names_are_fetched_in_batches_and_memoized(self, mock_initialize_drive_service):
+        """Test that the names are fetched with batch requests and looked up only once."""
+        names = {f"file{i}": f"File{i}.csv" for i in range(MAX_BATCH_SIZE + 1)}
+        drive_service = mock_initialize_drive_service.return_value = mock_batch_drive_service(names)
+        resolver = DriveFileNameResolver()
+
+        resolver.resolve(list(names) + ["missing", "file0"])
+        self.assertEqual(drive_service.new_batch_http_request.call_count, 2)
+
+        self.assertEqual(resolver.get_name("file0"), "File0.csv")
+        self.assertEqual(resolver.get_name(f"file{MAX_BATCH_SIZE}"), f"File{MAX_BATCH_SIZE}.csv")
+        self.assertIsNone(resolver.get_name("missing"))
+        self.assertEqual(drive_service.new_batch_http_request.call_count, 2)
+
+    @patch("utils.drive_file_names.initialize_drive_service")
+    def test_concurrent_lookups_share_batches(self, mock_initialize_drive_service):
+        """Test that the file IDs of the notebooks validated at the same time are fetched with a shared batch."""
+        drive_service = mock_initialize_drive_service.return_value = mock_batch_drive_service({})
+        new_batch_http_request = drive_service.new_batch_http_request.side_effect
+        batch_file_ids, first_batch_started, release_first_batch = [], threading.Event(), threading.Event()
+
+        def new_blocking_batch_http_request(callback):
+            """Records the file IDs of every batch, the first batch waits for the other lookups."""
+            batch = new_batch_http_request(callback)
+            execute, is_first_batch = batch.execute.side_effect, not batch_file_ids
+            file_ids = []
+            batch_file_ids.append(file_ids)
+
+            def blocking_execute():
+                file_ids.extend(call.kwargs["request_id"] for call in batch.add.call_args_list)
+                if is_first_batch:
+                    first_batch_started.set()
+                    release_first_batch.wait(timeout=5)
+                execute()
+
+            batch.execute.side_effect = blocking_execute
+            return batch
+
+        drive_service.new_batch_http_request.side_effect = new_blocking_batch_http_request
+        resolver = DriveFileNameResolver()
+
+        # The file IDs referenced by the turns of three notebooks
+        threads = [threading.Thread(target=resolver.resolve, args=(["notebook1_file1"],))]
+        threads[0].start()
+        first_batch_started.wait(timeout=5)
+        for file_ids in [["notebook2_file1", "notebook2_file2"], ["notebook3_file1", "notebook1_file1"]]:
+            threads.append(threading.Thread(target=resolver.resolve, args=(file_ids,)))
+            threads[-1].start()
+        time.sleep(0.1)
+        release_first_batch.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            batch_file_ids, [["notebook1_file1"], ["notebook2_file1", "notebook2_file2", "notebook3_file1"]]
+        )
+        self.assertIsNone(resolver.get_name("notebook3_file1"))
+        self.assertEqual(drive_service.new_batch_http_request.call_count, 2)
+
+    @patch("utils.drive_file_names.initialize_drive_service")
+    def test_transient_errors_are_not_memoized(self, mock_initialize_drive_service):
+        """Test that a file whose lookup failed is fetched again on the next use."""
+        mock_initialize_drive_service.side_effect = [Exception("Connection reset"), mock_batch_drive_service({})]
+        resolver = DriveFileNameResolver()
+
+        self.assertIsNone(resolver.get_name("file1"))
+        self.assertIsNone(resolver.get_name("file1"))
+        self.assertEqual(mock_initialize_drive_service.call_count, 2)
+
+    @patch("utils.drive_file_names.initialize_drive_service")
+    def test_forbidden_files_are_memoized(self, mock_initialize_drive_service):
+        """Test that the files that are not shared are memoized, unlike the rate limited lookups."""
+        rate_limit = b'{"error": {"code": 403, "errors": [{"reason": "userRateLimitExceeded"}], "message": "Slow"}}'
+        forbidden = b'{"error": {"code": 403, "errors": [{"reason": "forbidden"}], "message": "No access"}}'
+        errors = {
+            "forbidden": HttpError(MagicMock(status=403), forbidden),
+            "rate_limited": HttpError(MagicMock(status=403), rate_limit),
+        }
+        drive_service = mock_initialize_drive_service.return_value = mock_batch_drive_service({}, errors)
+        resolver = DriveFileNameResolver()
+
+        resolver.resolve(["forbidden", "rate_limited"])
+        self.assertIsNone(resolver.get_name("forbidden"))
+        self.assertEqual(drive_service.new_batch_http_request.call_count, 1)
+        self.assertIsNone(resolver.get_name("rate_limited"))
+        self.assertEqual(drive_service.new_batch_http_request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
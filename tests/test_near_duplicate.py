@@ -0,0 +1,168 @@
+"""Test cases for the near-duplicate detection."""
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.near_duplicate import MinHasher, SignatureStore, get_shingles, near_duplicate_validator
+from review_services.services_runner import ServicesRunner
+from review_services.validation_store import ValidationStore
+from utils import Status
+
+STEPS = [
+    "Load the monthly sales of the {product} stores from the csv file",
+    "Group the sales by month and by region to compare the regions",
+    "Plot the total sales of every month as a line chart with altair",
+    "The sales of the {product} stores grow faster in the north than in the south",
+    "Compute the growth rate of every region between january and december",
+    "The northern stores double their sales over the year while the southern ones stay flat",
+]
+
+
+def build_notebook(product: str, num_turns: int = 4) -> bytes:
+    """Builds the raw content of a notebook on the sales of a product."""
+    cells = []
+    for turn in range(num_turns):
+        cells.append({"cell_type": "markdown", "metadata": {}, "source": f"**TURN:** {turn + 1}"})
+        for tag, step in zip(["USER_QUERY", "THOUGHT", "RESPONSE_TO_USER"], STEPS[turn % 2 :: 2]):
+            text = f"**{tag}:** {step.format(product=product)} in turn {turn + 1}"
+            cells.append({"cell_type": "markdown", "metadata": {}, "source": text})
+    return json.dumps({"nbformat": 4, "nbformat_minor": 0, "metadata": {}, "cells": cells}).encode()
+
+
+class TestNearDuplicate(unittest.TestCase):
+    """Test cases for the near-duplicate detection"""
+
+    def test_signature_similarity(self):
+        """Test that the signatures estimate the Jaccard similarity of the shingles."""
+        self.assertEqual(
+            get_shingles("Load the file, then plot it!", size=3),
+            {"load the file", "the file then", "file then plot", "then plot it"},
+        )
+        self.assertEqual(get_shingles("Load it", size=3), {"load it"})
+        self.assertEqual(get_shingles(" ... "), set())
+
+        words = [f"word{i}" for i in range(400)]
+        edited_words = [f"edit{i}" if i % 50 == 0 else word for i, word in enumerate(words)]
+        shingles, edited_shingles = get_shingles(" ".join(words)), get_shingles(" ".join(edited_words))
+        jaccard = len(shingles & edited_shingles) / len(shingles | edited_shingles)
+
+        min_hasher = MinHasher()
+        signature, edited_signature = min_hasher.get_signature(shingles), min_hasher.get_signature(edited_shingles)
+        self.assertAlmostEqual(min_hasher.get_similarity(signature, edited_signature), jaccard, delta=0.1)
+        self.assertEqual(len(min_hasher.get_band_keys(signature)), min_hasher.num_bands)
+        with self.assertRaises(ValueError):
+            MinHasher(num_perm=100, num_bands=16)
+
+    def test_near_duplicates_are_found(self):
+        """Test that the notebooks are compared against the signatures of the previously validated ones."""
+        notebooks = {
+            "original": build_notebook("coffee"),
+            "copy": build_notebook("coffee").replace(b"turn 4", b"the last turn"),
+            "other": build_notebook("tea", num_turns=1),
+        }
+        artifact_store = NotebookArtifactStore()
+
+        def validate(file_id: str) -> dict:
+            """Runs the near-duplicate detection on a notebook."""
+            file_info = {"id": file_id, "name": f"{file_id}.ipynb", "sft_type": "other", "is_stepwise": False}
+            artifact_store.set_raw_content(file_info, notebooks[file_id])
+            return near_duplicate_validator(file_info, artifact_store).colab_res
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SignatureStore(os.path.join(tmp_dir, "near_duplicates.sqlite3"))
+            with patch("review_services.near_duplicate.near_duplicate_runner.signature_store", store):
+                self.assertEqual(validate("original")["status"], Status.PASSED)
+                self.assertEqual(validate("other")["status"], Status.PASSED)
+
+                result = validate("copy")
+                self.assertEqual(result["status"], Status.FAILED)
+                self.assertEqual(len(result["errors"]), 1)
+                self.assertIn("similar to 'original.ipynb'", result["errors"][0][2])
+
+                # Validating a notebook again does not compare it with its own signature
+                self.assertEqual(validate("original")["errors"][0][2].count("copy.ipynb"), 1)
+                self.assertEqual(len(store), 3)
+
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_incremental_runs_compare_every_colab(self, mock_download):
+        """Test that the incremental runs flag both copies and forget the colabs missing from the listing."""
+        notebooks = {
+            "original": build_notebook("coffee"),
+            "copy": build_notebook("coffee").replace(b"turn 4", b"the last turn"),
+            "other": build_notebook("tea", num_turns=1),
+        }
+        mock_download.side_effect = lambda file_id, revision: notebooks[file_id]
+        colabs = [
+            {"id": file_id, "name": f"{file_id}.ipynb", "sft_type": "other", "is_stepwise": False, "md5Checksum": "a"}
+            for file_id in ["original", "other"]
+        ]
+        # The copy is added to the folder and the other colab is deleted after the first run
+        changes = [
+            {"fileId": "copy", "file": colabs[0] | {"id": "copy", "name": "copy.ipynb", "parents": ["root_folder"]}},
+            {"fileId": "other", "removed": True},
+        ]
+
+        def iter_colabs(folder_id, folder_name, visited_folders):
+            visited_folders["root_folder"] = {"id": "root_folder", "name": "Root Folder", "sft_type": "other"}
+            yield from colabs
+
+        def format_results(runner, results: list[dict]) -> pd.DataFrame:
+            """Keeps the raw results of the run, with the status of every colab."""
+            return pd.DataFrame({"Colab Name": [result["colab_name"] for result in results]}).assign(
+                Status=[result["status"] for result in results]
+            )
+
+        def run() -> dict[str, str]:
+            """Runs the near-duplicate detection incrementally, returning the status of every colab."""
+            runner = ServicesRunner("root_folder", ["Near-Duplicate Detection"], incremental=True)
+            with patch.object(ServicesRunner, "_ServicesRunner__format_results", format_results):
+                results_df, _ = runner.run_services(MagicMock(), MagicMock())
+            return dict(zip(results_df["Colab Name"], results_df["Status"]))
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SignatureStore(os.path.join(tmp_dir, "near_duplicates.sqlite3"))
+            with patch("review_services.near_duplicate.near_duplicate_runner.signature_store", store), patch(
+                "review_services.services_runner.signature_store", store
+            ), patch(
+                "review_services.services_runner.validation_store",
+                ValidationStore(os.path.join(tmp_dir, "validation.sqlite3")),
+            ), patch(
+                "review_services.services_runner.iter_colabs", side_effect=iter_colabs
+            ), patch(
+                "review_services.services_runner.get_start_page_token", side_effect=["token1", "token2"]
+            ), patch(
+                "review_services.services_runner.list_changes", return_value=changes
+            ):
+                self.assertEqual(run(), {"original.ipynb": Status.PASSED, "other.ipynb": Status.PASSED})
+                self.assertEqual(len(store), 2)
+
+                # The original is validated again, and the pair found by the copy added since is reported on both
+                self.assertEqual(run(), {"original.ipynb": Status.FAILED, "copy.ipynb": Status.FAILED})
+                self.assertEqual(mock_download.call_count, 4)
+                self.assertEqual(len(store), 2)
+
+    def test_signatures_are_pruned(self):
+        """Test that only the signatures of the colabs missing from every listing of their folders are dropped."""
+        min_hasher = MinHasher()
+        signature = min_hasher.get_signature(get_shingles(build_notebook("coffee").decode()))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            store = SignatureStore(os.path.join(tmp_dir, "near_duplicates.sqlite3"))
+            for file_id in ["file1", "file2", "file3"]:
+                store.add({"id": file_id, "name": f"{file_id}.ipynb"}, signature, min_hasher.get_band_keys(signature))
+
+            self.assertEqual(store.prune("folder1", {"file1", "file2"}), 0)
+            self.assertEqual(store.prune("folder2", {"file2"}), 0)
+            # The second colab is still listed in the other folder
+            self.assertEqual(store.prune("folder1", set()), 1)
+            self.assertEqual(len(store), 2)
+            self.assertEqual(store.prune("folder2", set()), 1)
+            self.assertEqual(len(store), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
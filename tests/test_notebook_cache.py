@@ -0,0 +1,60 @@
+"""Test cases for notebook_cache.py."""
+import tempfile
+import unittest
+
+from utils.notebook_cache import NotebookDiskCache, get_revision_key
+
+
+class TestNotebookDiskCache(unittest.TestCase):
+    """Test cases for notebook_cache.py"""
+
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = NotebookDiskCache(self.tmp_dir.name, max_bytes=10**6)
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        self.tmp_dir.cleanup()
+
+    def test_get_revision_key(self):
+        """Test the get_revision_key function."""
+        self.assertEqual(
+            get_revision_key({"id": "a", "md5Checksum": "abc", "modifiedTime": "2024-12-01T00:00:00Z"}),
+            "abc:2024-12-01T00:00:00Z",
+        )
+        self.assertIsNone(get_revision_key({"id": "a", "name": "A.ipynb"}))
+
+    def test_get_returns_cached_revision(self):
+        """Test that only the stored revision of a notebook is served."""
+        self.cache.put("file1", "rev1", b'{"cells": []}')
+
+        self.assertEqual(self.cache.get("file1", "rev1"), b'{"cells": []}')
+        self.assertIsNone(self.cache.get("file1", "rev2"))
+        self.assertIsNone(self.cache.get("file2", "rev1"))
+
+    def test_put_replaces_older_revision(self):
+        """Test that storing a new revision drops the older revision of the notebook."""
+        self.cache.put("file1", "rev1", b"old")
+        self.cache.put("file1", "rev2", b"new")
+
+        self.assertIsNone(self.cache.get("file1", "rev1"))
+        self.assertEqual(self.cache.get("file1", "rev2"), b"new")
+        self.assertEqual(self.cache.prune(), 1)  # The unreferenced "old" blob
+        self.assertEqual(self.cache.stats()["blobs"], 1)
+
+    def test_prune_evicts_least_recently_used(self):
+        """Test that pruning evicts the least recently used notebooks first."""
+        for file_id in ["file1", "file2", "file3"]:
+            self.cache.put(file_id, "rev", file_id.encode() * 100)
+        self.cache.get("file1", "rev")
+
+        self.cache.prune(self.cache.stats()["total_bytes"] - 1)
+
+        self.assertIsNone(self.cache.get("file2", "rev"))
+        self.assertIsNotNone(self.cache.get("file1", "rev"))
+        self.assertIsNotNone(self.cache.get("file3", "rev"))
+
+
+if __name__ == "__main__":
+    unittest.main()
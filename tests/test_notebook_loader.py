@@ -0,0 +1,93 @@
+"""Test cases for notebook_loader.py."""
+import json
+import unittest
+
+from parsing import ColabPlanParser
+from parsing.colab_to_plan import create_a_plan_from_notebook_content
+from parsing.notebook_loader import load_notebook_cells
+
+NOTEBOOK = {
+    "nbformat": 4,
+    "nbformat_minor": 0,
+    "metadata": {},
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": ["**USER_QUERY:** Plot the sales\n", "by month"]},
+        {
+            "cell_type": "code",
+            "metadata": {},
+            "execution_count": 1,
+            "source": ["import pandas as pd\n", "df = pd.read_csv('sales.csv')"],
+            "outputs": [
+                {
+                    "output_type": "error",
+                    "ename": "FileNotFoundError",
+                    "evalue": "sales.csv",
+                    "traceback": ["FileNotFoundError: sales.csv"],
+                }
+            ],
+        },
+    ],
+}
+
+
+class TestNotebookLoader(unittest.TestCase):
+    """Test cases for notebook_loader.py"""
+
+    def test_fast_and_strict_loading_match(self):
+        """Test that the fast path loads the same cells as nbformat."""
+        content = json.dumps(NOTEBOOK).encode()
+        fast_cells = load_notebook_cells(content)
+        strict_cells = load_notebook_cells(content, strict=True)
+
+        self.assertEqual([cell["source"] for cell in fast_cells], [cell["source"] for cell in strict_cells])
+        self.assertEqual(fast_cells[0]["source"], "**USER_QUERY:** Plot the sales\nby month")
+        self.assertEqual(fast_cells[1]["outputs"], strict_cells[1]["outputs"])
+
+    def test_fast_and_strict_outputs_match(self):
+        """Test that the fast path joins the multiline stream and display outputs like nbformat."""
+        notebook = json.loads(json.dumps(NOTEBOOK))
+        notebook["cells"][1]["outputs"] = [
+            {"output_type": "stream", "name": "stdout", "text": ["month  sales\n", "1      10\n"]},
+            {
+                "output_type": "display_data",
+                "metadata": {},
+                "data": {"text/plain": ["<Figure>\n", "size 640x480"], "application/json": ["a", "b"]},
+            },
+            {
+                "output_type": "execute_result",
+                "execution_count": 1,
+                "metadata": {},
+                "data": {"text/html": ["<table>\n", "</table>"], "text/plain": "   sales"},
+            },
+        ]
+        content = json.dumps(notebook).encode()
+        fast_outputs = load_notebook_cells(content)[1]["outputs"]
+        strict_outputs = load_notebook_cells(content, strict=True)[1]["outputs"]
+
+        self.assertEqual(fast_outputs, strict_outputs)
+        self.assertEqual(fast_outputs[0]["text"], "month  sales\n1      10\n")
+        self.assertEqual(fast_outputs[1]["data"]["text/plain"], "<Figure>\nsize 640x480")
+        self.assertEqual(fast_outputs[1]["data"]["application/json"], ["a", "b"])
+
+    def test_older_notebooks_fall_back_to_nbformat(self):
+        """Test that a notebook in nbformat version 3 is converted by nbformat."""
+        notebook = {
+            "nbformat": 3,
+            "nbformat_minor": 0,
+            "metadata": {},
+            "worksheets": [{"cells": [{"cell_type": "markdown", "metadata": {}, "source": ["**THOUGHT:** Hi"]}]}],
+        }
+        cells = load_notebook_cells(json.dumps(notebook).encode())
+        self.assertEqual(cells[0]["source"], "**THOUGHT:** Hi")
+
+    def test_structured_outputs_are_parsed(self):
+        """Test that the code outputs reach CODE_OUTPUT without being serialized."""
+        plan = create_a_plan_from_notebook_content(json.dumps(NOTEBOOK).encode(), "file1")
+        self.assertEqual(plan[2], ("code_output", NOTEBOOK["cells"][1]["outputs"]))
+
+        parsed_colab = ColabPlanParser(plan, "file", False)
+        self.assertEqual(parsed_colab.num_code_errors, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
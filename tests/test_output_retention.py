@@ -0,0 +1,53 @@
+"""Test cases for output_retention.py."""
+import unittest
+
+from parsing import ColabPlanParser
+from parsing.colab_to_plan import create_a_plan_from_colab_notebook
+from parsing.output_retention import OutputRetention, apply_output_retention, get_most_permissive_policy
+
+OUTPUTS = [
+    {"output_type": "stream", "name": "stdout", "text": ["Loaded ", "100 rows\n"]},
+    {
+        "output_type": "display_data",
+        "metadata": {},
+        "data": {"image/png": "iVBORw0KGgo" * 1000, "text/plain": ["<Figure size 640x480>"]},
+    },
+    {"output_type": "error", "ename": "KeyError", "evalue": "'sales'", "traceback": ["KeyError: 'sales'"]},
+]
+
+
+class TestOutputRetention(unittest.TestCase):
+    """Test cases for output_retention.py"""
+
+    def test_summary_keeps_types_errors_and_sizes(self):
+        """Test that the summary policy drops the payloads but keeps the error info and the sizes."""
+        self.assertEqual(
+            apply_output_retention(OUTPUTS, OutputRetention.SUMMARY),
+            [
+                {"output_type": "stream", "name": "stdout", "size": 16},
+                {"output_type": "display_data", "sizes": {"image/png": 11000, "text/plain": 21}},
+                {"output_type": "error", "ename": "KeyError", "evalue": "'sales'", "traceback": ["KeyError: 'sales'"]},
+            ],
+        )
+        self.assertIs(apply_output_retention(OUTPUTS, OutputRetention.FULL), OUTPUTS)
+
+    def test_get_most_permissive_policy(self):
+        """Test that the most permissive policy of the validators is selected."""
+        self.assertEqual(get_most_permissive_policy([OutputRetention.SUMMARY]), OutputRetention.SUMMARY)
+        self.assertEqual(
+            get_most_permissive_policy([OutputRetention.SUMMARY, OutputRetention.FULL]), OutputRetention.FULL
+        )
+        self.assertEqual(get_most_permissive_policy([]), OutputRetention.SUMMARY)
+
+    def test_code_errors_are_counted_from_summaries(self):
+        """Test that the code errors are still detected when only the output summaries are kept."""
+        cells = [
+            {"cell_type": "markdown", "source": "**USER_QUERY:** Plot the sales"},
+            {"cell_type": "code", "source": "df['sales'].plot()", "outputs": OUTPUTS},
+        ]
+        plan = create_a_plan_from_colab_notebook(cells, OutputRetention.SUMMARY)
+        self.assertEqual(ColabPlanParser(plan, "file", False).num_code_errors, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
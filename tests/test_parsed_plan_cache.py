@@ -0,0 +1,134 @@
+"""Test cases for parsed_plan_cache.py."""
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from parsing import ColabPlanParser
+from parsing.parsed_plan_cache import ParsedPlanCache, get_plan_key
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.sft_validator import sft_validator
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), "data", "colab_parser_golden.json")
+FILE_INFO = {"id": "file1", "name": "File1.ipynb", "sft_type": "file", "is_stepwise": False}
+NOTEBOOK = {
+    "nbformat": 4,
+    "nbformat_minor": 0,
+    "metadata": {},
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": "**ICE_FILE_METADATA:**\nfile_name: data.csv"},
+        {"cell_type": "markdown", "metadata": {}, "source": "**THOUGHT:** Load it\n```pd.read_csv('data.csv')```"},
+        {
+            "cell_type": "code",
+            "metadata": {},
+            "execution_count": 1,
+            "source": "df = pd.read_csv('data.csv')",
+            "outputs": [{"output_type": "error", "ename": "KeyError", "evalue": "'a'", "traceback": []}],
+        },
+    ],
+}
+
+
+def get_blocks(parsed_colab: ColabPlanParser) -> list:
+    """Returns the type, tags and content of every block of the parsed colab."""
+    return [
+        [type(block), block.serial_number, block.original_tag, block.matched_tag, block.content]
+        for turn in parsed_colab.turns
+        for block in turn.blocks
+    ]
+
+
+class TestParsedPlanCache(unittest.TestCase):
+    """Test cases for parsed_plan_cache.py"""
+
+    def test_cached_plans_match_the_parsed_plans(self):
+        """Test that the plans of the golden corpus are loaded from the cache as they were parsed."""
+        with open(GOLDEN_PATH, encoding="utf-8") as f:
+            cases = json.load(f)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedPlanCache(os.path.join(tmp_dir, "plans.sqlite3"))
+            for i, case in enumerate(cases):
+                parsed_colab = ColabPlanParser([tuple(cell) for cell in case["plan"]], "file", True)
+                cache.put(f"key{i}", parsed_colab)
+                cached_colab = cache.get(f"key{i}", "file", True)
+                self.assertEqual(get_blocks(cached_colab), get_blocks(parsed_colab))
+                self.assertEqual([turn.idx for turn in cached_colab.turns], [turn.idx for turn in parsed_colab.turns])
+
+            self.assertIsNone(cache.get("missing", "file", True))
+            self.assertEqual((cache.stats()["hits"], cache.stats()["misses"]), (len(cases), 1))
+
+    @patch("review_services.artifact_store.PARSED_PLAN_CACHE_ENABLED", True)
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_warm_runs_skip_parsing(self, mock_download):
+        """Test that a notebook is parsed once across runs, and again when the parser version changes."""
+        mock_download.return_value = json.dumps(NOTEBOOK).encode()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedPlanCache(os.path.join(tmp_dir, "plans.sqlite3"))
+            with patch("review_services.artifact_store.parsed_plan_cache", cache), patch(
+                "review_services.artifact_store.ColabPlanParser", wraps=ColabPlanParser
+            ) as mock_parser:
+                parsed_colab = NotebookArtifactStore().get_parsed_colab(FILE_INFO)
+                cached_colab = NotebookArtifactStore().get_parsed_colab(FILE_INFO)
+
+                self.assertEqual(mock_parser.call_count, 1)
+                self.assertEqual(get_blocks(cached_colab), get_blocks(parsed_colab))
+                self.assertEqual(cached_colab.num_code_errors, 1)
+                self.assertEqual(cached_colab.turns[0].datasets, {"data.csv": ""})
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+                with patch("parsing.parsed_plan_cache.PARSER_VERSION", "next"):
+                    self.assertNotEqual(
+                        get_plan_key(mock_download.return_value, "full", "file", False),
+                        get_plan_key(b"", "full", "file", False),
+                    )
+                    NotebookArtifactStore().get_parsed_colab(FILE_INFO)
+                self.assertEqual(mock_parser.call_count, 2)
+
+    @patch("review_services.artifact_store.PARSED_PLAN_CACHE_ENABLED", True)
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_streamed_plans_are_cached(self, mock_download):
+        """Test that the streamed turns are cached once all of them are yielded, and streamed back from the cache."""
+        mock_download.return_value = json.dumps(NOTEBOOK).encode()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedPlanCache(os.path.join(tmp_dir, "plans.sqlite3"))
+            with patch("review_services.artifact_store.parsed_plan_cache", cache):
+                store = NotebookArtifactStore()
+                expected_blocks = get_blocks(ColabPlanParser(store.get_plan(FILE_INFO), "file", False))
+
+                streamed_colab = store.get_parsed_colab(FILE_INFO, stream=True)
+                self.assertTrue(streamed_colab.is_streaming)
+                streamed_turns = streamed_colab.iter_turns()
+                next(streamed_turns)
+                self.assertEqual(cache.stats()["plans"], 0)
+                list(streamed_turns)
+                self.assertEqual(cache.stats()["plans"], 1)
+
+                cached_colab = NotebookArtifactStore().get_parsed_colab(FILE_INFO, stream=True)
+                self.assertTrue(cached_colab.is_streaming)
+                cached_turns = cached_colab.iter_turns()
+                self.assertEqual(get_blocks(ColabPlanParser.from_turns(cached_turns, "file", False)), expected_blocks)
+                self.assertEqual(cached_colab.num_code_errors, 1)
+                self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    @patch("review_services.artifact_store.PARSED_PLAN_CACHE_ENABLED", True)
+    @patch("review_services.artifact_store.download_drive_notebook")
+    def test_failed_cache_writes_are_ignored(self, mock_download):
+        """Test that a streamed colab is still validated when its plan cannot be written to the cache."""
+        mock_download.return_value = json.dumps(NOTEBOOK).encode()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = ParsedPlanCache(os.path.join(tmp_dir, "plans.sqlite3"))
+            with patch("review_services.artifact_store.parsed_plan_cache", cache), patch.object(
+                cache, "_ParsedPlanCache__put_data", side_effect=sqlite3.OperationalError("database is locked")
+            ) as mock_put_data, patch("review_services.sft_validator.sft_validator_runner.drive_file_names"):
+                result = sft_validator(FILE_INFO, NotebookArtifactStore()).colab_res
+
+        mock_put_data.assert_called_once()
+        self.assertNotEqual(result["status"], "colab parsing failed")
+        self.assertTrue(result["errors"])
+
+
+if __name__ == "__main__":
+    unittest.main()
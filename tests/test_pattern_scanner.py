@@ -0,0 +1,56 @@
+"""Test cases for pattern_scanner.py."""
+import re
+import unittest
+
+from review_services.sft_validator.pattern_scanner import PatternScanner, build_trie_regex, get_pattern_scanner
+
+PATTERNS = [
+    {"name": "URL", "patterns": [" url", "url.", "url="], "ignore_case": True},
+    {"name": "PLOT", "patterns": ["plt.show", "plt.show()"], "ignore_case": False},
+]
+
+
+class TestPatternScanner(unittest.TestCase):
+    """Test cases for pattern_scanner.py"""
+
+    def test_build_trie_regex(self):
+        """Test that the trie regex matches the longest of the literals."""
+        regex = re.compile(build_trie_regex(["url", "url.", "plt.show", "plt"]))
+        self.assertEqual(regex.match("url.").group(), "url.")
+        self.assertEqual(regex.match("url=").group(), "url")
+        self.assertEqual(regex.match("plt.show()").group(), "plt.show")
+        self.assertEqual(regex.match("plt.savefig()").group(), "plt")
+        self.assertIsNone(regex.match("pl"))
+        self.assertEqual(build_trie_regex([]), "")
+
+    def test_scan(self):
+        """Test that every hit is reported with its offset, including the overlapping ones."""
+        scanner = PatternScanner(PATTERNS)
+        self.assertEqual(
+            scanner.scan("x = URL.get() plt.show()"),
+            [("URL", 3, " URL"), ("URL", 4, "URL."), ("PLOT", 14, "plt.show"), ("PLOT", 14, "plt.show()")],
+        )
+        self.assertEqual(scanner.scan("PLT.SHOW() with no link"), [])
+        self.assertEqual(scanner.scan(""), [])
+        self.assertEqual(PatternScanner([]).scan("url="), [])
+
+    def test_scan_unicode(self):
+        """Test the offsets of the texts changing length when lowercased."""
+        self.assertEqual(PatternScanner(PATTERNS).scan("İ url=1"), [("URL", 1, " url"), ("URL", 2, "url=")])
+
+    def test_tag_scanners(self):
+        """Test that every block tag is scanned for its own forbidden patterns."""
+        self.assertEqual(
+            get_pattern_scanner("CODE:").names,
+            {"INVALID_SOURCE", "MATPLOTLIB_PLOT", "ALTAIR_CHART", "ALTAIR_DISPLAY", "ALTAIR_SAVE"},
+        )
+        self.assertEqual(get_pattern_scanner("THOUGHT:").names, {"INVALID_SOURCE"})
+        self.assertEqual(
+            get_pattern_scanner("THOUGHT:").scan("plt.show() from the URL."),
+            [("INVALID_SOURCE", 19, " URL"), ("INVALID_SOURCE", 20, "URL.")],
+        )
+        self.assertEqual(get_pattern_scanner("RESPONSE_TO_USER:").names, frozenset())
+
+
+if __name__ == "__main__":
+    unittest.main()
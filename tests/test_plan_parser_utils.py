@@ -0,0 +1,56 @@
+"""Test cases for plan_parser_utils.py."""
+import difflib
+import random
+import unittest
+
+from parsing.plan_parser_utils import TagMatcher, get_closest_match
+from utils import EVENTS_TAG_UNIQUE_COLAB, FILE_METADATA_SUB_TAGS, OPTIONAL_FILE_METADATA_SUB_TAGS
+
+
+def get_difflib_match(item: str, valid_items: list[str]) -> str:
+    """Reference implementation of the tag matching with difflib."""
+    valid_item_map = {v.lower(): v for v in valid_items}
+    if item.lower() in valid_item_map:
+        return valid_item_map[item.lower()]
+    closest_match = difflib.get_close_matches(item.lower(), list(valid_item_map.keys()), n=1, cutoff=0.8)
+    return valid_item_map[closest_match[0]] if closest_match else None
+
+
+def add_typos(item: str, rng: random.Random) -> str:
+    """Adds random deletions, insertions and substitutions to the item."""
+    chars = list(item)
+    for _ in range(rng.randint(1, 3)):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.choice(["delete", "insert", "substitute"])
+        if operation == "delete" and position < len(chars):
+            del chars[position]
+        elif operation == "insert":
+            chars.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz_:* "))
+        elif position < len(chars):
+            chars[position] = rng.choice("abcdefghijklmnopqrstuvwxyz_:* ")
+    return "".join(chars)
+
+
+class TestPlanParserUtils(unittest.TestCase):
+    """Test cases for plan_parser_utils.py"""
+
+    def test_matches_difflib(self):
+        """Test that the TagMatcher returns the same matches as difflib on tags with typos."""
+        rng = random.Random(0)
+        for valid_items in [EVENTS_TAG_UNIQUE_COLAB, FILE_METADATA_SUB_TAGS + OPTIONAL_FILE_METADATA_SUB_TAGS]:
+            matcher = TagMatcher(valid_items)
+            items = [item for valid_item in valid_items for item in [valid_item, valid_item.upper(), valid_item[:-1]]]
+            items += [add_typos(rng.choice(valid_items), rng) for _ in range(2000)]
+            items += ["", "the", "Plot the sales", "**TOOL_OUTPUT:**", "code output:"]
+            for item in items:
+                self.assertEqual(matcher.match(item), get_difflib_match(item, valid_items), item)
+
+    def test_get_closest_match(self):
+        """Test the case-insensitive match, the typo correction and the rejection of unrelated words."""
+        self.assertEqual(get_closest_match("user_query:", EVENTS_TAG_UNIQUE_COLAB), "USER_QUERY:")
+        self.assertEqual(get_closest_match("USER_QERY:", EVENTS_TAG_UNIQUE_COLAB), "USER_QUERY:")
+        self.assertIsNone(get_closest_match("Plot", EVENTS_TAG_UNIQUE_COLAB))
+
+
+if __name__ == "__main__":
+    unittest.main()
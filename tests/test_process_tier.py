@@ -0,0 +1,87 @@
+"""Test cases for process_tier.py."""
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from parsing.output_retention import OutputRetention
+from review_services.process_tier import init_process_worker, validate_notebook_content
+from review_services.services_runner import ServicesRunner
+from review_services.sft_validator import OnlineSFTCodeErrors
+from utils import Status
+
+NOTEBOOK = {
+    "nbformat": 4,
+    "nbformat_minor": 0,
+    "metadata": {},
+    "cells": [
+        {"cell_type": "markdown", "metadata": {}, "source": "**THOUGHT:** Load the data"},
+        {"cell_type": "markdown", "metadata": {}, "source": "**RESPONSE_TO_USER:** Done"},
+    ],
+}
+
+
+class TestProcessTier(unittest.TestCase):
+    """Test cases for process_tier.py"""
+
+    def test_validate_notebook_content(self):
+        """Test that the worker parses the raw content and returns the result record of the validator."""
+        file_info = {"id": "file1", "name": "File1.ipynb", "sft_type": "file", "is_stepwise": False}
+        result = validate_notebook_content(
+            "SFT Validator", file_info, json.dumps(NOTEBOOK).encode(), OutputRetention.SUMMARY
+        )
+
+        self.assertIsInstance(result, dict)
+        self.assertEqual(result["colab_name"], "File1.ipynb")
+        self.assertEqual(result["status"], Status.FAILED)
+        self.assertTrue(result["errors"])
+
+    def test_workers_use_the_tracker_of_the_runner(self):
+        """Test that the workers install the code error tracker of the runner process instead of fetching it."""
+        with patch.object(OnlineSFTCodeErrors, "res_dict", {}), patch.object(
+            OnlineSFTCodeErrors, "is_loaded", False
+        ), patch.object(OnlineSFTCodeErrors, "initialize_res_df") as mock_initialize_res_df:
+            init_process_worker({"File1.ipynb": "2"})
+            OnlineSFTCodeErrors.ensure_loaded()
+
+            mock_initialize_res_df.assert_not_called()
+            self.assertEqual(OnlineSFTCodeErrors.res_dict, {"File1.ipynb": "2"})
+
+    @patch("review_services.artifact_store.download_drive_notebook", return_value=b"raw")
+    def test_runner_hands_the_downloaded_content_to_the_process_pool(self, mock_download):
+        """Test that the runner downloads the colabs in threads and validates them in the process pool."""
+        colabs = [{"id": "file1", "name": "File1.ipynb", "sft_type": "other", "is_stepwise": False}]
+        process_pool = ThreadPoolExecutor(max_workers=1)
+        process_pool.submit = MagicMock(wraps=process_pool.submit)
+
+        def validator(file_info, artifact_store):
+            self.assertEqual(artifact_store.get_raw_content(file_info), b"raw")
+            return MagicMock(
+                colab_res={
+                    "colab_name": file_info["name"],
+                    "colab_url": f"https://colab.research.google.com/drive/{file_info['id']}",
+                    "errors": [[1, 1, "Missing **USER_QUERY:** tag"]],
+                    "status": Status.FAILED,
+                }
+            )
+
+        with patch("review_services.services_runner.iter_colabs", return_value=iter(colabs)), patch(
+            "review_services.services_runner.create_process_pool", return_value=process_pool
+        ), patch.dict(
+            "review_services.services_runner.VALIDATOR_LIST", {"Validator": validator}, clear=True
+        ), patch.dict(
+            "review_services.services_runner.PROCESS_VALIDATOR_LIST", {"Validator": validator}, clear=True
+        ), patch.dict(
+            "review_services.process_tier.PROCESS_VALIDATOR_LIST", {"Validator": validator}, clear=True
+        ):
+            runner = ServicesRunner("root_folder", ["Validator"], use_processes=True)
+            results_df, _ = runner.run_services(MagicMock(), MagicMock())
+
+        process_pool.submit.assert_called_once()
+        self.assertEqual(process_pool.submit.call_args.args[0], validate_notebook_content)
+        mock_download.assert_called_once()
+        self.assertEqual(list(results_df["Colab Name"]), ["File1.ipynb"])
+
+
+if __name__ == "__main__":
+    unittest.main()
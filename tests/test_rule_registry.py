@@ -0,0 +1,58 @@
+"""Test cases for rule_registry.py."""
+import unittest
+
+from parsing import ColabPlanParser
+from review_services.sft_validator import RuleRegistry
+from review_services.sft_validator.block_validations import CODEValidator, OtherBlockValidators, ThoughtValidators
+
+PLAN = [
+    ("markdown", "THOUGHT: Read the data from the url."),
+    ("code", "import matplotlib.pyplot as plt\nplt.show()"),
+    ("markdown", "TOOL_CODE:"),
+]
+
+
+class TestRuleRegistry(unittest.TestCase):
+    """Test cases for rule_registry.py"""
+
+    def test_dispatch_table(self):
+        """Test that the blocks are dispatched to the rules of their tag and SFT type."""
+        registry = RuleRegistry()
+        validator_class, rules = registry.get_rules("CODE:", "file")
+        self.assertIs(validator_class, CODEValidator)
+        self.assertEqual(
+            rules[:3],
+            (
+                CODEValidator.has_typo_in_tag,
+                CODEValidator.validate_content_exists,
+                CODEValidator.has_code_reading_from_invalid_sources,
+            ),
+        )
+        self.assertIs(registry.get_rules("TOOL_CODE:", "file")[0], OtherBlockValidators)
+        self.assertIs(registry.get_rules("MISSING_TAG:", "unknown")[0], OtherBlockValidators)
+
+        thought_rule = ThoughtValidators.has_thought_reading_from_invalid_sources
+        self.assertIn(thought_rule, registry.get_rules("THOUGHT:", "file")[1])
+        self.assertNotIn(thought_rule, registry.get_rules("THOUGHT:", "search")[1])
+
+    def test_validate_block(self):
+        """Test the failed checks of the blocks, with disabled rules and profiling."""
+        turn = ColabPlanParser(PLAN, "file", False).turns[0]
+        thought_block, code_block, tool_block = turn.blocks
+
+        registry = RuleRegistry()
+        self.assertEqual(registry.validate_block(thought_block, turn), [[1, 1, "[THOUGHT:]: THOUGHT_INVALID_SOURCE"]])
+        self.assertEqual(registry.validate_block(code_block, turn), [[1, 2, "[CODE:]: MATPLOTLIB_PLOT_FOUND"]])
+        self.assertEqual(registry.validate_block(tool_block, turn), [[1, 3, "[TOOL_CODE:]: MISSING_CONTENT"]])
+        self.assertEqual(registry.rule_stats(), {})
+
+        disabled_rules = ["has_matplotlib_plot", "ThoughtValidators.has_thought_reading_from_invalid_sources"]
+        registry = RuleRegistry(disabled_rules=disabled_rules, profiling=True)
+        self.assertEqual(registry.validate_block(thought_block, turn), [])
+        self.assertEqual(registry.validate_block(code_block, turn), [])
+        self.assertEqual(registry.rule_stats()["CODEValidator.has_altair_save"]["calls"], 1)
+        self.assertNotIn("CODEValidator.has_matplotlib_plot", registry.rule_stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+"""Test cases for sequence_automaton.py."""
+import unittest
+
+from parsing import Turn
+from parsing.block_parser import BaseBlock
+from review_services.sft_validator import BaseSFTSequence, SequenceAutomaton, TurnValidators, get_sequence_automaton
+
+
+def build_turn(tags: list[str], sft_type: str = "file", is_stepwise: bool = False, idx: int = 1) -> Turn:
+    """Builds a turn with a block for each tag."""
+    turn = Turn(idx=idx, sft_type=sft_type, is_stepwise=is_stepwise)
+    for serial_number, tag in enumerate(tags, start=1):
+        turn.add_block(BaseBlock(sft_type, serial_number, tag, tag, ["content"]))
+    return turn
+
+
+class TestSequenceAutomaton(unittest.TestCase):
+    """Test cases for sequence_automaton.py"""
+
+    def test_valid_sequences(self):
+        """Test that the valid sequences of the SFT types have no violation."""
+        tags = ["USER_QUERY:", "ICE_FILE_METADATA:", "ICE_FILE_METADATA:", "THOUGHT:", "CODE:", "CODE_OUTPUT:"]
+        self.assertEqual(TurnValidators(build_turn(tags + ["RESPONSE_TO_USER:"])).validate_sequence(1), [])
+        self.assertEqual(TurnValidators(build_turn(tags, "pdf", True)).validate_sequence(1), [])
+        search_turn = build_turn(["USER_QUERY:", "RESPONSE_TO_USER:"], "search")
+        self.assertEqual(TurnValidators(search_turn).validate_sequence(1), [])
+        self.assertEqual(TurnValidators(build_turn([])).validate_sequence(1), [])
+
+    def test_violations(self):
+        """Test that every violation is reported with the serial number of its block."""
+        tags = [
+            "USER_QUERY:",
+            "CODE:",
+            "TOOL_OUTPUT:",
+            "DOC_RELEVANCE_RETRIEVAL:",
+            "REWRITTEN_QUERY:",
+            "THOUGHT:",
+            "RESPONSE_TO_USER:",
+            "THOUGHT:",
+            "CODE:",
+        ]
+        turn = build_turn(tags, "file", idx=2)
+        self.assertEqual(
+            TurnValidators(turn).validate_sequence(None),
+            [
+                [2, 2, "SEQUENCE_MISMATCH: Expected 'THOUGHT:' but got 'CODE:'"],
+                [2, 2, "SEQUENCE_MISMATCH: 'CODE:' must be followed by 'CODE_OUTPUT:'"],
+                [2, 3, "SEQUENCE_MISMATCH: 'TOOL_OUTPUT:' must be preceded by 'TOOL_CODE:'"],
+                [
+                    2,
+                    4,
+                    "SEQUENCE_MISMATCH: 'DOC_RELEVANCE_RETRIEVAL:' must be followed by 'DOC_RELEVANCE_RETRIEVAL_OUT:'",
+                ],
+                [
+                    2,
+                    4,
+                    "SEQUENCE_MISMATCH: 'DOC_RELEVANCE_RETRIEVAL:' "
+                    "must be followed by 'DOC_RELEVANCE_RETRIEVAL_OUT:' and 'REWRITTEN_QUERY:'",
+                ],
+                [2, 8, "SEQUENCE_MISMATCH: 'THOUGHT:' must not come after 'RESPONSE_TO_USER:'"],
+                [2, 8, "SEQUENCE_MISMATCH: 'THOUGHT:' must be followed by 'RESPONSE_TO_USER:'"],
+                [2, 9, "SEQUENCE_MISMATCH: Expected last block to be 'RESPONSE_TO_USER:' but got 'CODE:'"],
+            ],
+        )
+
+    def test_stepwise_last_turn(self):
+        """Test the last blocks of the stepwise turns."""
+        tags = ["USER_QUERY:", "THOUGHT:", "RESPONSE_TO_USER:"]
+        self.assertEqual(TurnValidators(build_turn(tags, "no_file", True, idx=1)).validate_sequence(2), [])
+        self.assertEqual(
+            TurnValidators(build_turn(tags, "no_file", True, idx=2)).validate_sequence(2),
+            [[2, 3, "SEQUENCE_MISMATCH: Found 'RESPONSE_TO_USER:' at the end of the Stepwise SFT."]],
+        )
+        self.assertEqual(
+            TurnValidators(build_turn(tags[:2], "no_file", True)).validate_sequence(None),
+            [
+                [
+                    1,
+                    2,
+                    "SEQUENCE_MISMATCH: Expected last block to be 'RESPONSE_TO_USER: or CODE_OUTPUT:'"
+                    " but got 'THOUGHT:'",
+                ]
+            ],
+        )
+
+    def test_grammars(self):
+        """Test that the automata are compiled once, and that a new grammar needs no new branch."""
+        self.assertIs(get_sequence_automaton("file", False), get_sequence_automaton("file", False))
+
+        class ReportSFTSequence(BaseSFTSequence):
+            """Sequence of a report SFT."""
+
+            init_seq = ["USER_QUERY:", "THOUGHT:"]
+            repeating_seq = ["CODE:", "CODE_OUTPUT:"]
+
+        automaton = SequenceAutomaton(ReportSFTSequence, False)
+        turn = build_turn(["USER_QUERY:", "THOUGHT:", "CODE:", "CODE_OUTPUT:", "CODE_OUTPUT:", "RESPONSE_TO_USER:"])
+        self.assertEqual(
+            automaton.validate(turn.blocks, True), [(5, "SEQUENCE_MISMATCH: Expected 'CODE:' but got 'CODE_OUTPUT:'")]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
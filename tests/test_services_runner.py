@@ -0,0 +1,185 @@
+"""Test cases for services_runner.py."""
+import asyncio
+import tempfile
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from review_services.services_runner import ServicesRunner
+from review_services.validation_store import ValidationStore
+from utils import Status
+
+
+class TestServicesRunner(unittest.TestCase):
+    """Test cases for services_runner.py"""
+
+    def test_validation_starts_during_discovery(self):
+        """Test that the discovered colabs are validated before the folder listing ends."""
+        first_validated = threading.Event()
+        discovered_while_validating = []
+
+        def iter_colabs(folder_id, folder_name):
+            yield {"id": "file1", "name": "File1.ipynb", "sft_type": "other", "is_stepwise": False}
+            discovered_while_validating.append(first_validated.wait(timeout=5))
+            yield {"id": "file2", "name": "File2.ipynb", "sft_type": "other", "is_stepwise": False}
+
+        def validator(file_info, artifact_store=None):
+            first_validated.set()
+            return MagicMock(
+                colab_res={
+                    "colab_name": file_info["name"],
+                    "colab_url": f"https://colab.research.google.com/drive/{file_info['id']}",
+                    "errors": [[1, 1, "Missing **USER_QUERY:** tag"]],
+                    "status": Status.FAILED,
+                }
+            )
+
+        with patch("review_services.services_runner.iter_colabs", side_effect=iter_colabs), patch.dict(
+            "review_services.services_runner.VALIDATOR_LIST", {"Validator": validator}, clear=True
+        ):
+            results_df, pass_rate = ServicesRunner("root_folder", ["Validator"]).run_services(MagicMock(), MagicMock())
+
+        self.assertEqual(discovered_while_validating, [True])
+        self.assertEqual(sorted(results_df["Colab Name"]), ["File1.ipynb", "File2.ipynb"])
+        self.assertEqual(pass_rate, 0)
+
+    def test_discovery_errors_are_raised(self):
+        """Test that an error while listing the folder is raised by run_services."""
+        with patch("review_services.services_runner.iter_colabs", side_effect=ValueError("Folder not found")):
+            runner = ServicesRunner("root_folder", ["SFT Validator"])
+            with self.assertRaises(ValueError):
+                runner.run_services(MagicMock(), MagicMock())
+
+    def test_incremental_run_reuses_stored_results(self):
+        """Test that an incremental run only validates the colabs changed since the previous run."""
+        colabs = [
+            {"id": "file1", "name": "File1.ipynb", "sft_type": "other", "is_stepwise": False, "md5Checksum": "a"},
+            {"id": "file2", "name": "File2.ipynb", "sft_type": "other", "is_stepwise": False, "md5Checksum": "b"},
+        ]
+        changes = [{"fileId": "file2", "file": colabs[1] | {"parents": ["root_folder"], "md5Checksum": "c"}}]
+
+        def iter_colabs(folder_id, folder_name, visited_folders):
+            visited_folders["root_folder"] = {"id": "root_folder", "name": "Root Folder", "sft_type": "other"}
+            yield from colabs
+
+        validator = MagicMock(
+            side_effect=lambda file_info, artifact_store=None: MagicMock(
+                colab_res={
+                    "colab_name": file_info["name"],
+                    "colab_url": f"https://colab.research.google.com/drive/{file_info['id']}",
+                    "errors": [[1, 1, f"Revision {file_info['md5Checksum']}"]],
+                    "status": Status.FAILED,
+                }
+            )
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir, patch(
+            "review_services.services_runner.validation_store", ValidationStore(f"{tmp_dir}/validation.sqlite3")
+        ), patch("review_services.services_runner.iter_colabs", side_effect=iter_colabs), patch(
+            "review_services.services_runner.get_start_page_token", side_effect=["token1", "token2"]
+        ), patch(
+            "review_services.services_runner.list_changes", return_value=changes
+        ) as mock_list_changes, patch.dict(
+            "review_services.services_runner.VALIDATOR_LIST", {"Validator": validator}, clear=True
+        ), patch.dict(
+            "review_services.services_runner.VALIDATOR_VERSIONS", {"Validator": "1"}, clear=True
+        ):
+            ServicesRunner("root_folder", ["Validator"], incremental=True).run_services(MagicMock(), MagicMock())
+            self.assertEqual(validator.call_count, 2)
+
+            results_df, _ = ServicesRunner("root_folder", ["Validator"], incremental=True).run_services(
+                MagicMock(), MagicMock()
+            )
+
+        mock_list_changes.assert_called_once_with("token1")
+        self.assertEqual(validator.call_count, 3)
+        self.assertEqual(validator.call_args.args[0]["md5Checksum"], "c")
+        self.assertEqual(
+            sorted(results_df["Errors"]),
+            ["Turn 1:\n1. [Validator] Block 1: Revision a", "Turn 1:\n1. [Validator] Block 1: Revision c"],
+        )
+
+    def test_incremental_run_revalidates_transient_and_renamed_colabs(self):
+        """Test that the failed parsings and the colabs whose file information changed are validated again."""
+        colabs = [
+            {"id": "file1", "name": "File1.ipynb", "sft_type": "other", "is_stepwise": False, "md5Checksum": "a"},
+            {"id": "file2", "name": "File2.ipynb", "sft_type": "other", "is_stepwise": False, "md5Checksum": "b"},
+        ]
+        # The colab is renamed without changing its content, which makes it stepwise
+        renamed_colab = colabs[1] | {"name": "File2 Stepwise.ipynb", "is_stepwise": True}
+        changes = [{"fileId": "file2", "file": renamed_colab | {"parents": ["root_folder"]}}]
+
+        def iter_colabs(folder_id, folder_name, visited_folders):
+            visited_folders["root_folder"] = {"id": "root_folder", "name": "Root Folder", "sft_type": "other"}
+            yield from colabs
+
+        validator = MagicMock(
+            side_effect=lambda file_info, artifact_store=None: MagicMock(
+                colab_res={
+                    "colab_name": file_info["name"],
+                    "colab_url": f"https://colab.research.google.com/drive/{file_info['id']}",
+                    "errors": [[None, None, f"Stepwise {file_info['is_stepwise']}"]],
+                    "status": Status.FAILED if file_info["id"] == "file2" else "colab parsing failed",
+                }
+            )
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir, patch(
+            "review_services.services_runner.validation_store", ValidationStore(f"{tmp_dir}/validation.sqlite3")
+        ), patch("review_services.services_runner.iter_colabs", side_effect=iter_colabs), patch(
+            "review_services.services_runner.get_start_page_token", side_effect=["token1", "token2"]
+        ), patch(
+            "review_services.services_runner.list_changes", return_value=changes
+        ), patch.dict(
+            "review_services.services_runner.VALIDATOR_LIST", {"Validator": validator}, clear=True
+        ), patch.dict(
+            "review_services.services_runner.VALIDATOR_VERSIONS", {"Validator": "1"}, clear=True
+        ):
+            for _ in range(2):
+                results_df, _ = ServicesRunner("root_folder", ["Validator"], incremental=True).run_services(
+                    MagicMock(), MagicMock()
+                )
+
+        self.assertEqual(validator.call_count, 4)
+        self.assertEqual([call.args[0]["id"] for call in validator.call_args_list[2:]], ["file1", "file2"])
+        self.assertEqual(sorted(results_df["Colab Name"]), ["File1.ipynb", "File2 Stepwise.ipynb"])
+        self.assertEqual(
+            sorted(results_df["Errors"]), ["1. [Validator] Stepwise False", "1. [Validator] Stepwise True"]
+        )
+
+    @patch("review_services.services_runner.AsyncEngine.download_drive_notebook", new_callable=AsyncMock)
+    def test_async_run_validates_colabs_concurrently(self, mock_download):
+        """Test that the async run downloads each colab once and awaits its validators concurrently."""
+        colabs = [
+            {"id": f"file{i}", "name": f"File{i}.ipynb", "sft_type": "other", "is_stepwise": False} for i in range(3)
+        ]
+        mock_download.return_value = b"{}"
+        in_flight, max_in_flight = [0], [0]
+
+        async def validator(file_info, artifact_store, engine):
+            in_flight[0] += 1
+            max_in_flight[0] = max(max_in_flight[0], in_flight[0])
+            await asyncio.sleep(0.05)
+            in_flight[0] -= 1
+            return MagicMock(
+                colab_res={
+                    "colab_name": file_info["name"],
+                    "colab_url": f"https://colab.research.google.com/drive/{file_info['id']}",
+                    "errors": [[1, 1, "Missing **USER_QUERY:** tag"]],
+                    "status": Status.FAILED,
+                }
+            )
+
+        with patch("review_services.services_runner.iter_colabs", return_value=iter(colabs)), patch.dict(
+            "review_services.services_runner.VALIDATOR_LIST", {"Validator": None}, clear=True
+        ), patch.dict("review_services.services_runner.ASYNC_VALIDATOR_LIST", {"Validator": validator}, clear=True):
+            runner = ServicesRunner("root_folder", ["Validator"])
+            results_df, pass_rate = asyncio.run(runner.run_services_async(MagicMock(), MagicMock()))
+
+        self.assertEqual(mock_download.await_count, 3)
+        self.assertEqual(max_in_flight[0], 3)
+        self.assertEqual(sorted(results_df["Colab Name"]), ["File0.ipynb", "File1.ipynb", "File2.ipynb"])
+        self.assertEqual(pass_rate, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Test cases for timings.py."""
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from parsing import ColabPlanParser
+from review_services.services_runner import ServicesRunner
+from review_services.sft_validator import RuleRegistry
+from utils import Status, TimingRecorder, get_timing_recorder, iter_colabs
+
+FILE1 = {"id": "file1", "name": "File1.ipynb", "sft_type": "other", "is_stepwise": False}
+FILE2 = {"id": "file2", "name": "File2.ipynb", "sft_type": "other", "is_stepwise": False}
+
+
+class TestTimings(unittest.TestCase):
+    """Test cases for timings.py"""
+
+    def test_disabled_recorder(self):
+        """Test that a disabled recorder records nothing."""
+        recorder = TimingRecorder(enabled=False)
+        with recorder.notebook(FILE1), recorder.measure("parse"):
+            pass
+        self.assertEqual(list(recorder.iter_measured("parse", [1, 2])), [1, 2])
+        self.assertEqual(recorder.run(FILE1, "validator:Validator", sum, [1, 2]), 3)
+        self.assertEqual(recorder.export(), {"stages": {}, "notebooks": {}})
+
+    def test_measures_are_attributed_to_notebooks(self):
+        """Test that the measures of every thread are attributed to the notebook of their context."""
+        recorder = TimingRecorder(enabled=True)
+        with recorder.measure("drive_listing"):
+            pass
+
+        def validate(file_info):
+            with recorder.notebook(file_info):
+                with recorder.measure("download", cpu=False):
+                    pass
+                self.assertEqual(list(recorder.iter_measured("parse", ["turn1", "turn2"])), ["turn1", "turn2"])
+
+        threads = [threading.Thread(target=validate, args=(file_info,)) for file_info in [FILE1, FILE2]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        timings = recorder.export()
+        self.assertEqual(set(timings["stages"]), {"drive_listing", "download", "parse"})
+        self.assertEqual(timings["stages"]["download"]["calls"], 2)
+        self.assertEqual(timings["stages"]["download"]["cpu_seconds"], 0.0)
+        # The measures of the items and of the end of the iterable
+        self.assertEqual(timings["stages"]["parse"]["calls"], 6)
+        self.assertEqual(timings["notebooks"]["file1"]["name"], "File1.ipynb")
+        self.assertEqual(timings["notebooks"]["file2"]["stages"]["parse"]["calls"], 3)
+        self.assertEqual(json.loads(recorder.to_json()), timings)
+
+        # The timings recorded by a worker process are merged back in the recorder of the run
+        worker_recorder = TimingRecorder(enabled=True)
+        with worker_recorder.notebook(FILE1):
+            worker_recorder.record("rule:CODEValidator.has_altair_save", 0.5, 0.25)
+        recorder.merge(FILE1, worker_recorder.export_notebook("file1"))
+        self.assertEqual(worker_recorder.export(), {"stages": {}, "notebooks": {}})
+        rule_timings = recorder.export()["notebooks"]["file1"]["stages"]["rule:CODEValidator.has_altair_save"]
+        self.assertEqual(rule_timings, {"calls": 1, "wall_seconds": 0.5, "cpu_seconds": 0.25, "max_wall_seconds": 0.5})
+
+    def test_runs_have_their_own_recorder(self):
+        """Test that the measures go to the recorder bound to their context, and are dropped outside of a run."""
+        recorders = [TimingRecorder.for_run(True), TimingRecorder.for_run(True)]
+        self.assertFalse(TimingRecorder.for_run(False).enabled)
+
+        def run(recorder, file_info):
+            with recorder.bind():
+                with get_timing_recorder().measure("drive_listing"):
+                    pass
+                with recorder.notebook(file_info), get_timing_recorder().measure("download"):
+                    pass
+
+        threads = [threading.Thread(target=run, args=args) for args in zip(recorders, [FILE1, FILE2])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for recorder, file_id in zip(recorders, ["file1", "file2"]):
+            timings = recorder.export()
+            self.assertEqual(list(timings["notebooks"]), [file_id])
+            self.assertEqual(timings["stages"]["drive_listing"]["calls"], 1)
+            self.assertEqual(timings["stages"]["download"]["calls"], 1)
+
+        self.assertFalse(get_timing_recorder().enabled)
+        with get_timing_recorder().measure("download"):
+            pass
+        get_timing_recorder().record("download", 0.5)
+        self.assertEqual(get_timing_recorder().export(), {"stages": {}, "notebooks": {}})
+
+    @patch("utils.colab_read_ops.initialize_drive_service")
+    def test_folder_listings_are_timed(self, mock_initialize_drive_service):
+        """Test that the listings of the subfolders, run by the listing threads, are recorded by the run."""
+        drive_files = mock_initialize_drive_service.return_value.files.return_value
+        drive_files.get.return_value.execute.return_value = {
+            "id": "root_folder",
+            "name": "Root Folder",
+            "mimeType": "application/vnd.google-apps.folder",
+        }
+        drive_files.list.return_value.execute.side_effect = [
+            {"files": [{"id": "folder1", "name": "Subfolder1", "mimeType": "application/vnd.google-apps.folder"}]},
+            {"files": [{"id": "file1", "name": "File1.ipynb", "mimeType": "application/vnd.google.colab"}]},
+        ]
+
+        recorder = TimingRecorder.for_run(True)
+        with recorder.bind():
+            self.assertEqual([colab["id"] for colab in iter_colabs("root_folder", "Root Folder")], ["file1"])
+        self.assertEqual(recorder.export()["stages"]["drive_listing"]["calls"], 2)
+
+    def test_rules_and_validators_are_timed(self):
+        """Test that the runs record the timings of their validators and of the rules of the notebooks."""
+        recorder = TimingRecorder(enabled=True)
+        turn = ColabPlanParser([("markdown", "THOUGHT: Read the data from the url.")], "file", False).turns[0]
+        with recorder.notebook(FILE1):
+            RuleRegistry().validate_block(turn.blocks[0], turn)
+        stages = recorder.export()["notebooks"]["file1"]["stages"]
+        self.assertEqual(stages["rule:ThoughtValidators.has_thought_reading_from_invalid_sources"]["calls"], 1)
+
+        def validator(file_info, artifact_store=None):
+            return MagicMock(
+                colab_res={
+                    "colab_name": file_info["name"],
+                    "colab_url": f"https://colab.research.google.com/drive/{file_info['id']}",
+                    "errors": [[1, 1, "Missing **USER_QUERY:** tag"]],
+                    "status": Status.FAILED,
+                }
+            )
+
+        with patch(
+            "review_services.services_runner.iter_colabs", side_effect=lambda *args: iter([FILE1, FILE2])
+        ), patch.dict("review_services.services_runner.VALIDATOR_LIST", {"Validator": validator}, clear=True):
+            runner = ServicesRunner("root_folder", ["Validator"])
+            runner.run_services(MagicMock(), MagicMock())
+            self.assertIsNone(runner.timings)
+
+            runner = ServicesRunner("root_folder", ["Validator"], record_timings=True)
+            runner.run_services(MagicMock(), MagicMock())
+
+        self.assertEqual(runner.timings["stages"]["validator:Validator"]["calls"], 2)
+        self.assertEqual(set(runner.timings["notebooks"]), {"file1", "file2"})
+
+
+if __name__ == "__main__":
+    unittest.main()
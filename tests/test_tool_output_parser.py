@@ -0,0 +1,55 @@
+"""Test cases for tool_output_parser.py."""
+import unittest
+
+from parsing.block_parser import ToolOutput
+from parsing.tool_output_parser import ToolOutputParseError, parse_tool_output
+from parsing.turn import Turn
+
+TOOL_OUTPUT = [
+    "**",
+    "code_generated_text_files {",
+    "  file_name: 'sales.csv'",
+    "  file_attachment {",
+    "    serving_url: 'https://storage.googleapis.com/bucket/sales.csv'",
+    "    file_source: FILE_SOURCE_TOOL_GENERATED",
+    "    file_type: FILE_TYPE_TEXT",
+    "  }",
+    "}",
+]
+
+
+class TestToolOutputParser(unittest.TestCase):
+    """Test cases for tool_output_parser.py"""
+
+    def test_parse_tool_output(self):
+        """Test the nested messages, the scalar values, the lists and the tolerated separators."""
+        self.assertEqual(
+            parse_tool_output("a { b: 'x' \"y\", c: -1; d: 2.5 e: true f: [1, 'z'] g: ENUM_VALUE } h: {i: 'it\\'s'}"),
+            {"a": {"b": "xy", "c": -1, "d": 2.5, "e": True, "f": [1, "z"], "g": "ENUM_VALUE"}, "h": {"i": "it's"}},
+        )
+
+    def test_parse_errors_have_positions_and_partial_results(self):
+        """Test that the parse errors report their position and keep the fields parsed before them."""
+        with self.assertRaises(ToolOutputParseError) as context:
+            parse_tool_output("a: 1\nb {\n  c: 'x'\n  d 2\n}")
+        self.assertEqual((context.exception.line, context.exception.column), (4, 5))
+        self.assertEqual(context.exception.partial_result, {"a": 1, "b": {"c": "x"}})
+
+        with self.assertRaises(ToolOutputParseError) as context:
+            parse_tool_output("a: 'x")
+        self.assertIn("Unterminated string at line 1, column 4", str(context.exception))
+
+    def test_tool_output_block_datasets(self):
+        """Test that the datasets are extracted from the TOOL_OUTPUT block, even after a parse error."""
+        for content in [TOOL_OUTPUT, TOOL_OUTPUT + ["trailing {"]]:
+            block = ToolOutput("Agentic", 1, "TOOL_OUTPUT:", "TOOL_OUTPUT:", content)
+            turn = Turn(idx=1, sft_type="Agentic", is_stepwise=False)
+            turn.add_block(block)
+            turn.parse_blocks()
+            turn.parse_datasets()
+            self.assertEqual(turn.datasets, {"sales.csv": "https://storage.googleapis.com/bucket/sales.csv"})
+            self.assertEqual(block.parse_error is not None, content is not TOOL_OUTPUT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Test cases for validation_mode.py."""
+import json
+import unittest
+from unittest.mock import patch
+
+from parsing import ColabPlanParser
+from review_services.artifact_store import NotebookArtifactStore
+from review_services.sft_validator import RuleRegistry, ValidationMode, sft_validator
+from review_services.sft_validator.block_validations import CODEValidator, Severity
+
+TURN_CELLS = [
+    ("markdown", "USER_QUERY: Plot the monthly sales of {i}"),
+    ("markdown", "ICE_FILE_METADATA:\nfile_name: sales_{i}.csv\nFILE_PATH: https://drive.google.com/file/d/id{i}/view"),
+    ("markdown", "THOUGHT: Load the file to look at the sales."),
+    ("code", "import pandas as pd\ndf = pd.read_csv('sales_{i}.csv')\nplt.show()"),
+    ("markdown", "RESPONSE_TO_USER:"),
+]
+FILE_INFO = {"id": "file1", "name": "File1.ipynb", "sft_type": "file", "is_stepwise": False}
+
+
+def build_notebook(num_turns: int) -> bytes:
+    """Builds the raw content of a notebook whose turns all have errors."""
+    cells = []
+    for i in range(num_turns):
+        cells.append({"cell_type": "markdown", "metadata": {}, "source": f"TURN: {i + 1}"})
+        for cell_type, source in TURN_CELLS:
+            cell = {"cell_type": cell_type, "metadata": {}, "source": source.format(i=i)}
+            if cell_type == "code":
+                cell.update({"execution_count": 1, "outputs": []})
+            cells.append(cell)
+    return json.dumps({"nbformat": 4, "nbformat_minor": 0, "metadata": {}, "cells": cells}).encode()
+
+
+class TestValidationMode(unittest.TestCase):
+    """Test cases for validation_mode.py"""
+
+    def test_parse(self):
+        """Test that the modes are parsed from their options and formatted back."""
+        self.assertTrue(ValidationMode.parse(None).is_full)
+        self.assertTrue(ValidationMode.parse("full").is_full)
+        self.assertEqual(ValidationMode.parse("first_failure").error_budget, 1)
+
+        mode = ValidationMode.parse("severity >= high, max_errors=5")
+        self.assertEqual(mode, ValidationMode(max_errors=5, min_severity=Severity.HIGH))
+        self.assertEqual(mode.error_budget, 5)
+        self.assertEqual(ValidationMode.parse(str(mode)), mode)
+
+        for invalid_mode in ["max_errors=0", "max_errors=many", "severity>=critical", "fail_fast"]:
+            with self.assertRaises(ValueError):
+                ValidationMode.parse(invalid_mode)
+
+    def test_rules_by_severity(self):
+        """Test that the registry only dispatches to the rules of the minimum severity."""
+        registry = RuleRegistry()
+        _, rules = registry.get_rules("CODE:", "file", Severity.HIGH)
+        self.assertIn(CODEValidator.has_invalid_file_name_in_code, rules)
+        self.assertNotIn(CODEValidator.has_matplotlib_plot, rules)
+        self.assertIn(CODEValidator.has_matplotlib_plot, registry.get_rules("CODE:", "file")[1])
+
+        turn = ColabPlanParser([("code", "plt.show()\nalt.Chart(df).display()")], "file", False).turns[0]
+        failed_checks = registry.validate_block(turn.blocks[0], turn)
+        self.assertEqual(len(failed_checks), 3)
+        self.assertEqual(registry.validate_block(turn.blocks[0], turn, max_errors=2), failed_checks[:2])
+
+    def test_gate_runs_stop_early(self):
+        """Test that the gate runs report the first errors and skip the lookups of the turns after them."""
+
+        def validate(mode: str) -> tuple[list, int]:
+            """Runs the SFT validator on the notebook, returning its errors and the number of resolved turns."""
+            artifact_store = NotebookArtifactStore()
+            artifact_store.set_raw_content(FILE_INFO, build_notebook(3))
+            with patch("review_services.sft_validator.sft_validator_runner.drive_file_names") as drive_file_names:
+                result = sft_validator(FILE_INFO, artifact_store, ValidationMode.parse(mode)).colab_res
+            return result["errors"], drive_file_names.resolve.call_count
+
+        with patch("review_services.sft_validator.block_validations.ice_file_metadata.drive_file_names") as names:
+            names.get_name.return_value = "sales_0.csv"
+            errors, resolved_turns = validate("full")
+            self.assertEqual(resolved_turns, 3)
+            self.assertEqual(errors[0], [1, 2, "[ICE_FILE_METADATA:] MISSING_TAG: 'previous_turn_number:'"])
+
+            self.assertEqual(validate("first_failure"), (errors[:1], 1))
+            self.assertEqual(validate("max_errors=5"), (errors[:5], 2))
+
+            high_errors, resolved_turns = validate("severity>=high")
+            self.assertEqual(resolved_turns, 3)
+            self.assertNotIn([1, 4, "[CODE:]: MATPLOTLIB_PLOT_FOUND"], high_errors)
+            self.assertEqual(high_errors, [error for error in errors if "MATPLOTLIB_PLOT_FOUND" not in error[2]])
+
+
+if __name__ == "__main__":
+    unittest.main()
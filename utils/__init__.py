@@ -1,10 +1,15 @@
 """Utility functions for the project."""
 
-from .colab_read_ops import get_colabs, get_sft_and_stepwise_info  # noqa
+from .colab_read_ops import get_colabs, get_sft_and_stepwise_info, iter_colabs  # noqa
 from .const import EVENTS_TAG_UNIQUE_COLAB  # noqa
 from .const import FILE_METADATA_SUB_TAGS  # noqa
 from .const import FOLDERS_TO_IGNORE  # noqa
 from .const import OPTIONAL_FILE_METADATA_SUB_TAGS  # noqa
+from .const import SFT_TYPES  # noqa
 from .const import Status  # noqa
 from .drive_auth import initialize_drive_service, initialize_sheets_service  # noqa
+from .drive_changes import apply_changes, get_start_page_token, list_changes  # noqa
+from .drive_file_names import drive_file_names, get_file_id_from_link  # noqa
 from .logger import logger  # noqa
+from .notebook_cache import get_revision_key, notebook_cache  # noqa
+from .timings import TimingRecorder, get_timing_recorder  # noqa
@@ -0,0 +1,36 @@
+"""Command line interface to inspect or prune the on-disk notebook cache.
+
+Usage:
+    python -m utils.cache_cli stats
+    python -m utils.cache_cli prune --max-bytes 1000000000
+    python -m utils.cache_cli clear
+"""
+
+import argparse
+
+from utils.notebook_cache import NOTEBOOK_CACHE_DIR, NOTEBOOK_CACHE_MAX_BYTES, NotebookDiskCache
+
+
+def main():
+    """Command line interface to inspect or prune the notebook cache."""
+    parser = argparse.ArgumentParser(description="Inspect or prune the on-disk notebook cache.")
+    parser.add_argument("--cache-dir", default=NOTEBOOK_CACHE_DIR, help="Notebook cache directory.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="Show the number of cached notebooks and the cache size.")
+    prune_parser = subparsers.add_parser("prune", help="Evict least recently used notebooks.")
+    prune_parser.add_argument("--max-bytes", type=int, default=NOTEBOOK_CACHE_MAX_BYTES, help="Size to prune to.")
+    subparsers.add_parser("clear", help="Evict every cached notebook.")
+    args = parser.parse_args()
+
+    cache = NotebookDiskCache(args.cache_dir)
+    if args.command == "prune":
+        print(f"Evicted {cache.prune(args.max_bytes)} blobs.")  # noqa: T201
+    elif args.command == "clear":
+        print(f"Evicted {cache.prune(0)} blobs.")  # noqa: T201
+
+    for key, value in cache.stats().items():
+        print(f"{key}: {value}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
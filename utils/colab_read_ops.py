@@ -1,8 +1,17 @@
 """This contains functions to read colabs."""
 
-from utils.const import FOLDERS_TO_IGNORE
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterator, Optional
+
+from utils.const import FOLDER_MIME_TYPE, FOLDERS_TO_IGNORE, MAX_FOLDERS_PER_QUERY, MAX_LISTING_WORKERS, MAX_PAGE_SIZE
 from utils.drive_auth import initialize_drive_service
 from utils.logger import logger
+from utils.notebook_cache import REVISION_FIELDS
+from utils.timings import get_timing_recorder
+
+# Fields requested for every listed file, the revision fields key the on-disk notebook cache
+FILE_FIELDS: str = ", ".join(["id", "name", "mimeType"] + REVISION_FIELDS)
 
 
 def get_sft_and_stepwise_info(name: str) -> tuple[str, bool]:
@@ -40,86 +49,215 @@ def get_sft_and_stepwise_info(name: str) -> tuple[str, bool]:
     return sft_type, is_stepwise
 
 
-def get_colabs(folder_id: str, descriptive_name: str, filter_key_words: list = ["TODO"]) -> list[dict[str, str]]:
-    """Function to read the colabs from the folder and its subfolders,
-    while discerning the SFT type from parent and stepwise from child.
+def get_revision_info(item: dict[str, str]) -> dict[str, str]:
+    """Function to extract the revision fields returned by the Drive listing.
 
     Parameters
     ----------
-    folder_id : str
-        folder_id of the folder to read the colabs from.
-    descriptive_name : str
-        folder name
-    filter_key_words : list, optional
-        Keywords to filter out files, by default ['TODO']
+    item : dict[str, str]
+        Drive file resource.
+
+    Returns
+    -------
+    dict[str, str]
+        Revision fields present in the file resource.
+    """
+    return {field: item[field] for field in REVISION_FIELDS if field in item}
+
+
+def list_folders_children(folder_ids: list[str]) -> list[dict[str, str]]:
+    """Function to list the items of several folders with a single combined query.
+
+    Parameters
+    ----------
+    folder_ids : list[str]
+        Ids of the folders to list.
 
     Returns
     -------
     list[dict[str, str]]
-        List of colabs with SFT type and stepwise info
+        Items of all the folders, including their parents.
     """
-    all_colab_folder_items = []
     drive_service = initialize_drive_service()
+    parents_query = " or ".join(f"'{folder_id}' in parents" for folder_id in folder_ids)
+    query = f"({parents_query}) and trashed=false"
+
+    items = []
+    page_token: str = None
+    while True:
+        with get_timing_recorder().measure("drive_listing"):
+            results = (
+                drive_service.files()
+                .list(
+                    q=query,
+                    pageSize=MAX_PAGE_SIZE,
+                    fields=f"nextPageToken, files({FILE_FIELDS}, parents)",
+                    pageToken=page_token,
+                )
+                .execute()
+            )
+        items.extend(results.get("files", []))
+
+        page_token = results.get("nextPageToken", None)
+        if not page_token:
+            break
+
+    return items
 
-    def traverse_folders(folder_id: str, folder_name: str, parent_sft_type: str):
-        """Helper function to recursively traverse through subfolders,
-        inheriting SFT type from parent and determining stepwise at child level."""
 
+def traverse_folders(
+    root_folder_id: str, root_folder_name: str, visited_folders: Optional[dict[str, dict]] = None
+) -> Iterator[dict[str, str]]:
+    """Function to traverse the folder tree breadth-first, listing several folders concurrently,
+    inheriting SFT type from parent and determining stepwise at child level.
+
+    Parameters
+    ----------
+    root_folder_id : str
+        Id of the folder to start the traversal from.
+    root_folder_name : str
+        Name of the folder to start the traversal from.
+    visited_folders : Optional[dict[str, dict]], optional
+        Collects the traversed folders by id, with their name and SFT type, by default None
+
+    Yields
+    ------
+    dict[str, str]
+        Files with SFT type and stepwise info, as soon as their folder is listed
+    """
+    def get_folder(folder_id: str, folder_name: str, parent_sft_type: str) -> Optional[dict[str, str]]:
+        """Helper function to build the folder to list, None if the folder should be skipped."""
         # Skip the folder if it is in the FOLDERS_TO_IGNORE list
         if folder_name in FOLDERS_TO_IGNORE:
             logger.info(f"Skipping folder: {folder_name}")
-            return
+            return None
 
         # If parent_sft_type is still "other", update it based on current folder name
         sft_type = parent_sft_type if parent_sft_type != "other" else get_sft_and_stepwise_info(folder_name)[0]
+        folder = {"id": folder_id, "name": folder_name, "sft_type": sft_type}
+        if visited_folders is not None:
+            visited_folders[folder_id] = folder
+        return folder
+
+    with ThreadPoolExecutor(max_workers=MAX_LISTING_WORKERS) as executor:
+        pending_listings = {}
+
+        def submit_listings(folders: list[dict[str, str]]):
+            """Helper function to list the folders in batches of combined queries."""
+            for i in range(0, len(folders), MAX_FOLDERS_PER_QUERY):
+                batch = folders[i : i + MAX_FOLDERS_PER_QUERY]  # noqa: E203
+                # The listing is measured by the timing recorder of the run, bound to the context of the traversal
+                context = contextvars.copy_context()
+                future = executor.submit(context.run, list_folders_children, [folder["id"] for folder in batch])
+                pending_listings[future] = batch
+
+        root_folder = get_folder(root_folder_id, root_folder_name, "other")
+        submit_listings([root_folder] if root_folder else [])
+
+        while pending_listings:
+            done, _ = wait(pending_listings, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch = pending_listings.pop(future)
+                sub_folders, colab_folder_items = [], []
+                for item in future.result():
+                    # A single folder batch does not need the parents to attribute the items
+                    parents = [folder for folder in batch if folder["id"] in item.get("parents", [])]
+                    if not parents and len(batch) == 1:
+                        parents = batch
+
+                    for parent in parents:
+                        if item["mimeType"] == FOLDER_MIME_TYPE:  # Check if the item is a folder
+                            # Traverse the subfolder, passing the sft_type from the parent
+                            sub_folder = get_folder(item["id"], item["name"], parent["sft_type"])
+                            if sub_folder:
+                                sub_folders.append(sub_folder)
+                        else:
+                            # Determine stepwise information based on current folder name
+                            is_stepwise = get_sft_and_stepwise_info(parent["name"])[1] or "Stepwise" in item["name"]
+                            colab_folder_items.append(
+                                {
+                                    "id": item["id"],
+                                    "name": item["name"],
+                                    "sft_type": parent["sft_type"],
+                                    "is_stepwise": is_stepwise,
+                                }
+                                | get_revision_info(item)
+                            )  # Collect files with SFT type and stepwise info
+
+                # Keep the listings going while the consumer processes the files of this batch
+                submit_listings(sub_folders)
+                yield from colab_folder_items
+
+
+def iter_colabs(
+    folder_id: str,
+    descriptive_name: str,
+    filter_key_words: list = ["TODO"],
+    visited_folders: Optional[dict[str, dict]] = None,
+) -> Iterator[dict[str, str]]:
+    """Function to stream the colabs from the folder and its subfolders as they are discovered,
+    while discerning the SFT type from parent and stepwise from child.
+
+    Parameters
+    ----------
+    folder_id : str
+        folder_id of the folder to read the colabs from.
+    descriptive_name : str
+        folder name
+    filter_key_words : list, optional
+        Keywords to filter out files, by default ['TODO']
+    visited_folders : Optional[dict[str, dict]], optional
+        Collects the traversed folders by id, with their name and SFT type, by default None
+
+    Yields
+    ------
+    dict[str, str]
+        Colabs with SFT type and stepwise info
+    """
+    drive_service = initialize_drive_service()
 
-        # List all items in the current folder
-        query = f"'{folder_id}' in parents and trashed=false"
-        page_token: str = None
-        while True:
-            results = (
-                drive_service.files()
-                .list(q=query, fields="nextPageToken, files(id, name, mimeType)", pageToken=page_token)
-                .execute()
-            )
-            items = results.get("files", [])
-            for item in items:
-                if item["mimeType"] == "application/vnd.google-apps.folder":  # Check if the item is a folder
-                    # Traverse the subfolder, passing the sft_type from the parent
-                    traverse_folders(item["id"], item["name"], sft_type)
-                else:
-                    # Determine stepwise information based on current folder name
-                    is_stepwise = get_sft_and_stepwise_info(folder_name)[1] or "Stepwise" in item["name"]
-                    all_colab_folder_items.append(
-                        {"id": item["id"], "name": item["name"], "sft_type": sft_type, "is_stepwise": is_stepwise}
-                    )  # Collect files with SFT type and stepwise info
-
-            page_token = results.get("nextPageToken", None)
-            if not page_token:
-                break
-
-    # Start traversal from the root folder, initially setting sft_type to "other"
-    # traverse_folders(folder_id, descriptive_name, "other")
     # Check if the provided ID is a file or a folder
-    file_metadata = drive_service.files().get(fileId=folder_id, fields="id, name, mimeType").execute()
-    if file_metadata["mimeType"] == "application/vnd.google-apps.folder":
+    file_metadata = drive_service.files().get(fileId=folder_id, fields=FILE_FIELDS).execute()
+    if file_metadata["mimeType"] == FOLDER_MIME_TYPE:
         # Start traversal from the root folder, initially setting sft_type to "other"
-        traverse_folders(folder_id, descriptive_name, "other")
+        all_colab_folder_items = traverse_folders(folder_id, descriptive_name, visited_folders)
     elif file_metadata["mimeType"] in ["application/vnd.google.colab", "application/vnd.google.colaboratory"]:
         # Directly add the file to the list if it's a colab notebook
         sft_type, is_stepwise = get_sft_and_stepwise_info(file_metadata["name"])
-        all_colab_folder_items.append(
+        all_colab_folder_items = [
             {"id": file_metadata["id"], "name": file_metadata["name"], "sft_type": sft_type, "is_stepwise": is_stepwise}
-        )
+            | get_revision_info(file_metadata)
+        ]
+    else:
+        all_colab_folder_items = []
 
     # Filter the items based on the filter keywords
-    selected_colab_folder_items = list(
-        filter(
-            lambda x: x and all(filter_key_word not in x["name"] for filter_key_word in filter_key_words),
-            all_colab_folder_items,
-        )
+    yield from filter(
+        lambda x: x and all(filter_key_word not in x["name"] for filter_key_word in filter_key_words),
+        all_colab_folder_items,
     )
 
+
+def get_colabs(folder_id: str, descriptive_name: str, filter_key_words: list = ["TODO"]) -> list[dict[str, str]]:
+    """Function to read the colabs from the folder and its subfolders,
+    while discerning the SFT type from parent and stepwise from child.
+
+    Parameters
+    ----------
+    folder_id : str
+        folder_id of the folder to read the colabs from.
+    descriptive_name : str
+        folder name
+    filter_key_words : list, optional
+        Keywords to filter out files, by default ['TODO']
+
+    Returns
+    -------
+    list[dict[str, str]]
+        List of colabs with SFT type and stepwise info
+    """
+    selected_colab_folder_items = list(iter_colabs(folder_id, descriptive_name, filter_key_words))
+
     logger.info(
         f"Selected {len(selected_colab_folder_items)} colabs from"
         f" {descriptive_name} folder: https://drive.google.com/drive/folders/{folder_id}"
@@ -7,6 +7,13 @@ FOLDERS_TO_IGNORE: list[str] = [
     "i18n",
 ]
 
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# Drive listing limits used while traversing the folders
+MAX_PAGE_SIZE = 1000
+MAX_FOLDERS_PER_QUERY = 20
+MAX_LISTING_WORKERS = 8
+
 # List of possible tags provided
 EVENTS_TAG_UNIQUE_COLAB = [
     "TURN:",
@@ -23,6 +30,9 @@ EVENTS_TAG_UNIQUE_COLAB = [
     "TOOL_OUTPUT:",
 ]
 
+# SFT types of the colabs, as discerned from the folder and file names
+SFT_TYPES = ["other", "file", "no_file", "pdf", "search", "browse", "reasoning", "marketing"]
+
 # List of valid sub-tags for ICE_FILE_METADATA
 FILE_METADATA_SUB_TAGS = [
     "file_name:",
@@ -1,7 +1,15 @@
 """This script provides Google Drive API service."""
 
+import json
+import queue
+import threading
+import weakref
+
+import google_auth_httplib2
 import pydata_google_auth
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
 
 # Authenticate and build the Drive API client
 SCOPES = [
@@ -11,19 +19,132 @@ SCOPES = [
 ]
 
 
+class _ThreadClients:
+    """Holds the authorized transport and the API services owned by a single thread."""
+
+    def __init__(self, http: google_auth_httplib2.AuthorizedHttp):
+        self.http: google_auth_httplib2.AuthorizedHttp = http
+        self.services: dict[tuple[str, str], object] = {}
+
+
+class GoogleClientManager:
+    """
+    Manages the credentials and the Google API clients shared by the whole app.
+
+    The user credentials are loaded once and refreshed centrally. Every thread gets its own
+    authorized httplib2 transport, as httplib2 is not thread-safe, and the transports of finished
+    threads are kept in a bounded pool to be reused by new threads. API services are built from
+    discovery documents that are parsed only once.
+    """
+
+    def __init__(self, scopes: list[str], max_idle_clients: int = 32):
+        """
+        Initializes the GoogleClientManager instance.
+
+        Parameters
+        ----------
+        scopes : list[str]
+            OAuth scopes requested for the user credentials.
+
+        max_idle_clients : int, optional
+            Maximum number of idle transports kept for reuse, by default 32.
+        """
+        self.scopes: list[str] = scopes
+        self.__credentials = None
+        self.__lock = threading.Lock()
+        self.__local = threading.local()
+        self.__discovery_docs: dict[tuple[str, str], dict] = {}
+        self.__idle_clients: queue.LifoQueue = queue.LifoQueue(maxsize=max_idle_clients)
+
+    def get_credentials(self):
+        """
+        Returns the user credentials, loading them on first use and refreshing them when expired.
+
+        Returns
+        -------
+        google.auth.credentials.Credentials
+            Valid user credentials.
+        """
+        with self.__lock:
+            if self.__credentials is None:
+                self.__credentials = pydata_google_auth.get_user_credentials(
+                    self.scopes,
+                    auth_local_webserver=False,
+                )
+            if not self.__credentials.valid:
+                self.__credentials.refresh(google_auth_httplib2.Request(build_http()))
+            return self.__credentials
+
+    def get_service(self, api: str, version: str):
+        """
+        Returns the API service owned by the calling thread.
+
+        Parameters
+        ----------
+        api : str
+            Name of the Google API, e.g. "drive".
+
+        version : str
+            Version of the Google API, e.g. "v3".
+
+        Returns
+        -------
+        googleapiclient.discovery.Resource
+            API service that must only be used by the calling thread.
+        """
+        credentials = self.get_credentials()
+        clients: _ThreadClients = getattr(self.__local, "clients", None)
+        if clients is None:
+            clients = self.__local.clients = _ThreadClients(self.__acquire_http(credentials))
+            # Give the transport back to the pool once the thread is gone
+            weakref.finalize(clients, self.__release_http, clients.http)
+
+        service = clients.services.get((api, version))
+        if service is None:
+            service = clients.services[(api, version)] = build_from_document(
+                self.__get_discovery_doc(api, version), http=clients.http
+            )
+        return service
+
+    def __acquire_http(self, credentials) -> google_auth_httplib2.AuthorizedHttp:
+        """Returns an idle authorized transport from the pool, creating one if the pool is empty."""
+        try:
+            return self.__idle_clients.get_nowait()
+        except queue.Empty:
+            # The transports of the client library time out like the ones built by `build`
+            return google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+
+    def __release_http(self, http: google_auth_httplib2.AuthorizedHttp) -> None:
+        """Returns the transport to the pool, closing it if the pool is full."""
+        try:
+            self.__idle_clients.put_nowait(http)
+        except queue.Full:
+            http.close()
+
+    def __get_discovery_doc(self, api: str, version: str) -> dict:
+        """Returns the parsed discovery document of the API, loading it on first use."""
+        with self.__lock:
+            discovery_doc = self.__discovery_docs.get((api, version))
+            if discovery_doc is None:
+                static_doc = get_static_doc(api, version)
+                if static_doc is not None:
+                    discovery_doc = json.loads(static_doc)
+                else:
+                    # Fetch the document from the discovery service when it is not bundled with the client
+                    service = build(api, version, credentials=self.__credentials, static_discovery=False)
+                    discovery_doc = service._rootDesc
+                self.__discovery_docs[(api, version)] = discovery_doc
+            return discovery_doc
+
+
+client_manager = GoogleClientManager(SCOPES)
+
+
 def initialize_drive_service():
     """Initialize the Google Drive service."""
-    creds = pydata_google_auth.get_user_credentials(
-        SCOPES,
-        auth_local_webserver=False,
-    )
-    return build("drive", "v3", credentials=creds)
+    return client_manager.get_service("drive", "v3")
 
 
 def initialize_sheets_service():
     """Initialize the Google Sheets service."""
-    creds = pydata_google_auth.get_user_credentials(
-        SCOPES,
-        auth_local_webserver=False,
-    )
-    return build("sheets", "v4", credentials=creds)
+    return client_manager.get_service("sheets", "v4")
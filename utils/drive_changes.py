@@ -0,0 +1,114 @@
+"""This contains functions to follow the Drive changes of the colabs between validation runs."""
+
+from typing import Optional
+
+from utils.colab_read_ops import get_revision_info, get_sft_and_stepwise_info
+from utils.const import FOLDER_MIME_TYPE, MAX_PAGE_SIZE
+from utils.drive_auth import initialize_drive_service
+from utils.notebook_cache import REVISION_FIELDS
+from utils.timings import get_timing_recorder
+
+# Fields requested for every changed file
+CHANGE_FIELDS: str = (
+    "nextPageToken, newStartPageToken, "
+    f"changes(fileId, removed, file({', '.join(['id', 'name', 'mimeType', 'trashed', 'parents'] + REVISION_FIELDS)}))"
+)
+
+
+def get_start_page_token() -> str:
+    """Function to get the token of the current state of the Drive, to list the changes made after it.
+
+    Returns
+    -------
+    str
+        Page token of the Drive changes
+    """
+    drive_service = initialize_drive_service()
+    return drive_service.changes().getStartPageToken().execute()["startPageToken"]
+
+
+def list_changes(page_token: str) -> list[dict]:
+    """Function to list the Drive changes made since the page token was issued.
+
+    Parameters
+    ----------
+    page_token : str
+        Page token returned by get_start_page_token.
+
+    Returns
+    -------
+    list[dict]
+        Drive changes, oldest first
+    """
+    drive_service = initialize_drive_service()
+
+    changes = []
+    while page_token:
+        with get_timing_recorder().measure("drive_listing"):
+            results = (
+                drive_service.changes()
+                .list(pageToken=page_token, pageSize=MAX_PAGE_SIZE, fields=CHANGE_FIELDS, includeRemoved=True)
+                .execute()
+            )
+        changes.extend(results.get("changes", []))
+        page_token = results.get("nextPageToken", None)
+
+    return changes
+
+
+def apply_changes(
+    colabs: dict[str, dict],
+    folders: dict[str, dict],
+    changes: list[dict],
+    filter_key_words: list = ["TODO"],
+) -> Optional[dict[str, dict]]:
+    """Function to update the colabs of a previous listing with the Drive changes.
+
+    Changes to colabs directly inside the listed folders are applied. A change to a listed folder, or
+    to a folder created inside one, can move whole subtrees, so the folders have to be listed again.
+
+    Parameters
+    ----------
+    colabs : dict[str, dict]
+        Colabs of the previous listing, by id.
+    folders : dict[str, dict]
+        Folders of the previous listing, by id, with their name and SFT type.
+    changes : list[dict]
+        Drive changes made since the previous listing.
+    filter_key_words : list, optional
+        Keywords to filter out files, by default ['TODO']
+
+    Returns
+    -------
+    Optional[dict[str, dict]]
+        Updated colabs by id, None if the folders have to be listed again
+    """
+    if not folders:
+        # The previous listing was a single colab rather than a folder
+        return None
+
+    colabs = dict(colabs)
+    for change in changes:
+        file_id, file = change["fileId"], change.get("file", {})
+        parents = [folders[parent_id] for parent_id in file.get("parents", []) if parent_id in folders]
+
+        if file_id in folders or (file.get("mimeType") == FOLDER_MIME_TYPE and parents):
+            return None
+
+        colabs.pop(file_id, None)
+        if change.get("removed") or file.get("trashed") or file.get("mimeType") == FOLDER_MIME_TYPE or not parents:
+            continue
+        if any(filter_key_word in file["name"] for filter_key_word in filter_key_words):
+            continue
+
+        # Determine stepwise information based on current folder name, as the folder traversal does
+        parent = parents[0]
+        is_stepwise = get_sft_and_stepwise_info(parent["name"])[1] or "Stepwise" in file["name"]
+        colabs[file_id] = {
+            "id": file_id,
+            "name": file["name"],
+            "sft_type": parent["sft_type"],
+            "is_stepwise": is_stepwise,
+        } | get_revision_info(file)
+
+    return colabs
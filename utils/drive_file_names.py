@@ -0,0 +1,201 @@
+"""This script resolves the names of Google Drive files referenced by the colabs."""
+
+import os
+import re
+import threading
+from collections.abc import Iterable
+from typing import Optional
+
+from cachetools import TTLCache
+from googleapiclient.errors import HttpError
+
+from utils.drive_auth import initialize_drive_service
+from utils.logger import logger
+
+# Maximum number of calls in a single Drive batch request
+MAX_BATCH_SIZE = 100
+
+DRIVE_FILE_NAMES_TTL = int(os.getenv("DRIVE_FILE_NAMES_TTL", 60 * 60))
+DRIVE_FILE_NAMES_MAX_SIZE = int(os.getenv("DRIVE_FILE_NAMES_MAX_SIZE", 100_000))
+
+DRIVE_FILE_ID_PATTERN = re.compile(r"/d/([a-zA-Z0-9_-]+)")
+
+# Reasons of the 403 errors that are rate limits rather than a denied access to the file
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "dailyLimitExceeded"}
+
+
+def get_file_id_from_link(link: str) -> Optional[str]:
+    """Extract the file ID from a Google Drive link.
+
+    Parameters
+    ----------
+    link : str
+        Google Drive link, e.g. https://drive.google.com/file/d/<file_id>/view
+
+    Returns
+    -------
+    Optional[str]
+        File ID, None if the link does not contain one.
+    """
+    match = DRIVE_FILE_ID_PATTERN.search(link)
+    return match.group(1) if match else None
+
+
+def is_missing_file_error(exception: HttpError) -> bool:
+    """Check whether a Drive error means that the file does not exist or is not shared.
+
+    Parameters
+    ----------
+    exception : HttpError
+        Error of a Drive request.
+
+    Returns
+    -------
+    bool
+        True for a 404, or a 403 that is not a rate limit.
+    """
+    if exception.resp.status == 404:
+        return True
+    if exception.resp.status != 403:
+        return False
+    error_details = exception.error_details if isinstance(exception.error_details, list) else []
+    return not any(
+        isinstance(detail, dict) and detail.get("reason") in RATE_LIMIT_REASONS for detail in error_details
+    )
+
+
+class DriveFileNameResolver:
+    """
+    Resolves Google Drive file IDs to file names.
+
+    The names are fetched with Drive batch requests and memoized for `ttl` seconds, so a file
+    referenced by many colabs is looked up once per run and reused by the following runs.
+    Files that do not exist (404) or are not shared (403 other than a rate limit) are memoized as None.
+
+    The lookups of concurrent threads share their batches: a single thread fetches the pending file IDs at a
+    time, and the IDs requested by the other threads while a batch is in flight are fetched with the next one.
+    """
+
+    def __init__(self, ttl: int = DRIVE_FILE_NAMES_TTL, max_size: int = DRIVE_FILE_NAMES_MAX_SIZE):
+        """
+        Initializes the DriveFileNameResolver instance.
+
+        Parameters
+        ----------
+        ttl : int, optional
+            Number of seconds a resolved name is kept, by default DRIVE_FILE_NAMES_TTL.
+
+        max_size : int, optional
+            Maximum number of resolved names kept, by default DRIVE_FILE_NAMES_MAX_SIZE.
+        """
+        self.__names: TTLCache = TTLCache(maxsize=max_size, ttl=ttl)
+        self.__in_flight: dict[str, threading.Event] = {}
+        # File IDs waiting for the next batch, in order, and whether a thread is fetching them
+        self.__pending: list[str] = []
+        self.__fetching = False
+        self.__lock = threading.Lock()
+
+    def resolve(self, file_ids: Iterable[str]) -> None:
+        """
+        Fetches the names of the file IDs that are not memoized yet.
+
+        File IDs that are already being fetched by another thread are waited for instead of
+        being fetched again. The new file IDs are added to the pending ones, and fetched by the
+        calling thread unless another thread is already fetching the pending file IDs.
+
+        Parameters
+        ----------
+        file_ids : Iterable[str]
+            File IDs to resolve.
+        """
+        to_wait = []
+        with self.__lock:
+            for file_id in dict.fromkeys(file_ids):
+                if file_id in self.__names:
+                    continue
+                if file_id not in self.__in_flight:
+                    self.__in_flight[file_id] = threading.Event()
+                    self.__pending.append(file_id)
+                to_wait.append(self.__in_flight[file_id])
+
+            fetch = bool(self.__pending) and not self.__fetching
+            self.__fetching = self.__fetching or fetch
+
+        if fetch:
+            self.__fetch_pending()
+
+        for event in to_wait:
+            event.wait()
+
+    def get_name(self, file_id: str) -> Optional[str]:
+        """
+        Returns the name of the file, fetching it if it is not memoized.
+
+        Parameters
+        ----------
+        file_id : str
+            ID of the Google Drive file.
+
+        Returns
+        -------
+        Optional[str]
+            Name of the file, None if the file could not be found.
+        """
+        with self.__lock:
+            if file_id in self.__names:
+                return self.__names[file_id]
+
+        self.resolve([file_id])
+        with self.__lock:
+            return self.__names.get(file_id)
+
+    def __fetch_pending(self) -> None:
+        """Fetches the pending file IDs in batches, including the ones added by other threads in the meantime."""
+        while True:
+            with self.__lock:
+                batch_ids = self.__pending[:MAX_BATCH_SIZE]
+                del self.__pending[:MAX_BATCH_SIZE]
+                if not batch_ids:
+                    self.__fetching = False
+                    return
+
+            try:
+                self.__fetch_batch(batch_ids)
+            except BaseException:
+                # Let the next call fetch the remaining file IDs
+                with self.__lock:
+                    self.__fetching = False
+                raise
+            finally:
+                with self.__lock:
+                    for file_id in batch_ids:
+                        self.__in_flight.pop(file_id).set()
+
+    def __fetch_batch(self, file_ids: list[str]) -> None:
+        """Fetches the names of the file IDs with a single Drive batch request."""
+        names = {}
+
+        def callback(file_id: str, response: dict, exception: Exception) -> None:
+            """Collects the name of a file from its batch response."""
+            if exception is None:
+                names[file_id] = response.get("name")
+            elif isinstance(exception, HttpError) and is_missing_file_error(exception):
+                names[file_id] = None
+            else:
+                # Do not memoize transient errors, the file is looked up again on the next use
+                logger.error(f"An error occurred while fetching the name of the file {file_id}: {exception}")
+
+        try:
+            drive_service = initialize_drive_service()
+            batch = drive_service.new_batch_http_request(callback=callback)
+            for file_id in file_ids:
+                batch.add(drive_service.files().get(fileId=file_id, fields="name"), request_id=file_id)
+            batch.execute()
+        except Exception as e:
+            logger.error(f"An error occurred while fetching the names of {len(file_ids)} files: {e}")
+
+        with self.__lock:
+            self.__names.update(names)
+
+
+drive_file_names = DriveFileNameResolver()
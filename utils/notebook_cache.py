@@ -0,0 +1,236 @@
+"""This file contains the persistent on-disk cache of notebooks downloaded from Google Drive.
+
+The notebooks are stored as zlib compressed blobs named after the SHA-256 of their content, and a SQLite
+index maps every (Drive file id, revision) pair to its blob. The cache is bounded in size and evicts the
+least recently used blobs first. Use `python -m utils.cache_cli` to inspect or prune it.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from utils.logger import logger
+
+# Fields of the Drive file resource that identify a notebook revision
+REVISION_FIELDS: list[str] = ["md5Checksum", "headRevisionId", "modifiedTime"]
+
+NOTEBOOK_CACHE_DIR: str = os.getenv("NOTEBOOK_CACHE_DIR", os.path.join(".cache", "notebooks"))
+NOTEBOOK_CACHE_MAX_BYTES: int = int(os.getenv("NOTEBOOK_CACHE_MAX_BYTES", str(2 * 1024**3)))
+NOTEBOOK_CACHE_ENABLED: bool = os.getenv("NOTEBOOK_CACHE_ENABLED", "true").lower() == "true"
+
+
+def get_revision_key(file_info: dict[str, str]) -> Optional[str]:
+    """Function to build the revision key of a Drive file from its listing metadata.
+
+    Parameters
+    ----------
+    file_info : dict[str, str]
+        Dictionary containing the file information.
+
+    Returns
+    -------
+    Optional[str]
+        Revision key of the file, None if the listing did not return any revision field.
+    """
+    revision = [file_info[field] for field in REVISION_FIELDS if file_info.get(field)]
+    return ":".join(revision) if revision else None
+
+
+class NotebookDiskCache:
+    """
+    Content-addressed, size-bounded LRU cache of notebook contents.
+
+    Attributes
+    ----------
+    cache_dir (str): Directory holding the blobs and the SQLite index.
+
+    max_bytes (int): Maximum total size of the compressed blobs.
+    """
+
+    def __init__(self, cache_dir: str = NOTEBOOK_CACHE_DIR, max_bytes: int = NOTEBOOK_CACHE_MAX_BYTES):
+        """
+        Initializes the NotebookDiskCache instance.
+
+        Parameters
+        ----------
+        cache_dir (str): Directory holding the blobs and the SQLite index.
+
+        max_bytes (int): Maximum total size of the compressed blobs.
+        """
+        self.cache_dir: str = cache_dir
+        self.max_bytes: int = max_bytes
+        self.__lock = threading.Lock()
+        self.__initialized = False
+
+    def get(self, file_id: str, revision: str) -> Optional[bytes]:
+        """
+        Returns the cached content of the notebook revision.
+
+        Parameters
+        ----------
+        file_id : str
+            Drive file id of the notebook.
+
+        revision : str
+            Revision key of the notebook.
+
+        Returns
+        -------
+        Optional[bytes]
+            Notebook content, None on cache miss.
+        """
+        with self.__lock, self.__connect() as conn:
+            row = conn.execute(
+                "SELECT blob_sha FROM entries WHERE file_id = ? AND revision = ?", (file_id, revision)
+            ).fetchone()
+            if row is None:
+                return None
+
+            try:
+                with open(self.__blob_path(row[0]), "rb") as f:
+                    content = zlib.decompress(f.read())
+            except (OSError, zlib.error) as e:
+                logger.warning(f"Dropping unreadable cached notebook {file_id}: {e}")
+                conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+                return None
+
+            conn.execute("UPDATE blobs SET last_access = ? WHERE sha = ?", (time.time(), row[0]))
+            return content
+
+    def put(self, file_id: str, revision: str, content: bytes) -> None:
+        """
+        Stores the content of the notebook revision, replacing older revisions of the notebook.
+
+        Parameters
+        ----------
+        file_id : str
+            Drive file id of the notebook.
+
+        revision : str
+            Revision key of the notebook.
+
+        content : bytes
+            Notebook content.
+        """
+        sha = hashlib.sha256(content).hexdigest()
+        with self.__lock, self.__connect() as conn:
+            blob_path = self.__blob_path(sha)
+            if not os.path.exists(blob_path):
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                tmp_path = f"{blob_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(zlib.compress(content))
+                os.replace(tmp_path, blob_path)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO blobs (sha, size, last_access) VALUES (?, ?, ?)",
+                (sha, os.path.getsize(blob_path), time.time()),
+            )
+            conn.execute("DELETE FROM entries WHERE file_id = ?", (file_id,))
+            conn.execute("INSERT INTO entries (file_id, revision, blob_sha) VALUES (?, ?, ?)", (file_id, revision, sha))
+
+            if self.__total_size(conn) > self.max_bytes:
+                self.__prune(conn, self.max_bytes)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns statistics about the cache content.
+
+        Returns
+        -------
+        dict[str, int]
+            Number of notebooks, number of blobs and the total size of the blobs.
+        """
+        with self.__lock, self.__connect() as conn:
+            return {
+                "notebooks": conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0],
+                "blobs": conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0],
+                "total_bytes": self.__total_size(conn),
+                "max_bytes": self.max_bytes,
+            }
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Evicts the least recently used blobs until the cache fits in `max_bytes`.
+
+        Parameters
+        ----------
+        max_bytes : Optional[int], optional
+            Size to prune the cache to, by default the configured maximum size.
+
+        Returns
+        -------
+        int
+            Number of evicted blobs.
+        """
+        with self.__lock, self.__connect() as conn:
+            return self.__prune(conn, self.max_bytes if max_bytes is None else max_bytes)
+
+    def __prune(self, conn: sqlite3.Connection, max_bytes: int) -> int:
+        """Evicts unreferenced blobs and then the least recently used ones until the cache fits."""
+        orphans = conn.execute(
+            "SELECT sha, size FROM blobs WHERE sha NOT IN (SELECT blob_sha FROM entries)"
+        ).fetchall()
+        evicted_shas = [sha for sha, _ in orphans]
+
+        total_size = self.__total_size(conn) - sum(size for _, size in orphans)
+        for sha, size in conn.execute(
+            "SELECT sha, size FROM blobs WHERE sha IN (SELECT blob_sha FROM entries) ORDER BY last_access"
+        ).fetchall():
+            if total_size <= max_bytes:
+                break
+            evicted_shas.append(sha)
+            total_size -= size
+
+        for sha in evicted_shas:
+            conn.execute("DELETE FROM entries WHERE blob_sha = ?", (sha,))
+            conn.execute("DELETE FROM blobs WHERE sha = ?", (sha,))
+            try:
+                os.remove(self.__blob_path(sha))
+            except FileNotFoundError:
+                pass
+
+        if evicted_shas:
+            logger.info(f"Evicted {len(evicted_shas)} blobs from the notebook cache.")
+        return len(evicted_shas)
+
+    @staticmethod
+    def __total_size(conn: sqlite3.Connection) -> int:
+        """Returns the total size of the blobs."""
+        return conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def __blob_path(self, sha: str) -> str:
+        """Returns the path of the blob holding the content with the given SHA-256."""
+        return os.path.join(self.cache_dir, "blobs", sha[:2], f"{sha}.zlib")
+
+    @contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """Opens a connection to the SQLite index, creating the index on first use."""
+        if not self.__initialized:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+        conn = sqlite3.connect(os.path.join(self.cache_dir, "index.sqlite3"), timeout=30)
+        try:
+            if not self.__initialized:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries (file_id TEXT NOT NULL, revision TEXT NOT NULL, "
+                    "blob_sha TEXT NOT NULL, PRIMARY KEY (file_id, revision))"
+                )
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS blobs "
+                    "(sha TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+                )
+                self.__initialized = True
+
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+
+notebook_cache = NotebookDiskCache()
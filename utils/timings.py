@@ -0,0 +1,324 @@
+"""This file contains the recorder of the wall and CPU times spent in the stages of the validation runs.
+
+The Drive listing, the downloads, the notebook loading, the parsing, every validation rule and every AutoReview
+request are measured as stages, per notebook and in aggregate. Every run has its own recorder, bound to the
+current context by `TimingRecorder.bind` and `TimingRecorder.notebook` together with the notebook of the
+measures, so the measures go to the recorder of their run and are attributed to their notebook whatever thread
+or task they run in, even while other runs are in progress. Outside of a run the measures go to a disabled
+recorder: a measure is then a shared no-op context manager. A run records its timings only when it is started
+with them, or when `TIMINGS_ENABLED` is set.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, ContextManager, Iterable, Iterator, Optional
+
+# Whether to record the timings of every run
+TIMINGS_ENABLED: bool = os.getenv("TIMINGS_ENABLED", "false").lower() == "true"
+
+# Drive file id of the notebook the measures of the current context are attributed to
+_current_notebook: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_notebook", default=None)
+# Recorder of the run the measures of the current context belong to
+_current_recorder: contextvars.ContextVar[Optional["TimingRecorder"]] = contextvars.ContextVar(
+    "current_recorder", default=None
+)
+
+# Measure of a disabled recorder
+_NULL_MEASURE = nullcontext()
+# Marks the end of a measured iterable
+_EXHAUSTED = object()
+
+
+class TimingRecorder:
+    """
+    Thread-safe recorder of the number of calls, the wall time, the CPU time and the slowest call of every stage.
+
+    Attributes
+    ----------
+    enabled (bool): Whether the measures are recorded.
+    """
+
+    def __init__(self, enabled: bool = TIMINGS_ENABLED):
+        """
+        Initializes the TimingRecorder instance.
+
+        Parameters
+        ----------
+        enabled (bool): Whether the measures are recorded.
+        """
+        self.enabled: bool = enabled
+        self.__lock = threading.Lock()
+        # Calls, wall seconds, CPU seconds and slowest call in wall seconds, by notebook id and stage
+        self.__timings: dict[Optional[str], dict[str, list]] = {}
+        self.__names: dict[str, str] = {}
+
+    @classmethod
+    def for_run(cls, record_timings: bool) -> "TimingRecorder":
+        """
+        Creates the recorder of a run.
+
+        Parameters
+        ----------
+        record_timings : bool
+            Whether the run records its timings, they are always recorded when TIMINGS_ENABLED is set.
+
+        Returns
+        -------
+        TimingRecorder
+            Recorder of the run, to bind to the contexts of the run with `bind` and `notebook`.
+        """
+        return cls(enabled=record_timings or TIMINGS_ENABLED)
+
+    @contextmanager
+    def bind(self) -> Iterator[None]:
+        """
+        Records the measures of the current context with this recorder.
+        """
+        token = _current_recorder.set(self)
+        try:
+            yield
+        finally:
+            _current_recorder.reset(token)
+
+    @contextmanager
+    def notebook(self, file_info: dict[str, str]) -> Iterator[None]:
+        """
+        Records the measures of the current context with this recorder, attributed to a notebook.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+        """
+        if self.enabled:
+            with self.__lock:
+                self.__names[file_info["id"]] = file_info["name"]
+        token = _current_notebook.set(file_info["id"])
+        try:
+            with self.bind():
+                yield
+        finally:
+            _current_notebook.reset(token)
+
+    def measure(self, stage: str, cpu: bool = True) -> ContextManager:
+        """
+        Measures the block of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+
+        cpu : bool, optional
+            Whether to measure the CPU time of the current thread, by default True. The coroutines awaiting
+            a request share their thread with the other coroutines, so only their wall time is measured.
+
+        Returns
+        -------
+        ContextManager
+            Context manager measuring its block, a no-op when the recorder is disabled.
+        """
+        if not self.enabled:
+            return _NULL_MEASURE
+        return self.__measure(stage, cpu)
+
+    def iter_measured(self, stage: str, items: Iterable) -> Iterator:
+        """
+        Measures the production of every item of an iterable, e.g. the turns parsed while they are streamed.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+
+        items : Iterable
+            Items produced by the stage.
+
+        Returns
+        -------
+        Iterator
+            Items of the iterable, as they are produced.
+        """
+        if not self.enabled:
+            return iter(items)
+        return self.__iter_measured(stage, iter(items))
+
+    def run(self, file_info: dict[str, str], stage: str, func: Callable, *args) -> Any:
+        """
+        Runs a function as a stage of a notebook.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        stage : str
+            Name of the stage.
+
+        func : Callable
+            Function to run.
+
+        *args
+            Positional arguments of the function.
+
+        Returns
+        -------
+        Any
+            Return value of the function.
+        """
+        with self.notebook(file_info), self.measure(stage):
+            return func(*args)
+
+    def record(self, stage: str, wall_seconds: float, cpu_seconds: float = 0.0) -> None:
+        """
+        Records a call of a stage, attributed to the notebook of the current context.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+
+        wall_seconds : float
+            Wall time of the call.
+
+        cpu_seconds : float, optional
+            CPU time of the call, by default 0.0.
+        """
+        if not self.enabled:
+            return
+        file_id = _current_notebook.get()
+        with self.__lock:
+            self.__add(file_id, stage, [1, wall_seconds, cpu_seconds, wall_seconds])
+
+    def export_notebook(self, file_id: str) -> dict[str, list]:
+        """
+        Returns and forgets the raw timings of a notebook, to merge them in the recorder of another process.
+
+        Parameters
+        ----------
+        file_id : str
+            Drive file id of the notebook.
+
+        Returns
+        -------
+        dict[str, list]
+            Calls, wall seconds, CPU seconds and slowest call of every stage.
+        """
+        with self.__lock:
+            self.__names.pop(file_id, None)
+            return self.__timings.pop(file_id, {})
+
+    def merge(self, file_info: dict[str, str], timings: dict[str, list]) -> None:
+        """
+        Merges the raw timings of a notebook recorded by another process.
+
+        Parameters
+        ----------
+        file_info : dict[str, str]
+            Dictionary containing the file information.
+
+        timings : dict[str, list]
+            Raw timings of the notebook, see `export_notebook`.
+        """
+        with self.__lock:
+            self.__names[file_info["id"]] = file_info["name"]
+            for stage, stats in timings.items():
+                self.__add(file_info["id"], stage, stats)
+
+    def export(self) -> dict[str, dict]:
+        """
+        Returns the timings of every stage in aggregate and per notebook.
+
+        Returns
+        -------
+        dict[str, dict]
+            Timings of the stages by name in `stages`, and name and timings of the stages of every notebook by
+            file id in `notebooks`.
+        """
+        with self.__lock:
+            stages: dict[str, list] = {}
+            for notebook_timings in self.__timings.values():
+                for stage, stats in notebook_timings.items():
+                    self.__add_stats(stages.setdefault(stage, [0, 0.0, 0.0, 0.0]), stats)
+
+            notebooks = {
+                file_id: {
+                    "name": self.__names.get(file_id, file_id),
+                    "stages": {stage: self.__format(stats) for stage, stats in notebook_timings.items()},
+                }
+                for file_id, notebook_timings in self.__timings.items()
+                if file_id is not None
+            }
+        return {"stages": {stage: self.__format(stats) for stage, stats in stages.items()}, "notebooks": notebooks}
+
+    def to_json(self) -> str:
+        """
+        Returns the timings of every stage in aggregate and per notebook as JSON, see `export`.
+
+        Returns
+        -------
+        str
+            Timings as JSON.
+        """
+        return json.dumps(self.export(), indent=2)
+
+    @contextmanager
+    def __measure(self, stage: str, cpu: bool) -> Iterator[None]:
+        """Measures the wall time and the CPU time of the current thread spent in the block."""
+        start, start_cpu = time.perf_counter(), time.thread_time() if cpu else 0.0
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, time.thread_time() - start_cpu if cpu else 0.0)
+
+    def __iter_measured(self, stage: str, items: Iterator) -> Iterator:
+        """Yields the items, measuring the production of each of them."""
+        while True:
+            with self.__measure(stage, cpu=True):
+                item = next(items, _EXHAUSTED)
+            if item is _EXHAUSTED:
+                return
+            yield item
+
+    def __add(self, file_id: Optional[str], stage: str, stats: list) -> None:
+        """Adds the timings of a stage of a notebook, under the lock."""
+        notebook_timings = self.__timings.setdefault(file_id, {})
+        self.__add_stats(notebook_timings.setdefault(stage, [0, 0.0, 0.0, 0.0]), stats)
+
+    @staticmethod
+    def __add_stats(total: list, stats: list) -> None:
+        """Adds the calls, wall and CPU seconds of the stats to the total, keeping the slowest call."""
+        total[0] += stats[0]
+        total[1] += stats[1]
+        total[2] += stats[2]
+        total[3] = max(total[3], stats[3])
+
+    @staticmethod
+    def __format(stats: list) -> dict[str, float]:
+        """Formats the timings of a stage."""
+        calls, wall_seconds, cpu_seconds, max_wall_seconds = stats
+        return {
+            "calls": calls,
+            "wall_seconds": wall_seconds,
+            "cpu_seconds": cpu_seconds,
+            "max_wall_seconds": max_wall_seconds,
+        }
+
+
+# Recorder of the measures made outside of a run
+_disabled_recorder = TimingRecorder(enabled=False)
+
+
+def get_timing_recorder() -> TimingRecorder:
+    """Function to get the recorder of the run the current context belongs to.
+
+    Returns
+    -------
+    TimingRecorder
+        Recorder bound to the current context, a disabled recorder outside of a run.
+    """
+    return _current_recorder.get() or _disabled_recorder